@@ -43,6 +43,7 @@ from horizon.decorators import _current_component  # noqa
 from horizon.decorators import require_auth  # noqa
 from horizon.decorators import require_perms  # noqa
 from horizon import loaders
+from horizon.utils import navigation
 
 
 LOG = logging.getLogger(__name__)
@@ -58,6 +59,17 @@ def _decorate_urlconf(urlpatterns, decorator, *args, **kwargs):
 
 def access_cached(func):
     def inner(self, context):
+        if navigation.is_enabled():
+            # The navigation is cached server-side, so the results are only
+            # kept for the request rather than bloating the session.
+            request = context['request']
+            allowed = request.__dict__.setdefault('_horizon_allowed', {})
+            key = "%s.%s" % (self.__class__.__module__,
+                             self.__class__.__name__)
+            if key not in allowed:
+                allowed[key] = func(self, context)
+            return allowed[key]
+
         session = context['request'].session
         try:
             if session['allowed']['valid_for'] != session.get('token'):
@@ -112,7 +124,8 @@ class HorizonComponent(object):
         """Return whether the user has role based access to this component.
 
         This method is not intended to be overridden.
-        The result of the method is stored in per-session cache.
+        The result of the method is stored in per-session cache, or for the
+        request only when the navigation cache (``nav_cache``) is enabled.
         """
         return self.allowed(context)
 
@@ -43,5 +43,15 @@ HORIZON_CONFIG = {
     'password_autocomplete': 'off',
 
     # Enable or disable simplified floating IP address management.
-    'simple_ip_management': True
+    'simple_ip_management': True,
+
+    # Maximum number of threads used to run independent API calls
+    # concurrently; 0 runs them sequentially.
+    'parallel_workers': 10,
+
+    # Server-side cache of the navigation, see horizon.utils.navigation.
+    'nav_cache': {'enabled': False,
+                  'timeout': 300,
+                  'stale_timeout': 3600,
+                  'backend': 'default'},
 }
@@ -13,6 +13,7 @@
 #    under the License.
 
 from collections import defaultdict
+import functools
 import logging
 import types
 import warnings
@@ -33,6 +34,7 @@ from horizon import exceptions
 from horizon import messages
 from horizon.utils import functions
 from horizon.utils import html
+from horizon.utils import parallel
 
 
 LOG = logging.getLogger(__name__)
@@ -640,9 +642,20 @@ class BatchAction(Action):
 
        Optional message for providing an appropriate help text for
        the horizon user.
+
+    .. attribute:: concurrent
+
+       Optional boolean. If ``True``, the action is taken on the selected
+       objects concurrently by the workers of
+       :mod:`horizon.utils.parallel`, whose number is bounded by the
+       ``parallel_workers`` setting. The :meth:`action` method must then be
+       thread-safe and must not depend on state set by ``allowed`` for a
+       given object. The outcome of each object is reported as if they were
+       handled one after the other. Defaults to ``False``.
     """
 
     help_text = _("This action cannot be undone.")
+    concurrent = False
 
     def __init__(self, **kwargs):
         super(BatchAction, self).__init__(**kwargs)
@@ -704,6 +717,7 @@ class BatchAction(Action):
         self.success_ids = []
 
         self.help_text = kwargs.get('help_text', self.help_text)
+        self.concurrent = kwargs.get('concurrent', self.concurrent)
 
     def _allowed(self, request, datum=None):
         # Override the default internal action method to prevent batch
@@ -794,10 +808,10 @@ class BatchAction(Action):
         attrs.update({'data-batch-action': 'true'})
         return attrs
 
-    def handle(self, table, request, obj_ids):
-        action_success = []
-        action_failure = []
-        action_not_allowed = []
+    def _get_allowed(self, table, request, obj_ids, action_not_allowed):
+        """Yields the id, object and display name of each of the objects
+        the action is allowed on.
+        """
         for datum_id in obj_ids:
             datum = table.get_object_by_id(datum_id)
             datum_display = table.get_object_display(datum) or _("N/A")
@@ -807,8 +821,38 @@ class BatchAction(Action):
                          (self._get_action_name(past=True).lower(),
                           datum_display))
                 continue
+            yield datum_id, datum, datum_display
+
+    def _take_action(self, request, allowed):
+        """Takes the action on the allowed objects.
+
+        Yields each allowed object along with a callable which returns the
+        result of the action or re-raises its exception. Unless the action
+        is concurrent, the action is only taken when the callable is called,
+        before the next object is checked.
+        """
+        if not self.concurrent:
+            for datum_id, datum, datum_display in allowed:
+                yield (datum_id, datum, datum_display,
+                       functools.partial(self.action, request, datum_id))
+            return
+        allowed = list(allowed)
+        pool = parallel.get_pool()
+        futures = [pool.submit(self.action, request, datum_id)
+                   for datum_id, datum, datum_display in allowed]
+        for (datum_id, datum, datum_display), future in zip(allowed, futures):
+            yield datum_id, datum, datum_display, future.result
+
+    def handle(self, table, request, obj_ids):
+        action_success = []
+        action_failure = []
+        action_not_allowed = []
+        allowed = self._get_allowed(table, request, obj_ids,
+                                    action_not_allowed)
+        for datum_id, datum, datum_display, result in self._take_action(
+                request, allowed):
             try:
-                self.action(request, datum_id)
+                result()
                 # Call update to invoke changes if needed
                 self.update(request, datum)
                 action_success.append(datum_display)
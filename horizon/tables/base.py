@@ -17,8 +17,11 @@ import copy
 import json
 import logging
 from operator import attrgetter
+import re
 import sys
+import uuid
 
+from django.conf import settings
 from django.core import exceptions as core_exceptions
 from django.core import urlresolvers
 from django import forms
@@ -26,8 +29,8 @@ from django.http import HttpResponse  # noqa
 from django import template
 from django.template.defaultfilters import slugify  # noqa
 from django.template.defaultfilters import truncatechars  # noqa
-from django.template.loader import render_to_string
 from django.utils.datastructures import SortedDict
+from django.utils.encoding import force_text
 from django.utils.html import escape
 from django.utils import http
 from django.utils.http import urlencode
@@ -46,9 +49,18 @@ from horizon.utils import html
 
 LOG = logging.getLogger(__name__)
 PALETTE = termcolors.PALETTES[termcolors.DEFAULT_PALETTE]
+
+# The object ids which read the same once escaped or quoted, and may thus
+# be substituted in the cached markup of row actions.
+PLAIN_ID = re.compile(r'^[A-Za-z0-9_.-]+$')
+
 STRING_SEPARATOR = "__"
 
 
+# The templates of the tables, parsed once per process unless DEBUG is set.
+_TEMPLATES = {}
+
+
 class Column(html.HTMLElement):
     """A class which represents a single column in a :class:`.DataTable`.
 
@@ -314,6 +326,8 @@ class Column(html.HTMLElement):
         if link_classes:
             self.link_attrs['class'] = ' '.join(link_classes)
         self.cell_attributes_getter = cell_attributes_getter
+        # Set by the table when the column is sorted server-side.
+        self.server_sortable = False
 
         if status_choices:
             self.status_choices = status_choices
@@ -365,6 +379,21 @@ class Column(html.HTMLElement):
                 data = None
         return data
 
+    def get_cached_raw_data(self, datum):
+        """Returns the value of :meth:`get_raw_data` for the datum.
+
+        The value is computed once per table and datum, then shared by the
+        status, display and summary of the column.
+        """
+        table = self.table
+        datum_id = table.get_object_id(datum)
+        cache = table._raw_data_cache[self]
+        if datum_id not in cache:
+            if table._transform_counts is not None:
+                table._transform_counts[self.name] += 1
+            cache[datum_id] = self.get_raw_data(datum)
+        return cache[datum_id]
+
     def get_data(self, datum):
         """Returns the final display data for this column from the given
         inputs.
@@ -378,7 +407,7 @@ class Column(html.HTMLElement):
         if datum_id in self.table._data_cache[self]:
             return self.table._data_cache[self][datum_id]
 
-        data = self.get_raw_data(datum)
+        data = self.get_cached_raw_data(datum)
         display_value = None
 
         if self.display_choices:
@@ -432,6 +461,12 @@ class Column(html.HTMLElement):
         except urlresolvers.NoReverseMatch:
             return self.link
 
+    def get_sort_string(self):
+        """Returns the query parameter string to sort the table by this
+        column server-side.
+        """
+        return self.table.get_sort_string(self.name)
+
     def get_summation(self):
         """Returns the summary value for the data in this column if a
         valid summation method is specified for it. Otherwise returns ``None``.
@@ -440,7 +475,7 @@ class Column(html.HTMLElement):
             return None
 
         summation_function = self.summation_methods[self.summation]
-        data = [self.get_raw_data(datum) for datum in self.table.data]
+        data = [self.get_cached_raw_data(datum) for datum in self.table.data]
         data = filter(lambda datum: datum is not None, data)
 
         if len(data):
@@ -549,11 +584,10 @@ class Row(html.HTMLElement):
             self.datum = datum
         else:
             datum = self.datum
-        cells = []
-        for column in table.columns.values():
-            cell = table._meta.cell_class(datum, column, self)
-            cells.append((column.name or column.auto, cell))
-        self.cells = SortedDict(cells)
+        cell_class = table._meta.cell_class
+        self.cells = SortedDict([(column.name or column.auto,
+                                  cell_class(datum, column, self))
+                                 for column in table.columns.values()])
 
         if self.ajax:
             interval = conf.HORIZON_CONFIG['ajax_poll_interval']
@@ -561,13 +595,14 @@ class Row(html.HTMLElement):
             self.attrs['data-update-url'] = self.get_ajax_update_url()
             self.classes.append("ajax-update")
 
-        self.attrs['data-object-id'] = table.get_object_id(datum)
+        object_id = table.get_object_id(datum)
+        self.attrs['data-object-id'] = object_id
 
         # Add the row's status class and id to the attributes to be rendered.
         self.classes.append(self.status_class)
         id_vals = {"table": self.table.name,
                    "sep": STRING_SEPARATOR,
-                   "id": table.get_object_id(datum)}
+                   "id": object_id}
         self.id = "%(table)s%(sep)srow%(sep)s%(id)s" % id_vals
         self.attrs['id'] = self.id
 
@@ -599,8 +634,9 @@ class Row(html.HTMLElement):
             return ''
 
     def render(self):
-        return render_to_string("horizon/common/_data_table_row.html",
-                                {"row": self})
+        row_template = self.table.get_template(
+            "horizon/common/_data_table_row.html")
+        return self.table.render_with_context(row_template, {"row": self})
 
     def get_cells(self):
         """Returns the bound cells for this row in order."""
@@ -629,18 +665,25 @@ class Row(html.HTMLElement):
 
 
 class Cell(html.HTMLElement):
-    """Represents a single cell in the table."""
+    """Represents a single cell in the table.
+
+    Tables hold a lot of cells, so they use slots, and their ``attrs`` dict
+    and ``classes`` list are only created once something is added to them.
+    Subclasses should rather provide default attributes and classes through
+    :meth:`get_default_attrs` and :meth:`get_default_classes`.
+    """
+    __slots__ = ('datum', 'column', 'row', 'data', 'update_action',
+                 'inline_edit_mod', '_attrs', '_classes', '_status', '_url')
 
     def __init__(self, datum, column, row, attrs=None, classes=None):
-        self.classes = classes or getattr(self, "classes", [])
-        super(Cell, self).__init__()
-        self.attrs.update(attrs or {})
+        if classes:
+            self._classes = classes
+        if attrs:
+            self._attrs = dict(attrs)
 
         self.datum = datum
         self.column = column
         self.row = row
-        self.wrap_list = column.wrap_list
-        self.inline_edit_available = self.column.update_action is not None
         # initialize the update action if available
         if self.inline_edit_available:
             self.update_action = self.column.update_action()
@@ -655,6 +698,53 @@ class Cell(html.HTMLElement):
                 self.attrs['title'] = data
         self.data = self.get_data(datum, column, row)
 
+    @property
+    def attrs(self):
+        try:
+            return self._attrs
+        except AttributeError:
+            self._attrs = {}
+            return self._attrs
+
+    @attrs.setter
+    def attrs(self, attrs):
+        self._attrs = attrs
+
+    @property
+    def classes(self):
+        try:
+            return self._classes
+        except AttributeError:
+            self._classes = []
+            return self._classes
+
+    @classes.setter
+    def classes(self, classes):
+        self._classes = classes
+
+    @property
+    def wrap_list(self):
+        return self.column.wrap_list
+
+    @property
+    def inline_edit_available(self):
+        return self.column.update_action is not None
+
+    def get_final_attrs(self):
+        # Reads the attributes without creating them for the cells which
+        # have none.
+        final_attrs = copy.copy(self.get_default_attrs())
+        final_attrs.update(getattr(self, '_attrs', {}))
+        final_attrs['class'] = self.get_final_css()
+        return final_attrs
+
+    def get_final_css(self):
+        defined = getattr(self, '_attrs', {}).get('class', '')
+        default = " ".join(self.get_default_classes())
+        additional = " ".join(getattr(self, '_classes', []))
+        non_empty = [test for test in (defined, default, additional) if test]
+        return " ".join(non_empty).strip()
+
     def get_data(self, datum, column, row):
         """Fetches the data to be displayed in this cell."""
         table = row.table
@@ -685,7 +775,7 @@ class Cell(html.HTMLElement):
 
             if template.defaultfilters.urlize in column.filters:
                 data = widget.render(widget_name,
-                                     column.get_raw_data(datum),
+                                     column.get_cached_raw_data(datum),
                                      form_field_attributes)
             else:
                 data = widget.render(widget_name,
@@ -746,25 +836,29 @@ class Cell(html.HTMLElement):
 
     @property
     def url(self):
+        try:
+            return self._url
+        except AttributeError:
+            pass
+        self._url = None
         if self.column.link:
-            url = self.column.get_link_url(self.datum)
-            if url:
-                return url
-        else:
-            return None
+            self._url = self.column.get_link_url(self.datum) or None
+        return self._url
 
     @property
     def status(self):
         """Gets the status for the column based on the cell's data."""
         # Deal with status column mechanics based in this cell's data
-        if hasattr(self, '_status'):
+        try:
             return self._status
+        except AttributeError:
+            pass
 
         if self.column.status or \
                 self.column.name in self.column.table._meta.status_columns:
             # returns the first matching status found
             data_status_lower = unicode(
-                self.column.get_raw_data(self.datum)).lower()
+                self.column.get_cached_raw_data(self.datum)).lower()
             for status_name, status_value in self.column.status_choices:
                 if unicode(status_name).lower() == data_status_lower:
                     self._status = status_value
@@ -783,10 +877,10 @@ class Cell(html.HTMLElement):
 
     def get_default_classes(self):
         """Returns a flattened string of the cell's CSS classes."""
-        if not self.url:
+        if not self.url and "anchor" in self.column.classes:
             self.column.classes = [cls for cls in self.column.classes
                                    if cls != "anchor"]
-        column_class_string = self.column.get_final_attrs().get('class', "")
+        column_class_string = self.column.get_final_css()
         classes = set(column_class_string.split(" "))
         if self.column.status:
             classes.add(self.get_status_class(self.status))
@@ -819,8 +913,32 @@ class Cell(html.HTMLElement):
                                           self)
 
     def render(self):
-        return render_to_string("horizon/common/_data_table_cell.html",
-                                {"cell": self})
+        cell_template = self.row.table.get_template(
+            "horizon/common/_data_table_cell.html")
+        return self.row.table.render_with_context(cell_template,
+                                                  {"cell": self})
+
+
+class StreamedRows(object):
+    """Stands for the rows of a table while the markup around them is
+    rendered by :meth:`DataTable.render_streaming`.
+
+    It has the length of the actual rows, for the row count, and a single
+    row which renders as a marker of where the rows go.
+    """
+    def __init__(self, marker, count):
+        self.marker = mark_safe(marker)
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        if self.count:
+            yield self
+
+    def render(self):
+        return self.marker
 
 
 class DataTableOptions(object):
@@ -899,6 +1017,27 @@ class DataTableOptions(object):
         single view this will need to be changed to differentiate between the
         tables. Default: ``"marker"``.
 
+    .. attribute:: server_sort_fields
+
+        A dict mapping the names of the columns which the data source can
+        sort on to the field the API sorts them by, e.g.
+        ``{"name": "display_name"}``. Those columns are sorted server-side:
+        their headers link to the table sorted by the column, and
+        :class:`~horizon.tables.DataTableView` passes the sort key and
+        direction to ``get_data`` along with the pagination markers, so only
+        one page of data has to be loaded. Default: ``{}``.
+
+    .. attribute:: sort_param
+
+        The name of the query string parameter holding the name of the
+        column this table is sorted on server-side. Default: ``"sort"``.
+
+    .. attribute:: sort_dir_param
+
+        The name of the query string parameter holding the direction
+        (``"asc"`` or ``"desc"``) of the server-side sort.
+        Default: ``"sort_dir"``.
+
     .. attribute:: status_columns
 
         A list or tuple of column names which represents the "state"
@@ -963,6 +1102,14 @@ class DataTableOptions(object):
 
         A list of permission names which this table requires in order to be
         displayed. Defaults to an empty list (``[]``).
+
+    .. attribute:: cache_row_actions
+
+        Boolean to reuse the markup of the row actions rendered for a row
+        for the other rows with the same allowed actions, replacing the
+        object id it contains. It is only reused once two rows are seen to
+        only differ by their id; use it for tables whose row actions only
+        depend on the row's datum through its id. Default: ``False``.
     """
     def __init__(self, options):
         self.name = getattr(options, 'name', self.__class__.__name__)
@@ -982,6 +1129,9 @@ class DataTableOptions(object):
                                              'prev_pagination_param',
                                              'prev_marker')
         self.pagination_param = getattr(options, 'pagination_param', 'marker')
+        self.server_sort_fields = getattr(options, 'server_sort_fields', {})
+        self.sort_param = getattr(options, 'sort_param', 'sort')
+        self.sort_dir_param = getattr(options, 'sort_dir_param', 'sort_dir')
         self.browser_table = getattr(options, 'browser_table', None)
         self.footer = getattr(options, 'footer', True)
         self.hidden_title = getattr(options, 'hidden_title', True)
@@ -989,6 +1139,7 @@ class DataTableOptions(object):
                                        "no_data_message",
                                        _("No items to display."))
         self.permissions = getattr(options, 'permissions', [])
+        self.cache_row_actions = getattr(options, 'cache_row_actions', False)
 
         # Set self.filter if we have any FilterActions
         filter_actions = [action for action in self.table_actions if
@@ -1155,12 +1306,23 @@ class DataTable(object):
         self.breadcrumb = None
         self.current_item_id = None
         self.permissions = self._meta.permissions
+        self._placeholder = None
+        self._row_marker = None
+        self._templates = {}
+        self._context = None
+        self._request_context = None
+        # Maps the keys of the rendered row actions to (markup, object id,
+        # whether the markup may be reused for other rows), or to None when
+        # it may not.
+        self._row_actions_cache = {}
 
         # Create a new set
         columns = []
         for key, _column in self._columns.items():
             column = copy.copy(_column)
             column.table = self
+            if column.sortable and key in self._meta.server_sort_fields:
+                self._set_server_sorting(column)
             columns.append((key, column))
         self.columns = SortedDict(columns)
         self._populate_data_cache()
@@ -1247,9 +1409,23 @@ class DataTable(object):
 
     def _populate_data_cache(self):
         self._data_cache = {}
+        self._raw_data_cache = {}
         # Set up hash tables to store data points for each column
         for column in self.get_columns():
             self._data_cache[column] = {}
+            self._raw_data_cache[column] = {}
+        # Counts the calls to the columns' transforms in debug mode.
+        self._transform_counts = (collections.Counter() if settings.DEBUG
+                                  else None)
+
+    def _log_transform_counts(self):
+        if not self._transform_counts:
+            return
+        LOG.debug("Table %s: %d column transforms for %d rows (%s).",
+                  self.name, sum(self._transform_counts.values()),
+                  len(self.data or ()),
+                  ", ".join("%s=%d" % item for item
+                            in self._transform_counts.most_common()))
 
     def _filter_action(self, action, request, datum=None):
         try:
@@ -1269,11 +1445,83 @@ class DataTable(object):
 
     def render(self):
         """Renders the table using the template from the table options."""
-        table_template = template.loader.get_template(self._meta.template)
+        if self._placeholder is not None:
+            return self._placeholder
+        table_template = self.get_template(self._meta.template)
         extra_context = {self._meta.context_var_name: self,
                          'hidden_title': self._meta.hidden_title}
         context = template.RequestContext(self.request, extra_context)
-        return table_template.render(context)
+        content = table_template.render(context)
+        if self._row_marker is None:
+            self._log_transform_counts()
+        return content
+
+    def get_template(self, template_name):
+        """Returns the template of the given name, loaded once per process
+        (once per table when ``DEBUG`` is set, so that changes to the
+        templates show up) so that it is not parsed again for each row.
+        """
+        templates = self._templates if settings.DEBUG else _TEMPLATES
+        if template_name not in templates:
+            templates[template_name] = template.loader.get_template(
+                template_name)
+        return templates[template_name]
+
+    def render_with_context(self, template_to_render, extra_context,
+                            request_context=False):
+        """Renders a template of a row, cell or action with the given
+        variables.
+
+        The context is created once per table and reused for every row, so
+        that the context processors of a ``RequestContext`` only run once.
+        """
+        if request_context:
+            if self._request_context is None:
+                self._request_context = template.RequestContext(self.request)
+            context = self._request_context
+        else:
+            if self._context is None:
+                self._context = template.Context()
+            context = self._context
+        context.update(extra_context)
+        try:
+            return template_to_render.render(context)
+        finally:
+            context.pop()
+
+    def get_placeholder(self):
+        """Makes :meth:`render` return a placeholder instead of the table.
+
+        The placeholder is returned, for the page rendered around the table
+        to be split where the chunks of :meth:`render_streaming` go.
+        """
+        if self._placeholder is None:
+            self._placeholder = mark_safe('<!-- table:%s -->'
+                                          % uuid.uuid4().hex)
+        return self._placeholder
+
+    def render_streaming(self):
+        """Renders the table as a sequence of HTML chunks.
+
+        The markup around the rows comes first, then each row is built,
+        rendered and yielded in turn so that only one of them is held in
+        memory at a time.
+        """
+        placeholder = self._placeholder
+        self._placeholder = None
+        self._row_marker = '<!-- rows:%s -->' % uuid.uuid4().hex
+        try:
+            content = self.render()
+        finally:
+            self._placeholder = placeholder
+            row_marker, self._row_marker = self._row_marker, None
+        head, marker, tail = content.partition(row_marker)
+        yield head
+        if marker:
+            for row in self.iter_rows():
+                yield row.render()
+            yield tail
+        self._log_transform_counts()
 
     def get_absolute_url(self):
         """Returns the canonical URL for this table.
@@ -1302,6 +1550,28 @@ class DataTable(object):
         """Returns the message to be displayed when there is no data."""
         return self._no_data_message
 
+    def _get_object_index(self):
+        """Returns the objects of the table's dataset by unicode id.
+
+        The index is built on first use and again whenever the objects of
+        ``self.data`` change, e.g. when one of them is replaced in place by
+        an updated object. The index holds the objects, so their identities
+        are not reused while it is kept.
+        """
+        data = self.data or ()
+        identities = [id(datum) for datum in data]
+        index = getattr(self, '_object_index', None)
+        if index is None or index[0] != identities:
+            objects = collections.defaultdict(list)
+            for datum in data:
+                obj_id = self.get_object_id(datum)
+                if not isinstance(obj_id, unicode):
+                    obj_id = unicode(str(obj_id), 'utf-8')
+                objects[obj_id].append(datum)
+            index = (identities, objects)
+            self._object_index = index
+        return index[1]
+
     def get_object_by_id(self, lookup):
         """Returns the data object from the table's dataset which matches
         the ``lookup`` parameter specified. An error will be raised if
@@ -1314,13 +1584,7 @@ class DataTable(object):
         """
         if not isinstance(lookup, unicode):
             lookup = unicode(str(lookup), 'utf-8')
-        matches = []
-        for datum in self.data:
-            obj_id = self.get_object_id(datum)
-            if not isinstance(obj_id, unicode):
-                obj_id = unicode(str(obj_id), 'utf-8')
-            if obj_id == lookup:
-                matches.append(datum)
+        matches = self._get_object_index().get(lookup, ())
         if len(matches) > 1:
             raise ValueError("Multiple matches were returned for that id: %s."
                              % matches)
@@ -1398,7 +1662,7 @@ class DataTable(object):
     def render_table_actions(self):
         """Renders the actions specified in ``Meta.table_actions``."""
         template_path = self._meta.table_actions_template
-        table_actions_template = template.loader.get_template(template_path)
+        table_actions_template = self.get_template(template_path)
         bound_actions = self.get_table_actions()
         extra_context = {"table_actions": bound_actions,
                          "table_actions_buttons": [],
@@ -1411,9 +1675,10 @@ class DataTable(object):
                 extra_context['table_actions_menu'].append(action)
             elif action != extra_context.get('filter'):
                 extra_context['table_actions_buttons'].append(action)
-        context = template.RequestContext(self.request, extra_context)
         self.set_multiselect_column_visibility(len(bound_actions) > 0)
-        return table_actions_template.render(context)
+        return self.render_with_context(table_actions_template,
+                                        extra_context,
+                                        request_context=True)
 
     def render_row_actions(self, datum, pull_right=True, row=False):
         """Renders the actions specified in ``Meta.row_actions`` using the
@@ -1425,13 +1690,57 @@ class DataTable(object):
         else:
             template_path = self._meta.row_actions_dropdown_template
 
-        row_actions_template = template.loader.get_template(template_path)
+        row_actions_template = self.get_template(template_path)
         bound_actions = self.get_row_actions(datum)
+        row_id = self.get_object_id(datum)
         extra_context = {"row_actions": bound_actions,
-                         "row_id": self.get_object_id(datum),
+                         "row_id": row_id,
                          "pull_right": pull_right}
-        context = template.RequestContext(self.request, extra_context)
-        return row_actions_template.render(context)
+        if not self._meta.cache_row_actions:
+            return self.render_with_context(row_actions_template,
+                                            extra_context,
+                                            request_context=True)
+
+        row_id = force_text(row_id)
+        if not PLAIN_ID.match(row_id):
+            # The id would have to be escaped or quoted in the markup.
+            return self.render_with_context(row_actions_template,
+                                            extra_context,
+                                            request_context=True)
+        key = self._get_row_actions_key(template_path, pull_right, row_id,
+                                        bound_actions)
+        cached = self._row_actions_cache.get(key, ())
+        if cached and cached[2]:
+            return mark_safe(row_id.join(cached[0]))
+        content = self.render_with_context(row_actions_template,
+                                           extra_context,
+                                           request_context=True)
+        if cached == ():
+            # The markup of the first row, split where its id appears.
+            self._row_actions_cache[key] = (content.split(row_id), row_id,
+                                            False)
+        elif cached and cached[1] != row_id:
+            # The markup is reused once a second row is seen to only differ
+            # from the first one where the first id appears, which rules out
+            # ids also found elsewhere in the markup.
+            if content == row_id.join(cached[0]):
+                self._row_actions_cache[key] = (cached[0], cached[1], True)
+            else:
+                self._row_actions_cache[key] = None
+        return content
+
+    def _get_row_actions_key(self, template_path, pull_right, row_id,
+                             actions):
+        """Returns what the markup of the row actions depends on, but the
+        object id of the row.
+        """
+        key = [template_path, pull_right]
+        for action in actions:
+            key.extend(force_text(value).replace(row_id, '') for value in (
+                action.name, action.method, action.verbose_name,
+                getattr(action, 'help_text', ''), action.attr_string,
+                getattr(action, 'bound_url', '')))
+        return tuple(key)
 
     @staticmethod
     def parse_action(action_string):
@@ -1705,14 +2014,85 @@ class DataTable(object):
         """Returns the query parameter string to paginate this table
         to the previous page.
         """
-        return "=".join([self._meta.prev_pagination_param,
-                         self.get_prev_marker()])
+        return self._add_sort_query("=".join([self._meta.prev_pagination_param,
+                                              self.get_prev_marker()]))
 
     def get_pagination_string(self):
         """Returns the query parameter string to paginate this table
         to the next page.
         """
-        return "=".join([self._meta.pagination_param, self.get_marker()])
+        return self._add_sort_query("=".join([self._meta.pagination_param,
+                                              self.get_marker()]))
+
+    def get_sort_column(self):
+        """Returns the name of the column this table is sorted on
+        server-side, or ``None`` if the data source's order is used.
+        """
+        column = self.request.GET.get(self._meta.sort_param)
+        if column in self._meta.server_sort_fields:
+            return column
+        return None
+
+    def get_sort_key(self):
+        """Returns the API field the data should be sorted by, as declared
+        in ``server_sort_fields``, or ``None``.
+        """
+        return self._meta.server_sort_fields.get(self.get_sort_column())
+
+    def get_sort_dir(self):
+        """Returns the direction (``"asc"`` or ``"desc"``) of the
+        server-side sort, or ``None`` if the table is not sorted.
+        """
+        if self.get_sort_column() is None:
+            return None
+        if self.request.GET.get(self._meta.sort_dir_param) == 'desc':
+            return 'desc'
+        return 'asc'
+
+    def get_sort_string(self, column_name):
+        """Returns the query parameter string to sort this table by the
+        given column, in reverse order if it is already sorted by it.
+
+        The other parameters of the current query, such as an API filter,
+        are kept, except for the pagination markers of this table: a new
+        sort starts from the first page.
+        """
+        sort_dir = 'asc'
+        if (column_name == self.get_sort_column() and
+                self.get_sort_dir() == 'asc'):
+            sort_dir = 'desc'
+        query = self.request.GET.copy()
+        for param in (self._meta.sort_param, self._meta.sort_dir_param,
+                      self._meta.pagination_param,
+                      self._meta.prev_pagination_param):
+            query.pop(param, None)
+        parts = [self._get_sort_query(column_name, sort_dir)]
+        if query:
+            parts.append(query.urlencode())
+        return "&".join(parts)
+
+    def _get_sort_query(self, column_name, sort_dir):
+        return "&".join(["=".join([self._meta.sort_param,
+                                   http.urlquote_plus(column_name)]),
+                         "=".join([self._meta.sort_dir_param, sort_dir])])
+
+    def _add_sort_query(self, query):
+        # Keeps the server-side sort when paginating.
+        column_name = self.get_sort_column()
+        if column_name is None:
+            return query
+        return "&".join([query, self._get_sort_query(column_name,
+                                                     self.get_sort_dir())])
+
+    def _set_server_sorting(self, column):
+        # The data is sorted by the API, the columns of a page must not be
+        # sorted in the browser.
+        classes = [c for c in column.classes if c != "sortable"]
+        classes.append("server_sortable")
+        if column.name == self.get_sort_column():
+            classes.append("sorted_%s" % self.get_sort_dir())
+        column.classes = classes
+        column.server_sortable = True
 
     def calculate_row_status(self, statuses):
         """Returns a boolean value determining the overall row status
@@ -1758,14 +2138,20 @@ class DataTable(object):
 
     def get_rows(self):
         """Return the row data for this table broken out by columns."""
-        rows = []
+        if self._row_marker is not None:
+            # The table is being streamed, the rows are rendered afterwards.
+            return StreamedRows(self._row_marker, len(self.filtered_data))
+        return list(self.iter_rows())
+
+    def iter_rows(self):
+        """Builds the rows of this table one at a time."""
         try:
             for datum in self.filtered_data:
                 row = self._meta.row_class(self, datum)
                 if self.get_object_id(datum) == self.current_item_id:
                     self.selected = True
                     row.classes.append('current_selected')
-                rows.append(row)
+                yield row
         except Exception:
             # Exceptions can be swallowed at the template level here,
             # re-raising as a TemplateSyntaxError makes them visible.
@@ -1774,8 +2160,6 @@ class DataTable(object):
             raise six.reraise(template.TemplateSyntaxError, exc_info[1],
                               exc_info[2])
 
-        return rows
-
     def css_classes(self):
         """Returns the additional CSS class to be added to <table> tag."""
         return self._meta.css_classes
@@ -13,17 +13,52 @@
 #    under the License.
 
 from collections import defaultdict
+import re
 
+from django import http
 from django import shortcuts
+from django.utils.encoding import force_text
 
+from horizon.utils import parallel
 from horizon import views
 
 from horizon.templatetags.horizon import has_permissions  # noqa
 
 
+def _stream_page(content, tables):
+    """Yields the page in content with the tables streamed in place of
+    their placeholders.
+    """
+    pattern = re.compile("|".join(re.escape(placeholder)
+                                  for placeholder in tables))
+    position = 0
+    for match in pattern.finditer(content):
+        yield content[position:match.start()]
+        for chunk in tables[match.group()].render_streaming():
+            yield chunk
+        position = match.end()
+    yield content[position:]
+
+
 class MultiTableMixin(object):
-    """A generic mixin which provides methods for handling DataTables."""
+    """A generic mixin which provides methods for handling DataTables.
+
+    Tables with more rows than ``streaming_threshold`` are streamed: the
+    page is sent with a :class:`~django.http.StreamingHttpResponse`, each
+    row being built and sent in turn rather than all of them being held in
+    memory until the page is rendered. Rows are then rendered after the
+    middleware has processed the response, so they must not depend on
+    messages or session changes. Defaults to ``None``, which disables
+    streaming.
+
+    If ``concurrent`` is ``True``, the data methods of the tables are called
+    concurrently on the pool of :mod:`horizon.utils.parallel`, and must then
+    be thread-safe. Their results are still assigned in the order of the
+    tables, once all of them are available. Defaults to ``False``.
+    """
     data_method_pattern = "get_%s_data"
+    streaming_threshold = None
+    concurrent = False
 
     def __init__(self, *args, **kwargs):
         super(MultiTableMixin, self).__init__(*args, **kwargs)
@@ -36,15 +71,28 @@ class MultiTableMixin(object):
 
     def _get_data_dict(self):
         if not self._data:
-            for table in self.table_classes:
-                data = []
-                name = table._meta.name
-                func_list = self._data_methods.get(name, [])
-                for func in func_list:
-                    data.extend(func())
-                self._data[name] = data
+            calls = [(table._meta.name, func)
+                     for table in self.table_classes
+                     for func in self._data_methods.get(table._meta.name, [])]
+            data = dict((table._meta.name, [])
+                        for table in self.table_classes)
+            results = self.call_data_methods([func for name, func in calls])
+            for (name, func), result in zip(calls, results):
+                data[name].extend(result)
+            self._data = data
         return self._data
 
+    def call_data_methods(self, funcs):
+        """Calls the given data methods and returns their results, in the
+        same order. They are called concurrently if the view is
+        ``concurrent``.
+        """
+        if not self.concurrent:
+            return [func() for func in funcs]
+        pool = parallel.get_pool()
+        futures = [pool.submit(func) for func in funcs]
+        return [future.result() for future in futures]
+
     def get_data_methods(self, table_classes, methods):
         for table in table_classes:
             name = table._meta.name
@@ -110,6 +158,38 @@ class MultiTableMixin(object):
             context["%s_table" % name] = table
         return context
 
+    def get_streamed_tables(self):
+        """Returns the tables which should be streamed."""
+        if self.streaming_threshold is None:
+            return []
+        return [table for table in self._get_table_instances()
+                if len(table.data or ()) > self.streaming_threshold]
+
+    def _get_table_instances(self):
+        return self.get_tables().values()
+
+    def render_to_response(self, context, **response_kwargs):
+        tables = self.get_streamed_tables()
+        if not tables:
+            return super(MultiTableMixin, self).render_to_response(
+                context, **response_kwargs)
+        placeholders = dict((table.get_placeholder(), table)
+                            for table in tables)
+        response = super(MultiTableMixin, self).render_to_response(
+            context, **response_kwargs)
+        response.render()
+        content = force_text(response.content, response._charset)
+        streaming = http.StreamingHttpResponse(
+            _stream_page(content, placeholders),
+            status=response.status_code)
+        # Keep the headers and cookies set on the rendered response, but
+        # not its length, which is the one of the page without the rows.
+        for key, header in response._headers.items():
+            if key != 'content-length':
+                streaming._headers[key] = header
+        streaming.cookies = response.cookies
+        return streaming
+
     def has_prev_data(self, table):
         return False
 
@@ -177,6 +257,11 @@ class DataTableView(MultiTableView):
 
     Optionally, you can override the ``has_more_data`` method to trigger
     pagination handling for APIs that support it.
+
+    If the table declares ``server_sort_fields`` in its ``Meta``, the data
+    is expected to be sorted and paginated by the API: ``get_data`` is then
+    called with the ``marker``, ``prev_marker``, ``sort_key`` and
+    ``sort_dir`` keyword arguments, see :meth:`get_paging_kwargs`.
     """
     table_class = None
     context_object_name = 'table'
@@ -184,12 +269,32 @@ class DataTableView(MultiTableView):
     def _get_data_dict(self):
         if not self._data:
             self.update_server_filter_action()
-            self._data = {self.table_class._meta.name: self.get_data()}
+            if self.table_class._meta.server_sort_fields:
+                data = self.get_data(**self.get_paging_kwargs())
+            else:
+                data = self.get_data()
+            self._data = {self.table_class._meta.name: data}
         return self._data
 
     def get_data(self):
         return []
 
+    def get_paging_kwargs(self):
+        """Returns the pagination markers and the server-side sort requested
+        for the table.
+
+        ``sort_key`` is the API field of the sort column, ``sort_dir`` is
+        ``"asc"`` or ``"desc"``; both are ``None`` if no sort was requested.
+        """
+        table = self.get_table()
+        return {
+            'marker': self.request.GET.get(table._meta.pagination_param),
+            'prev_marker': self.request.GET.get(
+                table._meta.prev_pagination_param),
+            'sort_key': table.get_sort_key(),
+            'sort_dir': table.get_sort_dir()
+        }
+
     def get_tables(self):
         if not self._tables:
             self._tables = {}
@@ -295,7 +400,7 @@ class MixedDataTableView(DataTableView):
     def _get_data_dict(self):
         if not self._data:
             table = self.table_class
-            self._data = {table._meta.name: []}
+            funcs = []
             for data_type in table.data_types:
                 func_name = "get_%s_data" % data_type
                 data_func = getattr(self, func_name, None)
@@ -304,7 +409,10 @@ class MixedDataTableView(DataTableView):
                     raise NotImplementedError("You must define a %s method "
                                               "for %s data type in %s." %
                                               (func_name, data_type, cls_name))
-                data = data_func()
+                funcs.append(data_func)
+            results = self.call_data_methods(funcs)
+            self._data = {table._meta.name: []}
+            for data_type, data in zip(table.data_types, results):
                 self.assign_type_string(data, data_type)
                 self._data[table._meta.name].extend(data)
         return self._data
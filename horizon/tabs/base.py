@@ -12,6 +12,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import functools
 import sys
 
 import six
@@ -22,6 +23,7 @@ from django.utils.datastructures import SortedDict
 
 from horizon import exceptions
 from horizon.utils import html
+from horizon.utils import parallel
 
 SEPARATOR = "__"
 CSS_TAB_GROUP_CLASSES = ["nav", "nav-tabs", "ajax-tabs"]
@@ -72,11 +74,27 @@ class TabGroup(html.HTMLElement):
         Read-only property which is set to the value of the current active tab.
         This may not be the same as the value of ``selected`` if no
         specific tab was requested via the ``GET`` parameter.
+
+    .. attribute:: lazy
+
+        Boolean to only load the data of the active tab with the page,
+        whatever the ``preload`` attribute of the tabs. The other tabs are
+        loaded when they are first shown. Default: ``False``.
+
+    .. attribute:: concurrent
+
+        Boolean to load the data of the tabs loaded with the page, and of the
+        tables of each :class:`~horizon.tabs.TableTab`, concurrently on the
+        pool of :mod:`horizon.utils.parallel`. Their ``get_context_data`` and
+        ``get_{{ table_name }}_data`` methods must then be thread-safe.
+        Default: ``False``.
     """
     slug = None
     template_name = "horizon/common/_tab_group.html"
     param_name = 'tab'
     sticky = False
+    lazy = False
+    concurrent = False
     _selected = None
     _active = None
 
@@ -113,13 +131,32 @@ class TabGroup(html.HTMLElement):
 
     def load_tab_data(self):
         """Preload all data that for the tabs that will be displayed."""
-        for tab in self._tabs.values():
-            if tab.load and not tab.data_loaded:
-                try:
-                    tab._data = tab.get_context_data(self.request)
-                except Exception:
-                    tab._data = False
-                    exceptions.handle(self.request)
+        tabs = [tab for tab in self._tabs.values()
+                if tab.load and not tab.data_loaded]
+        calls = [(tab, functools.partial(tab.get_context_data, self.request))
+                 for tab in tabs]
+        for tab, result in self.call(calls):
+            try:
+                tab._data = result()
+            except Exception:
+                tab._data = False
+                exceptions.handle(self.request)
+
+    def call(self, calls):
+        """Takes (key, function) pairs, and yields each key with a callable
+        returning the result of its function.
+
+        The functions are called concurrently if the tab group is
+        :attr:`concurrent`, otherwise when the returned callables are.
+        """
+        if not self.concurrent:
+            for key, func in calls:
+                yield key, func
+            return
+        pool = parallel.get_pool()
+        futures = [(key, pool.submit(func)) for key, func in calls]
+        for key, future in futures:
+            yield key, future.result
 
     def get_id(self):
         """Returns the id for this tab group. Defaults to the value of the tab
@@ -281,7 +318,8 @@ class Tab(html.HTMLElement):
 
     @property
     def load(self):
-        load_preloaded = self.preload or self.is_active()
+        preload = self.preload and not self.tab_group.lazy
+        load_preloaded = preload or self.is_active()
         return load_preloaded and self._allowed and self._enabled
 
     @property
@@ -431,6 +469,7 @@ class TableTab(Tab):
         """
         # We only want the data to be loaded once, so we track if we have...
         if not self._table_data_loaded:
+            calls = []
             for table_name, table in self._tables.items():
                 # Fetch the data function.
                 func_name = "get_%s_data" % table_name
@@ -439,8 +478,10 @@ class TableTab(Tab):
                     cls_name = self.__class__.__name__
                     raise NotImplementedError("You must define a %s method "
                                               "on %s." % (func_name, cls_name))
+                calls.append((table, data_func))
+            for table, result in self.tab_group.call(calls):
                 # Load the data.
-                table.data = data_func()
+                table.data = result()
                 table._meta.has_prev_data = self.has_prev_data(table)
                 table._meta.has_more_data = self.has_more_data(table)
             # Mark our data as loaded so we don't run the loaders again.
@@ -108,6 +108,9 @@ class TabbedTableView(tables.MultiTableMixin, TabView):
         # doesn't freak out. We do the processing at the TableTab level.
         return {}
 
+    def _get_table_instances(self):
+        return [t['table'] for t in self._table_dict.values()]
+
     def handle_table(self, table_dict):
         """For the given dict containing a ``DataTable`` and a ``TableTab``
         instance, it loads the table data for that tab and calls the
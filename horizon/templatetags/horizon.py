@@ -18,13 +18,16 @@ from horizon.contrib import bootstrap_datepicker
 
 from django.conf import settings
 from django import template
+from django.template.loader import render_to_string
 from django.utils.datastructures import SortedDict
 from django.utils.encoding import force_text
+from django.utils.safestring import mark_safe
 from django.utils import translation
 from django.utils.translation import ugettext_lazy as _
 
 from horizon.base import Horizon  # noqa
 from horizon import conf
+from horizon.utils import navigation
 
 
 register = template.Library()
@@ -44,38 +47,79 @@ def has_permissions_on_list(components, user):
             in components if has_permissions(user, component)]
 
 
-@register.inclusion_tag('horizon/_accordion_nav.html', takes_context=True)
+def _nav(component, context):
+    if callable(component.nav):
+        return component.nav(context)
+    return component.nav
+
+
+def _use_nav_tree(request):
+    """Tells whether the navigation tree is to be used, rather than checking
+    the access to the dashboards and panels shown only.
+    """
+    return navigation.is_enabled() or navigation.has_tree(request)
+
+
+def _get_nav_tree(context):
+    """Yields a (dashboard, allowed, [(panel group, [panel, ...]), ...])
+    tuple for each dashboard, with the panels the user may access and which
+    are to be shown in the navigation.
+    """
+    dashboards = Horizon.get_dashboards()
+    registered = dict((dash.slug, dash) for dash in dashboards)
+    for dash_slug, allowed, groups in navigation.get_tree(context,
+                                                          dashboards):
+        # The tree may come from a process with other dashboards.
+        dash = registered.get(dash_slug)
+        if dash is None:
+            continue
+        panel_groups = dash.get_panel_groups()
+        visible_groups = []
+        for group_slug, panel_slugs in groups:
+            group = panel_groups.get(group_slug)
+            if group is None:
+                continue
+            panels = dict((panel.slug, panel) for panel in group)
+            visible = [panels[slug] for slug in panel_slugs
+                       if slug in panels and _nav(panels[slug], context)]
+            if visible:
+                visible_groups.append((group, visible))
+        yield dash, allowed, visible_groups
+
+
+@register.simple_tag(takes_context=True)
 def horizon_nav(context):
     if 'request' not in context:
-        return {}
-    current_dashboard = context['request'].horizon.get('dashboard', None)
-    current_panel = context['request'].horizon.get('panel', None)
+        return render_to_string('horizon/_accordion_nav.html', {})
+    request = context['request']
+    current_dashboard = request.horizon.get('dashboard', None)
+    current_panel = request.horizon.get('panel', None)
     dashboards = []
-    for dash in Horizon.get_dashboards():
-        panel_groups = dash.get_panel_groups()
-        non_empty_groups = []
-        for group in panel_groups.values():
-            allowed_panels = []
-            for panel in group:
-                if (callable(panel.nav) and panel.nav(context) and
-                        panel.can_access(context)):
-                    allowed_panels.append(panel)
-                elif (not callable(panel.nav) and panel.nav and
-                        panel.can_access(context)):
-                    allowed_panels.append(panel)
-            if allowed_panels:
-                non_empty_groups.append((group.name, allowed_panels))
-        if (callable(dash.nav) and dash.nav(context) and
-                dash.can_access(context)):
-            dashboards.append((dash, SortedDict(non_empty_groups)))
-        elif (not callable(dash.nav) and dash.nav and
-                dash.can_access(context)):
-            dashboards.append((dash, SortedDict(non_empty_groups)))
-    return {'components': dashboards,
-            'user': context['request'].user,
-            'current': current_dashboard,
-            'current_panel': current_panel.slug if current_panel else '',
-            'request': context['request']}
+    slugs = []
+    for dash, allowed, groups in _get_nav_tree(context):
+        if allowed and _nav(dash, context):
+            dashboards.append((dash, SortedDict(
+                (group.name, panels) for group, panels in groups)))
+            slugs.append((dash.slug, [
+                (group.slug, [panel.slug for panel in panels])
+                for group, panels in groups]))
+    nav_context = {'components': dashboards,
+                   'user': request.user,
+                   'current': current_dashboard,
+                   'current_panel': current_panel.slug
+                   if current_panel else '',
+                   'request': request}
+    if not navigation.is_enabled():
+        return render_to_string('horizon/_accordion_nav.html', nav_context)
+
+    key = navigation.get_fragment_key(
+        request, slugs, getattr(current_dashboard, 'slug', None),
+        nav_context['current_panel'])
+    html = navigation.get_fragment(key)
+    if html is None:
+        html = render_to_string('horizon/_accordion_nav.html', nav_context)
+        navigation.set_fragment(key, html)
+    return mark_safe(html)
 
 
 @register.inclusion_tag('horizon/_nav_list.html', takes_context=True)
@@ -84,13 +128,13 @@ def horizon_main_nav(context):
     if 'request' not in context:
         return {}
     current_dashboard = context['request'].horizon.get('dashboard', None)
-    dashboards = []
-    for dash in Horizon.get_dashboards():
-        if dash.can_access(context):
-            if callable(dash.nav) and dash.nav(context):
-                dashboards.append(dash)
-            elif dash.nav:
-                dashboards.append(dash)
+    if _use_nav_tree(context['request']):
+        dashboards = [dash for dash, allowed, groups
+                      in _get_nav_tree(context)
+                      if allowed and _nav(dash, context)]
+    else:
+        dashboards = [dash for dash in Horizon.get_dashboards()
+                      if dash.can_access(context) and _nav(dash, context)]
     return {'components': dashboards,
             'user': context['request'].user,
             'current': current_dashboard,
@@ -103,23 +147,24 @@ def horizon_dashboard_nav(context):
     if 'request' not in context:
         return {}
     dashboard = context['request'].horizon['dashboard']
-    panel_groups = dashboard.get_panel_groups()
+    groups = []
+    if _use_nav_tree(context['request']):
+        for dash, allowed, dash_groups in _get_nav_tree(context):
+            if dash.slug == dashboard.slug:
+                groups = dash_groups
+    else:
+        # Only the panels of the current dashboard are checked.
+        for group in dashboard.get_panel_groups().values():
+            panels = [panel for panel in group
+                      if _nav(panel, context) and panel.can_access(context)]
+            if panels:
+                groups.append((group, panels))
     non_empty_groups = []
-
-    for group in panel_groups.values():
-        allowed_panels = []
-        for panel in group:
-            if (callable(panel.nav) and panel.nav(context) and
-                    panel.can_access(context)):
-                allowed_panels.append(panel)
-            elif (not callable(panel.nav) and panel.nav and
-                    panel.can_access(context)):
-                allowed_panels.append(panel)
-        if allowed_panels:
-            if group.name is None:
-                non_empty_groups.append((dashboard.name, allowed_panels))
-            else:
-                non_empty_groups.append((group.name, allowed_panels))
+    for group, panels in groups:
+        if group.name is None:
+            non_empty_groups.append((dashboard.name, panels))
+        else:
+            non_empty_groups.append((group.name, panels))
 
     return {'components': SortedDict(non_empty_groups),
             'user': context['request'].user,
@@ -19,19 +19,27 @@
 
 from django.conf import settings
 from django.contrib.auth.models import User  # noqa
+from django.core.cache import cache
 from django.core.exceptions import ImproperlyConfigured  # noqa
 from django.core import urlresolvers
+from django import http
+from django.template import Context  # noqa
+from django.template import Template  # noqa
 from django.utils.importlib import import_module  # noqa
+from mox import IgnoreArg  # noqa
 
 import horizon
 from horizon import base
 from horizon import conf
+from horizon.templatetags import horizon as horizon_tags
 from horizon.test import helpers as test
 from horizon.test.test_dashboards.cats.dashboard import Cats  # noqa
 from horizon.test.test_dashboards.cats.kittens.panel import Kittens  # noqa
 from horizon.test.test_dashboards.cats.tigers.panel import Tigers  # noqa
 from horizon.test.test_dashboards.dogs.dashboard import Dogs  # noqa
 from horizon.test.test_dashboards.dogs.puppies.panel import Puppies  # noqa
+from horizon.utils import navigation
+from horizon.utils import parallel
 
 
 class MyDash(horizon.Dashboard):
@@ -521,3 +529,133 @@ class RbacHorizonTests(test.TestCase):
                                  ['<Panel: rbac_panel_yes>'])
 
         self.assertTrue(dogs.can_access(context))
+
+
+class NavCacheTests(RbacHorizonTests):
+
+    def setUp(self):
+        super(NavCacheTests, self).setUp()
+        self.old_nav_cache = settings.HORIZON_CONFIG.get('nav_cache')
+        settings.HORIZON_CONFIG['nav_cache'] = {'enabled': True,
+                                                'timeout': 300,
+                                                'stale_timeout': 3600}
+        conf.HORIZON_CONFIG._setup()
+        cache.clear()
+
+    def tearDown(self):
+        super(NavCacheTests, self).tearDown()
+        if self.old_nav_cache is None:
+            del settings.HORIZON_CONFIG['nav_cache']
+        else:
+            settings.HORIZON_CONFIG['nav_cache'] = self.old_nav_cache
+        conf.HORIZON_CONFIG._setup()
+
+    def _new_context(self):
+        request = http.HttpRequest()
+        request.user = self.user
+        request.session = self.client._session()
+        request.horizon = {'dashboard': None, 'panel': None}
+        return {'request': request}
+
+    def test_tree_shared(self):
+        self.mox.StubOutWithMock(RbacYesAccessPanel, 'allowed')
+        RbacYesAccessPanel.allowed(IgnoreArg()).AndReturn(True)
+        self.mox.ReplayAll()
+
+        dashboards = base.Horizon.get_dashboards()
+        expected = [('cats', False, []),
+                    ('dogs', True, [('other', ['rbac_panel_yes'])])]
+        for i in range(2):
+            context = self._new_context()
+            self.assertEqual(expected,
+                             navigation.get_tree(context, dashboards))
+            # The access checks are not stored in the session anymore.
+            self.assertNotIn('allowed', context['request'].session)
+
+    def test_tree_per_permissions(self):
+        self.mox.StubOutWithMock(RbacYesAccessPanel, 'allowed')
+        RbacYesAccessPanel.allowed(IgnoreArg()).AndReturn(True)
+        RbacYesAccessPanel.allowed(IgnoreArg()).AndReturn(False)
+        self.mox.ReplayAll()
+
+        dashboards = base.Horizon.get_dashboards()
+        navigation.get_tree(self._new_context(), dashboards)
+        self.set_permissions(['horizon.test'])
+        self.assertEqual([('cats', False, []), ('dogs', False, [])],
+                         navigation.get_tree(self._new_context(),
+                                             dashboards))
+
+    def test_stale_tree_rebuilt(self):
+        self.mox.StubOutWithMock(RbacYesAccessPanel, 'allowed')
+        RbacYesAccessPanel.allowed(IgnoreArg()).AndReturn(True)
+        RbacYesAccessPanel.allowed(IgnoreArg()).AndReturn(False)
+        self.mox.StubOutWithMock(parallel, 'get_pool')
+        parallel.get_pool().AndReturn(parallel.ThreadPool(0))
+        self.mox.ReplayAll()
+
+        dashboards = base.Horizon.get_dashboards()
+        context = self._new_context()
+        tree = navigation.get_tree(context, dashboards)
+        key = navigation.get_key(context['request'])
+        cache.set(key, (tree, 0))
+        # The stale tree is served while the new one is built.
+        self.assertEqual(tree, navigation.get_tree(self._new_context(),
+                                                   dashboards))
+        self.assertEqual([('cats', False, []), ('dogs', False, [])],
+                         navigation.get_tree(self._new_context(),
+                                             dashboards))
+
+    def test_tree_built_once_per_request(self):
+        settings.HORIZON_CONFIG['nav_cache'] = {'enabled': False}
+        conf.HORIZON_CONFIG._setup()
+        self.mox.StubOutWithMock(RbacYesAccessPanel, 'allowed')
+        RbacYesAccessPanel.allowed(IgnoreArg()).AndReturn(True)
+        self.mox.ReplayAll()
+
+        dashboards = base.Horizon.get_dashboards()
+        context = self._new_context()
+        tree = navigation.get_tree(context, dashboards)
+        self.assertTrue(navigation.has_tree(context['request']))
+        self.assertEqual(tree, navigation.get_tree(context, dashboards))
+
+    def test_stale_tree_rebuilt_without_request(self):
+        self.mox.StubOutWithMock(RbacYesAccessPanel, 'allowed')
+        RbacYesAccessPanel.allowed(IgnoreArg()).AndReturn(True)
+        self.mox.StubOutWithMock(parallel, 'get_pool')
+        pool = self.mox.CreateMock(parallel.ThreadPool)
+        parallel.get_pool().AndReturn(pool)
+        submitted = {}
+
+        def rebuild(func, key, context, dashboards):
+            submitted['request'] = context['request']
+        pool.submit(IgnoreArg(), IgnoreArg(), IgnoreArg(),
+                    IgnoreArg()).WithSideEffects(rebuild)
+        self.mox.ReplayAll()
+
+        dashboards = base.Horizon.get_dashboards()
+        context = self._new_context()
+        tree = navigation.get_tree(context, dashboards)
+        cache.set(navigation.get_key(context['request']), (tree, 0))
+        context = self._new_context()
+        navigation.get_tree(context, dashboards)
+        # The rebuild gets a copy of the user and session of the request.
+        request = submitted['request']
+        self.assertIsNot(context['request'], request)
+        self.assertIsNot(context['request'].user, request.user)
+        self.assertEqual(self.user.id, request.user.id)
+        self.assertEqual(navigation.get_key(context['request']),
+                         navigation.get_key(request))
+
+    def test_nav_fragment_cached(self):
+        self.mox.StubOutWithMock(RbacYesAccessPanel, 'allowed')
+        RbacYesAccessPanel.allowed(IgnoreArg()).AndReturn(True)
+        self.mox.stubs.Set(horizon_tags, 'Horizon', base.Horizon)
+        self.mox.StubOutWithMock(horizon_tags, 'render_to_string')
+        horizon_tags.render_to_string('horizon/_accordion_nav.html',
+                                      IgnoreArg()).AndReturn(u'<dl></dl>')
+        self.mox.ReplayAll()
+
+        template = Template("{% load horizon %}{% horizon_nav %}")
+        for i in range(2):
+            self.assertEqual(u'<dl></dl>',
+                             template.render(Context(self._new_context())))
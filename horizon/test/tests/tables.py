@@ -13,15 +13,22 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import threading
+
 from django.core.urlresolvers import reverse
 from django import forms
 from django import http
 from django import shortcuts
+from django import template
 from django.template import defaultfilters
+from django.template import response
+from django.test.utils import override_settings
 
 from mox import IsA  # noqa
 
+from horizon import exceptions
 from horizon import tables
+from horizon.tables import base as table_base
 from horizon.tables import formset as table_formset
 from horizon.tables import views as table_views
 from horizon.test import helpers as test
@@ -263,6 +270,13 @@ class MyServerFilterTable(MyTable):
                        MyBatchActionWithHelpText)
 
 
+class MyServerSortTable(MyTable):
+    class Meta(object):
+        name = "my_table"
+        columns = ('id', 'name', 'value', 'status')
+        server_sort_fields = {'value': 'value_key', 'status': 'status'}
+
+
 class MyTableSelectable(MyTable):
     class Meta(object):
         name = "my_table"
@@ -379,6 +393,109 @@ class DataTableTests(test.TestCase):
         self.assertEqual(forms.CharField, name_column.form_field.__class__)
         self.assertEqual({'class': 'test'}, name_column.form_field_attributes)
 
+    def test_cells_are_compact(self):
+        self.table = MyTable(self.request, TEST_DATA)
+        row = self.table.get_rows()[0]
+        id_cell = row.cells['id']
+        self.assertFalse(hasattr(id_cell, '__dict__'))
+        # Cells without attributes of their own do not create them.
+        self.assertEqual('hide normal_column',
+                         id_cell.get_final_attrs()['class'])
+        self.assertFalse(hasattr(id_cell, '_attrs'))
+        self.assertFalse(hasattr(id_cell, '_classes'))
+        id_cell.attrs['title'] = 'Id'
+        self.assertEqual('Id', id_cell.get_final_attrs()['title'])
+
+    def _get_counting_table_class(self, calls):
+        def get_status(obj):
+            calls.append(obj.id)
+            return obj.status
+
+        def get_size(obj):
+            calls.append(obj.id)
+            return len(obj.name)
+
+        class CountingTable(tables.DataTable):
+            id = tables.Column('id')
+            status = tables.Column(get_status, status=True,
+                                   status_choices=(('up', True),
+                                                   ('down', False)))
+            size = tables.Column(get_size, summation='sum')
+
+            class Meta(object):
+                name = "counting_table"
+                status_columns = ["status"]
+
+        return CountingTable
+
+    def test_column_transform_called_once_per_datum(self):
+        calls = []
+        self.table = self._get_counting_table_class(calls)(self.request,
+                                                           TEST_DATA)
+        self.table.render()
+        self.assertEqual(24, self.table.columns['size'].get_summation())
+        self.assertEqual(['1', '1', '2', '2', '3', '3'], sorted(calls))
+
+    @override_settings(DEBUG=True)
+    def test_column_transform_counts(self):
+        calls = []
+        self.table = self._get_counting_table_class(calls)(self.request,
+                                                           TEST_DATA)
+        self.table.render()
+        self.assertEqual({'id': 3, 'status': 3, 'size': 3},
+                         dict(self.table._transform_counts))
+
+    def test_column_transform_counts_disabled(self):
+        self.table = MyTable(self.request, TEST_DATA)
+        self.table.render()
+        self.assertIsNone(self.table._transform_counts)
+
+    @override_settings(DEBUG=True)
+    def test_row_templates_loaded_once(self):
+        self.table = MyTable(self.request, TEST_DATA)
+        rows = self.table.get_rows()
+        self.mox.StubOutWithMock(template.loader, 'get_template')
+        template.loader.get_template('horizon/common/_data_table_row.html') \
+            .AndReturn(template.Template('{{ row.id }}'))
+        self.mox.ReplayAll()
+        rendered = [row.render() for row in rows]
+        self.assertEqual(['my_table__row__1', 'my_table__row__2',
+                          'my_table__row__3'], rendered)
+
+    def test_row_templates_loaded_once_per_process(self):
+        tables_rows = [MyTable(self.request, TEST_DATA).get_rows()
+                       for i in range(2)]
+        self.mox.stubs.Set(table_base, '_TEMPLATES', {})
+        self.mox.StubOutWithMock(template.loader, 'get_template')
+        template.loader.get_template('horizon/common/_data_table_row.html') \
+            .AndReturn(template.Template('{{ row.id }}'))
+        self.mox.ReplayAll()
+        for rows in tables_rows:
+            self.assertEqual(['my_table__row__1', 'my_table__row__2',
+                              'my_table__row__3'],
+                             [row.render() for row in rows])
+
+    def test_table_render_streaming(self):
+        self.table = MyTable(self.request, TEST_DATA)
+        chunks = list(self.table.render_streaming())
+        # The markup before the rows, the rows and the markup after them.
+        self.assertEqual(len(TEST_DATA) + 2, len(chunks))
+        # Only the whitespace between the rows differs.
+        self.assertHTMLEqual(self.table.render(), ''.join(chunks))
+        self.assertIn('Displaying 3 items', chunks[-1])
+
+    def test_table_render_streaming_empty(self):
+        self.table = MyTable(self.request, [])
+        chunks = list(self.table.render_streaming())
+        self.assertEqual(1, len(chunks))
+        self.assertEqual(self.table.render(), chunks[0])
+
+    def test_table_placeholder(self):
+        self.table = MyTable(self.request, TEST_DATA)
+        placeholder = self.table.get_placeholder()
+        self.assertEqual(placeholder, self.table.render())
+        self.assertNotIn(placeholder, ''.join(self.table.render_streaming()))
+
     def test_table_force_no_multiselect(self):
         class TempTable(MyTable):
             class Meta(object):
@@ -1209,6 +1326,92 @@ class DataTableTests(test.TestCase):
         self.assertEqual(u"Downed Item: N/A",
                          list(req._messages)[0].message)
 
+    def test_get_object_by_id(self):
+        self.table = MyTable(self.request, TEST_DATA)
+        self.assertEqual(TEST_DATA[1], self.table.get_object_by_id(2))
+        self.assertEqual(TEST_DATA[1], self.table.get_object_by_id(u'2'))
+        self.assertRaises(exceptions.Http302,
+                          self.table.get_object_by_id, '4')
+        # The index follows the table's data.
+        self.table.data = TEST_DATA_2
+        self.assertEqual(TEST_DATA_2[0], self.table.get_object_by_id('1'))
+        self.assertRaises(exceptions.Http302,
+                          self.table.get_object_by_id, '2')
+        self.table.data = TEST_DATA + TEST_DATA_2
+        self.assertRaises(ValueError, self.table.get_object_by_id, '1')
+        # Objects replaced in place are found.
+        self.table.data = list(TEST_DATA)
+        self.table.get_object_by_id('1')
+        self.table.data[0] = TEST_DATA_2[0]
+        self.assertEqual(TEST_DATA_2[0], self.table.get_object_by_id('1'))
+
+    def test_cached_row_actions(self):
+        class CachedTable(MyTable):
+            class Meta(object):
+                name = "my_table"
+                row_actions = MyTable._meta.row_actions
+                cache_row_actions = True
+
+        data = [FakeObject('%08d-uuid' % i, 'object_%d' % i, 'value', 'up')
+                for i in range(3)] + list(TEST_DATA)
+        table = MyTable(self.request, data)
+        cached_table = CachedTable(self.request, data)
+        for datum in data:
+            self.assertEqual(table.render_row_actions(datum),
+                             cached_table.render_row_actions(datum))
+        # The markup of the first rows is reused once the second row shows
+        # that it only differs by the object id.
+        key = cached_table._get_row_actions_key(
+            cached_table._meta.row_actions_dropdown_template, True,
+            data[2].id, cached_table.get_row_actions(data[2]))
+        self.assertTrue(cached_table._row_actions_cache[key][2])
+
+    def test_cached_row_actions_static_id(self):
+        class CachedTable(MyTable):
+            class Meta(object):
+                name = "my_table"
+                row_actions = MyTable._meta.row_actions
+                cache_row_actions = True
+
+            def render_with_context(self, template, extra_context,
+                                    request_context=False):
+                # Markup where the id of the second row also appears as
+                # static text.
+                return '<a href="/%s/" class="span2">' % \
+                    extra_context['row_id']
+
+        table = CachedTable(self.request, TEST_DATA)
+        self.assertEqual('<a href="/1/" class="span2">',
+                         table.render_row_actions(TEST_DATA[0]))
+        self.assertEqual('<a href="/2/" class="span2">',
+                         table.render_row_actions(TEST_DATA[1]))
+        self.assertEqual('<a href="/3/" class="span2">',
+                         table.render_row_actions(TEST_DATA[2]))
+
+    def test_concurrent_batch_action(self):
+        class ConcurrentBatchAction(MyBatchAction):
+            concurrent = True
+
+            def action(self, request, obj_id):
+                if obj_id == '2':
+                    raise exceptions.NotAvailable("failed")
+
+        class ConcurrentTable(MyTable):
+            class Meta(object):
+                name = "my_table"
+                table_actions = (ConcurrentBatchAction,)
+
+        req = self.factory.post('/my_url/', {'action': 'my_table__batch',
+                                             'object_ids': [1, 2, 3]})
+        self.table = ConcurrentTable(req, TEST_DATA)
+        handled = self.table.maybe_handle()
+        self.assertEqual(302, handled.status_code)
+        self.assertEqual(['1', '3'],
+                         self.table.base_actions['batch'].success_ids)
+        self.assertEqual([u"Unable to batch item: object_2",
+                          u"Batched Items: object_1, object_3"],
+                         [m.message for m in req._messages])
+
     def test_table_column_can_be_selected(self):
         self.table = MyTableSelectable(self.request, TEST_DATA_6)
         # non selectable row
@@ -1305,6 +1508,69 @@ class DataTableTests(test.TestCase):
         self.assertContains(resp, value)
 
 
+class ServerSortTableTests(test.TestCase):
+    def _get_table(self, params):
+        request = self.factory.get('/my_url/', params)
+        request.user = self.user
+        return MyServerSortTable(request, TEST_DATA)
+
+    def test_sort_from_query(self):
+        table = self._get_table({'sort': 'status', 'sort_dir': 'desc'})
+        self.assertEqual('status', table.get_sort_column())
+        self.assertEqual('status', table.get_sort_key())
+        self.assertEqual('desc', table.get_sort_dir())
+
+    def test_sort_column_not_declared(self):
+        # The name column is sortable in the browser only.
+        table = self._get_table({'sort': 'name', 'sort_dir': 'desc'})
+        self.assertIsNone(table.get_sort_column())
+        self.assertIsNone(table.get_sort_key())
+        self.assertIsNone(table.get_sort_dir())
+
+    def test_sort_columns(self):
+        table = self._get_table({'sort': 'value'})
+        value = table.columns['value']
+        self.assertTrue(value.server_sortable)
+        self.assertNotIn('sortable',
+                         value.get_final_attrs()['class'].split())
+        self.assertIn('sorted_asc', value.get_final_attrs()['class'])
+        self.assertEqual('sort=value&sort_dir=desc', value.get_sort_string())
+        status = table.columns['status']
+        self.assertNotIn('sorted_asc', status.get_final_attrs()['class'])
+        self.assertEqual('sort=status&sort_dir=asc',
+                         status.get_sort_string())
+        name = table.columns['name']
+        self.assertFalse(name.server_sortable)
+        self.assertIn('sortable', name.get_final_attrs()['class'].split())
+        # The class level columns are left untouched.
+        self.assertNotIn('server_sortable',
+                         MyServerSortTable.base_columns['value'].classes)
+
+    def test_sort_string_keeps_query(self):
+        # The filter is kept, the sort restarts from the first page.
+        table = self._get_table({'sort': 'value', 'q': 'abc',
+                                 'marker': 'id'})
+        self.assertEqual('sort=value&sort_dir=desc&q=abc',
+                         table.columns['value'].get_sort_string())
+
+    def test_pagination_keeps_sort(self):
+        table = self._get_table({'sort': 'value', 'sort_dir': 'desc'})
+        self.assertEqual('marker=3&sort=value&sort_dir=desc',
+                         table.get_pagination_string())
+        self.assertEqual('prev_marker=1&sort=value&sort_dir=desc',
+                         table.get_prev_pagination_string())
+        table = self._get_table({})
+        self.assertEqual('marker=3', table.get_pagination_string())
+
+    def test_render_sort_links(self):
+        table = self._get_table({'sort': 'value'})
+        resp = http.HttpResponse(table.render())
+        self.assertContains(resp, '<a href="?sort=value&amp;sort_dir=desc">',
+                            1)
+        self.assertContains(resp, '<a href="?sort=status&amp;sort_dir=asc">',
+                            1)
+
+
 class SingleTableView(table_views.DataTableView):
     table_class = MyTable
     name = "Single Table"
@@ -1319,6 +1585,14 @@ class APIFilterTableView(SingleTableView):
     table_class = MyServerFilterTable
 
 
+class ServerSortTableView(SingleTableView):
+    table_class = MyServerSortTable
+
+    def get_data(self, **kwargs):
+        self.paging_kwargs = kwargs
+        return TEST_DATA
+
+
 class TableWithPermissions(tables.DataTable):
     id = tables.Column('id')
 
@@ -1341,6 +1615,25 @@ class MultiTableView(tables.MultiTableView):
         return TEST_DATA
 
 
+class ConcurrentMultiTableView(tables.MultiTableView):
+    table_classes = (TableWithPermissions, MyTable)
+    concurrent = True
+
+    def __init__(self, *args, **kwargs):
+        super(ConcurrentMultiTableView, self).__init__(*args, **kwargs)
+        self.my_table_loaded = threading.Event()
+        self.waited = None
+
+    def get_table_with_permissions_data(self):
+        # Only returns once the data of the other table is loaded.
+        self.waited = self.my_table_loaded.wait(5)
+        return TEST_DATA[:1]
+
+    def get_my_table_data(self):
+        self.my_table_loaded.set()
+        return TEST_DATA
+
+
 class DataTableViewTests(test.TestCase):
     def _prepare_view(self, cls, *args, **kwargs):
         req = self.factory.get('/my_url/')
@@ -1384,6 +1677,73 @@ class DataTableViewTests(test.TestCase):
         self.assertEqual(TableWithPermissions,
                          context['table_with_permissions_table'].__class__)
 
+    def test_multi_table_view_concurrent(self):
+        view = self._prepare_view(ConcurrentMultiTableView)
+        self.set_permissions(permissions=['test'])
+        self.assertIsNone(view.construct_tables())
+        # The data of the tables was loaded at the same time.
+        self.assertTrue(view.waited)
+        tables = view.get_tables()
+        self.assertQuerysetEqual(tables['table_with_permissions'].data,
+                                 ['<FakeObject: object_1>'])
+        self.assertQuerysetEqual(tables['my_table'].data,
+                                 ['<FakeObject: object_1>',
+                                  '<FakeObject: object_2>',
+                                  '<FakeObject: object_3>'])
+
+    def test_server_sort_table_view(self):
+        view = self._prepare_view(ServerSortTableView)
+        view.request = self.factory.get('/my_url/', {'sort': 'value',
+                                                     'sort_dir': 'desc',
+                                                     'marker': '2'})
+        view.request.user = self.user
+        view.construct_tables()
+        self.assertEqual({'marker': '2',
+                          'prev_marker': None,
+                          'sort_key': 'value_key',
+                          'sort_dir': 'desc'}, view.paging_kwargs)
+
+    def test_server_sort_table_view_unsorted(self):
+        view = self._prepare_view(ServerSortTableView)
+        view.construct_tables()
+        self.assertEqual({'marker': None,
+                          'prev_marker': None,
+                          'sort_key': None,
+                          'sort_dir': None}, view.paging_kwargs)
+
+    def test_data_table_view_streaming(self):
+        req = self.factory.get('/my_url/')
+        req.user = self.user
+        res = SingleTableView.as_view()(req)
+        res.render()
+        streamed = SingleTableView.as_view(streaming_threshold=0)(req)
+        self.assertTrue(streamed.streaming)
+        self.assertHTMLEqual(res.content,
+                             b''.join(streamed.streaming_content))
+
+    def test_data_table_view_streaming_headers(self):
+        class HeaderResponse(response.TemplateResponse):
+            def __init__(self, *args, **kwargs):
+                super(HeaderResponse, self).__init__(*args, **kwargs)
+                self['Vary'] = 'Cookie'
+                self.set_cookie('table', 'value')
+
+        req = self.factory.get('/my_url/')
+        req.user = self.user
+        streamed = SingleTableView.as_view(streaming_threshold=0,
+                                           response_class=HeaderResponse)(req)
+        self.assertTrue(streamed.streaming)
+        self.assertEqual('Cookie', streamed['Vary'])
+        self.assertEqual('value', streamed.cookies['table'].value)
+        self.assertIn('text/html', streamed['Content-Type'])
+
+    def test_data_table_view_streaming_threshold(self):
+        # Tables with less rows than the threshold are not streamed.
+        req = self.factory.get('/my_url/')
+        req.user = self.user
+        res = SingleTableView.as_view(streaming_threshold=3)(req)
+        self.assertFalse(res.streaming)
+
     fil_value_param = "my_table__filter__q"
     fil_field_param = '%s_field' % fil_value_param
 
@@ -69,6 +69,10 @@ class Group(horizon_tabs.TabGroup):
         self._assert_tabs_not_available = True
 
 
+class LazyGroup(Group):
+    lazy = True
+
+
 class TabWithTable(horizon_tabs.TableTab):
     table_classes = (MyTable,)
     name = "Tab With My Table"
@@ -96,11 +100,19 @@ class TableTabGroup(horizon_tabs.TabGroup):
     tabs = [TabWithTable]
 
 
+class ConcurrentTableTabGroup(TableTabGroup):
+    concurrent = True
+
+
 class TabWithTableView(horizon_tabs.TabbedTableView):
     tab_group_class = TableTabGroup
     template_name = "tab_group.html"
 
 
+class StreamingTabWithTableView(TabWithTableView):
+    streaming_threshold = 0
+
+
 class TabTests(test.TestCase):
     def test_tab_group_basics(self):
         tg = Group(self.request)
@@ -200,6 +212,19 @@ class TabTests(test.TestCase):
         self.assertFalse(tab_one.is_active())
         self.assertTrue(tab_delayed.is_active())
 
+    def test_lazy_tab_group(self):
+        tg = LazyGroup(self.request)
+        self.assertTrue(tg.get_tab("tab_one").load)
+        self.assertFalse(tg.get_tab("tab_delayed").load)
+
+        self.request.GET['tab'] = "tab_group__tab_delayed"
+        tg = LazyGroup(self.request)
+        self.assertFalse(tg.get_tab("tab_one").load)
+        self.assertTrue(tg.get_tab("tab_delayed").load)
+        tg.load_tab_data()
+        self.assertFalse(tg.get_tab("tab_one").data_loaded)
+        self.assertTrue(tg.get_tab("tab_delayed").data_loaded)
+
     def test_rendering(self):
         tg = Group(self.request)
         tab_one = tg.get_tab("tab_one")
@@ -259,6 +284,16 @@ class TabTests(test.TestCase):
         # Since we only had one table we should get the shortcut name too.
         self.assertEqual(table, context['table'])
 
+    def test_concurrent_table_tabs(self):
+        tab_group = ConcurrentTableTabGroup(self.request)
+        tab_group.load_tab_data()
+        tab = tab_group.get_tabs()[0]
+        self.assertTrue(tab._table_data_loaded)
+        table = tab._tables[MyTable.Meta.name]
+        self.assertQuerysetEqual(table.data, ['<FakeObject: object_1>',
+                                              '<FakeObject: object_2>',
+                                              '<FakeObject: object_3>'])
+
     def test_tabbed_table_view(self):
         view = TabWithTableView.as_view()
 
@@ -292,6 +327,15 @@ class TabTests(test.TestCase):
         req = self.factory.post('/', {'action': action_string})
         self.assertRaises(exceptions.Http302, view, req)
 
+    def test_tabbed_table_view_streaming(self):
+        req = self.factory.get("/")
+        res = TabWithTableView.as_view()(req)
+        req = self.factory.get("/")
+        streamed = StreamingTabWithTableView.as_view()(req)
+        self.assertTrue(streamed.streaming)
+        self.assertHTMLEqual(res.content,
+                             b''.join(streamed.streaming_content))
+
 
 class TabExceptionTests(test.TestCase):
     def setUp(self):
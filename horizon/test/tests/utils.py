@@ -14,10 +14,12 @@
 
 import datetime
 import os
+import threading
 
 from django.core.exceptions import ValidationError  # noqa
 import django.template
 from django.template import defaultfilters
+from django.utils import translation
 
 from horizon import forms
 from horizon.test import helpers as test
@@ -26,6 +28,7 @@ from horizon.utils import filters
 from horizon.utils.filters import parse_isotime  # noqa
 from horizon.utils import functions
 from horizon.utils import memoized
+from horizon.utils import parallel
 from horizon.utils import secret_key
 from horizon.utils import units
 from horizon.utils import validators
@@ -355,6 +358,97 @@ class MemoizedTests(test.TestCase):
         self.assertEqual(1, len(values_list))
 
 
+class ParallelTests(test.TestCase):
+
+    def test_call_parallel_results_in_order(self):
+        results = parallel.call_parallel(
+            lambda: 1,
+            (lambda x: x, (2,)),
+            (lambda x, y=None: (x, y), (3,), {'y': 4}))
+        self.assertEqual([1, 2, (3, 4)], results)
+
+    def test_call_parallel_runs_concurrently(self):
+        # Both calls wait for each other, which would dead-lock if they
+        # were run one after the other.
+        barrier = [threading.Event(), threading.Event()]
+
+        def wait_for_other(index):
+            barrier[index].set()
+            return barrier[1 - index].wait(5)
+
+        results = parallel.call_parallel((wait_for_other, (0,)),
+                                         (wait_for_other, (1,)))
+        self.assertEqual([True, True], results)
+
+    def test_call_parallel_reraises_first_exception(self):
+        finished = []
+
+        def fail(message):
+            raise ValueError(message)
+
+        with self.assertRaisesRegexp(ValueError, 'first'):
+            parallel.call_parallel((fail, ('first',)),
+                                   (fail, ('second',)),
+                                   lambda: finished.append(True))
+        self.assertEqual([True], finished)
+
+    def test_nested_submission_runs_inline(self):
+        def outer():
+            return parallel.call_parallel(threading.current_thread)
+
+        outer_thread, inner_threads = parallel.call_parallel(
+            lambda: (threading.current_thread(), outer()))[0]
+        self.assertEqual([outer_thread], inner_threads)
+
+    def test_submission_to_other_pool_runs_concurrently(self):
+        outer_pool = parallel.ThreadPool(1)
+        inner_pool = parallel.ThreadPool(1)
+
+        def outer():
+            return inner_pool.submit(threading.current_thread).result(5)
+
+        outer_thread, inner_thread = outer_pool.submit(
+            lambda: (threading.current_thread(), outer())).result(5)
+        self.assertNotEqual(outer_thread, inner_thread)
+
+    def test_translation_activated_in_workers(self):
+        translation.activate('fr')
+        try:
+            language = parallel.call_parallel(translation.get_language)[0]
+        finally:
+            translation.deactivate()
+        self.assertEqual('fr', language)
+
+    def test_cancel_pending_call(self):
+        pool = parallel.ThreadPool(1)
+        started = threading.Event()
+        release = threading.Event()
+        self.addCleanup(release.set)
+        calls = []
+
+        def block():
+            started.set()
+            return release.wait(5)
+
+        running = pool.submit(block)
+        pending = pool.submit(calls.append, True)
+        started.wait(5)
+        self.assertFalse(running.cancel())
+        self.assertTrue(pending.cancel())
+        self.assertTrue(pending.cancelled())
+        self.assertRaises(parallel.CancelledError, pending.result)
+        release.set()
+        self.assertTrue(running.result(5))
+        pool.submit(lambda: None).result(5)
+        self.assertEqual([], calls)
+
+    def test_pool_without_workers_is_synchronous(self):
+        pool = parallel.ThreadPool(0)
+        future = pool.submit(threading.current_thread)
+        self.assertTrue(future.done())
+        self.assertEqual(threading.current_thread(), future.result())
+
+
 class GetPageSizeTests(test.TestCase):
     def test_bad_session_value(self):
         requested_url = '/project/instances/'
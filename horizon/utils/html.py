@@ -17,6 +17,9 @@ from django.forms.util import flatatt  # noqa
 
 class HTMLElement(object):
     """A generic base class that gracefully handles html-style attributes."""
+    # Lets subclasses which are instantiated in large numbers use slots.
+    __slots__ = ()
+
     def __init__(self):
         self.attrs = getattr(self, "attrs", {})
         self.classes = getattr(self, "classes", [])
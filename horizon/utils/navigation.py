@@ -0,0 +1,213 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""
+Server-side cache of the navigation.
+
+Building the navigation checks the access to every dashboard and panel,
+which runs policy checks and sometimes API calls, on every page. The
+dashboards and panels a user may access only depend on the user's
+permissions (its roles and the services of its catalog), project and
+region, and on the policy files, so the tree of their slugs is cached under
+a key made of these and shared by all the users having the same ones. The
+rendered navigation is cached along with it.
+
+Entries are served for ``timeout`` seconds, then for ``stale_timeout`` more
+seconds while they are rebuilt in the background: a page never waits for
+the navigation to be rebuilt, unless no entry exists at all.
+
+The cache is configured through the ``nav_cache`` key of the
+``HORIZON_CONFIG`` setting, and disabled by default.
+"""
+
+import copy
+import hashlib
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+from django import http
+from django.utils import translation
+
+from horizon import conf
+from horizon.utils import parallel
+
+
+LOG = logging.getLogger(__name__)
+
+KEY_PREFIX = "horizon:nav"
+
+# The attribute of the requests holding their navigation tree, which is
+# only built once per request.
+TREE_ATTR = '_horizon_nav_tree'
+
+# The keys of the entries being rebuilt by this process.
+_refreshing = set()
+_lock = threading.Lock()
+
+
+def _get_config():
+    return conf.HORIZON_CONFIG['nav_cache'] or {}
+
+
+def is_enabled():
+    return _get_config().get('enabled', False)
+
+
+def _get_backend():
+    # Imported here since importing django.core.cache reads the settings,
+    # and horizon.base imports this module while they are loaded.
+    from django.core.cache import get_cache
+    return get_cache(_get_config().get('backend', 'default'))
+
+
+def _get_policy_version():
+    """Returns the modification times of the policy files."""
+    path = getattr(settings, 'POLICY_FILES_PATH', '')
+    mtimes = []
+    for service, name in sorted(getattr(settings, 'POLICY_FILES',
+                                        {}).items()):
+        try:
+            mtimes.append(os.path.getmtime(os.path.join(path, name)))
+        except OSError:
+            mtimes.append(None)
+    return mtimes
+
+
+def get_key(request):
+    """Returns the key of the navigation of the request's user."""
+    user = request.user
+    parts = (sorted(user.get_all_permissions()),
+             getattr(user, 'tenant_id', None),
+             getattr(user, 'user_domain_id', None),
+             getattr(user, 'services_region', None),
+             _get_policy_version())
+    return "%s:%s" % (KEY_PREFIX, hashlib.md5(repr(parts)).hexdigest())
+
+
+def _shown(component):
+    # Components whose nav is a callable are checked on every page.
+    return callable(component.nav) or component.nav
+
+
+def _build(context, dashboards):
+    """Returns the slugs of the dashboards, panel groups and panels which
+    may be shown to the user, as a list of (dashboard slug, allowed,
+    [(group slug, [panel slug, ...]), ...]) tuples, where allowed tells
+    whether the dashboard itself may be shown.
+    """
+    tree = []
+    for dash in dashboards:
+        groups = []
+        for group_slug, group in dash.get_panel_groups().items():
+            panels = [panel.slug for panel in group
+                      if _shown(panel) and panel.can_access(context)]
+            if panels:
+                groups.append((group_slug, panels))
+        # The panels of a dashboard hidden from the navigation are still
+        # listed in its own sub-navigation.
+        allowed = bool(_shown(dash)) and dash.can_access(context)
+        tree.append((dash.slug, allowed, groups))
+    return tree
+
+
+def _store(key, tree):
+    config = _get_config()
+    timeout = config.get('timeout', 300)
+    _get_backend().set(key, (tree, time.time() + timeout),
+                       timeout + config.get('stale_timeout', 3600))
+
+
+def _rebuild(key, context, dashboards):
+    try:
+        _store(key, _build(context, dashboards))
+    except Exception:
+        LOG.exception("Unable to rebuild the navigation.")
+    finally:
+        with _lock:
+            _refreshing.discard(key)
+
+
+def _detach(request):
+    """Returns a request holding a copy of the user and session of the
+    given one, which may still be used once the latter is served.
+    """
+    snapshot = http.HttpRequest()
+    snapshot.user = copy.copy(request.user)
+    roles = getattr(request.user, 'roles', None)
+    if roles is not None:
+        snapshot.user.roles = list(roles)
+    session = getattr(request, 'session', None)
+    snapshot.session = dict(session.items()) if session is not None else {}
+    snapshot.horizon = dict(getattr(request, 'horizon', {}))
+    return snapshot
+
+
+def has_tree(request):
+    """Tells whether the navigation tree of the request was built."""
+    return getattr(request, TREE_ATTR, None) is not None
+
+
+def get_tree(context, dashboards):
+    """Returns the navigation tree of the request in the context, as
+    described by :func:`_build`, from the cache if it is enabled.
+
+    The tree is built once per request, and then kept on the request.
+    """
+    request = context['request']
+    tree = getattr(request, TREE_ATTR, None)
+    if tree is None:
+        tree = _get_tree(context, dashboards)
+        setattr(request, TREE_ATTR, tree)
+    return tree
+
+
+def _get_tree(context, dashboards):
+    if not is_enabled():
+        return _build(context, dashboards)
+    key = get_key(context['request'])
+    entry = _get_backend().get(key)
+    if entry is None:
+        tree = _build(context, dashboards)
+        _store(key, tree)
+        return tree
+    tree, fresh_until = entry
+    if fresh_until <= time.time():
+        with _lock:
+            rebuild = key not in _refreshing
+            _refreshing.add(key)
+        if rebuild:
+            # The request is usually served before the tree is rebuilt.
+            parallel.get_pool().submit(
+                _rebuild, key, {'request': _detach(context['request'])},
+                dashboards)
+    return tree
+
+
+def get_fragment_key(request, *parts):
+    """Returns the key of a rendered part of the navigation, made of the
+    given parts, the navigation key of the request and its language.
+    """
+    parts = (get_key(request), translation.get_language()) + parts
+    return "%s:html:%s" % (KEY_PREFIX, hashlib.md5(repr(parts)).hexdigest())
+
+
+def get_fragment(key):
+    return _get_backend().get(key)
+
+
+def set_fragment(key, html):
+    config = _get_config()
+    _get_backend().set(key, html, config.get('timeout', 300) +
+                       config.get('stale_timeout', 3600))
@@ -0,0 +1,228 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""
+A small thread pool to run independent, I/O bound calls concurrently.
+
+Views typically spend most of their time waiting on several unrelated API
+calls. Submitting them to the pool shared by the process and joining the
+results makes the time spent waiting the longest of these calls rather than
+their sum::
+
+    flavors, images = parallel.call_parallel(
+        (api.nova.flavor_list, (request,)),
+        (api.glance.image_list_detailed, (request,)))
+
+The active translation and time zone of the submitting thread are activated
+in the worker threads, so the submitted calls behave as if they were made
+from the request's thread. Calls submitted to a pool from one of its own
+worker threads are run immediately in that thread, which prevents nested
+submissions from exhausting the pool and deadlocking. Calls submitted to
+another pool (e.g. the pool of an endpoint) are run by that pool's workers.
+"""
+
+import sys
+import threading
+
+from django.utils import timezone
+from django.utils import translation
+import six
+from six.moves import queue
+
+from horizon import conf
+
+
+_local = threading.local()
+
+
+class TimeoutError(Exception):
+    """Raised when the result of a call is not available in time."""
+
+
+class CancelledError(Exception):
+    """Raised when the result of a cancelled call is requested."""
+
+
+class Future(object):
+    """The result of a call submitted to a :class:`ThreadPool`."""
+
+    def __init__(self):
+        self._done = threading.Event()
+        self._result = None
+        self._exc_info = None
+        self._started = False
+        self._cancelled = False
+        self._lock = threading.Lock()
+
+    def done(self):
+        return self._done.is_set()
+
+    def cancel(self):
+        """Cancels the call unless it has already started, and returns
+        whether it is cancelled.
+        """
+        with self._lock:
+            if self._started:
+                return False
+            self._cancelled = True
+        self._done.set()
+        return True
+
+    def cancelled(self):
+        return self._cancelled
+
+    def start(self):
+        """Marks the call as started, unless it was cancelled. Returns
+        whether it should be run.
+        """
+        with self._lock:
+            if self._cancelled:
+                return False
+            self._started = True
+            return True
+
+    def set_result(self, result):
+        self._result = result
+        self._done.set()
+
+    def set_exc_info(self, exc_info):
+        self._exc_info = exc_info
+        self._done.set()
+
+    def result(self, timeout=None):
+        """Returns the result of the call, waiting for it if needed.
+
+        Exceptions raised by the call are re-raised, with their original
+        traceback, in the calling thread.
+        """
+        if not self._done.wait(timeout):
+            raise TimeoutError()
+        if self._cancelled:
+            raise CancelledError()
+        if self._exc_info is not None:
+            six.reraise(*self._exc_info)
+        return self._result
+
+
+def _run(future, func, args, kwargs):
+    if not future.start():
+        return
+    try:
+        future.set_result(func(*args, **kwargs))
+    except BaseException:
+        # Any failure must be handed over to the joining thread, otherwise
+        # it would wait forever.
+        future.set_exc_info(sys.exc_info())
+
+
+def _in_context(func):
+    """Wraps func to run with the caller's language and time zone."""
+    language = translation.get_language()
+    tz = timezone.get_current_timezone()
+
+    def wrapped(*args, **kwargs):
+        if language:
+            translation.activate(language)
+        timezone.activate(tz)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            translation.deactivate()
+            timezone.deactivate()
+    return wrapped
+
+
+class ThreadPool(object):
+    """A pool of at most ``max_workers`` daemon threads.
+
+    Threads are started on demand and never exit. A pool with no workers
+    runs every call synchronously in the submitting thread.
+    """
+
+    def __init__(self, max_workers):
+        self.max_workers = max_workers
+        self._queue = queue.Queue()
+        self._threads = []
+        self._lock = threading.Lock()
+
+    def _worker(self):
+        _local.pool = self
+        while True:
+            future, func, args, kwargs = self._queue.get()
+            _run(future, func, args, kwargs)
+
+    def _start_worker(self):
+        with self._lock:
+            if len(self._threads) >= self.max_workers:
+                return
+            thread = threading.Thread(target=self._worker,
+                                      name="horizon-worker-%d" %
+                                      len(self._threads))
+            thread.daemon = True
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, func, *args, **kwargs):
+        """Schedules ``func(*args, **kwargs)`` and returns its Future."""
+        future = Future()
+        if self.max_workers < 1 or getattr(_local, 'pool', None) is self:
+            _run(future, func, args, kwargs)
+            return future
+        self._queue.put((future, _in_context(func), args, kwargs))
+        self._start_worker()
+        return future
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Returns the pool shared by the whole process."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadPool(conf.HORIZON_CONFIG['parallel_workers'])
+    return _pool
+
+
+def call_parallel(*calls):
+    """Runs the given calls concurrently and returns their results.
+
+    Each call is either a callable, or a tuple of a callable, a sequence of
+    positional arguments and, optionally, a dict of keyword arguments.
+    Results are returned as a list in the order of the calls. Once all the
+    calls are finished, the first exception raised by one of them, if any,
+    is re-raised.
+    """
+    pool = get_pool()
+    futures = []
+    for call in calls:
+        if callable(call):
+            call = (call,)
+        func = call[0]
+        args = call[1] if len(call) > 1 else ()
+        kwargs = call[2] if len(call) > 2 else {}
+        futures.append(pool.submit(func, *args, **kwargs))
+    exc_info = None
+    results = []
+    for future in futures:
+        try:
+            results.append(future.result())
+        except Exception:
+            results.append(None)
+            if exc_info is None:
+                exc_info = sys.exc_info()
+    if exc_info is not None:
+        six.reraise(*exc_info)
+    return results
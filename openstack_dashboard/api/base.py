@@ -54,7 +54,7 @@ class APIVersionManager(object):
     @property
     def active(self):
         if self._active is None:
-            self.get_active_version()
+            return self._get_active_key()
         return self._active
 
     def load_supported_version(self, version, data):
@@ -63,11 +63,16 @@ class APIVersionManager(object):
     def get_active_version(self):
         if self._active is not None:
             return self.supported[self._active]
+        return self.supported[self._get_active_key()]
+
+    def _get_active_key(self):
         key = getattr(settings, self.SETTINGS_KEY, {}).get(self.service_type)
+        discovered = False
+        if key is None:
+            # The setting overrides the discovered versions.
+            key = self.get_discovered_version()
+            discovered = key is not None
         if key is None:
-            # TODO(gabriel): support API version discovery here; we'll leave
-            # the setting in as a way of overriding the latest available
-            # version.
             key = self.preferred
         # Since we do a key lookup in the supported dict the type matters,
         # let's ensure people know if they use a string when the key isn't.
@@ -83,8 +88,32 @@ class APIVersionManager(object):
             msg = ('%s is not a supported API version for the %s service, '
                    ' choices are: %s' % (key, self.service_type, choices))
             raise exceptions.ConfigurationError(msg)
-        self._active = key
-        return self.supported[self._active]
+        if (discovered or
+                self.service_type in getattr(settings, self.SETTINGS_KEY, {})):
+            self._active = key
+        # Otherwise the choice is made again once versions are discovered.
+        return key
+
+    def get_discovered_version(self):
+        """Returns the version to use according to the versions exposed by
+        the service, or None if they are not known.
+
+        The preferred version is kept if the service exposes it, otherwise
+        the latest supported version the service exposes is used.
+        """
+        # Imported here since the capabilities module depends on this one.
+        from openstack_dashboard.api import capabilities
+        discovered = capabilities.get_versions(self.service_type)
+        if not discovered:
+            return None
+        majors = set(major for major, minor in discovered)
+        available = [version for version in self.supported
+                     if int(version) in majors]
+        if not available:
+            return None
+        if self.preferred in available:
+            return self.preferred
+        return max(available)
 
     def clear_active_cache(self):
         self._active = None
@@ -0,0 +1,221 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Cross-request caching of read-mostly API listings.
+
+:func:`horizon.utils.memoized.memoized` only caches for the lifetime of a
+single request. The helpers in this module store the results of selected
+listing calls (flavors, images, networks...) in one of Django's cache
+backends so they can be shared between requests, users of the same project
+and, with a shared backend such as memcached, between processes.
+
+Cached entries are grouped into *namespaces* (e.g. ``"flavors"``). Each
+namespace has a generation marker per service endpoint; the functions which
+create, update or delete the underlying resources bump that marker through
+:func:`invalidate`, which makes every previously cached entry of the
+namespace unreachable at once.
+
+Caching is disabled unless enabled through the ``OPENSTACK_API_CACHE``
+setting.
+"""
+
+import functools
+import hashlib
+import json
+import logging
+import uuid
+
+from django.conf import settings
+from django.core.cache import get_cache
+
+from openstack_dashboard.api import base
+from openstack_dashboard.api import profiler
+
+
+LOG = logging.getLogger(__name__)
+
+KEY_PREFIX = "horizon:api"
+
+# Maps each registered namespace to the service type of its endpoint, so
+# invalidation hooks only need to know the namespace name.
+_NAMESPACES = {}
+
+# Default timeouts of the namespaces holding short-lived data.
+_TIMEOUTS = {}
+
+
+def _get_config():
+    return getattr(settings, 'OPENSTACK_API_CACHE', {})
+
+
+def is_enabled():
+    return _get_config().get('enabled', False)
+
+
+def get_timeout(namespace):
+    config = _get_config()
+    timeouts = config.get('timeouts', {})
+    if namespace in timeouts:
+        return timeouts[namespace]
+    return _TIMEOUTS.get(namespace, config.get('default_timeout', 300))
+
+
+def _get_backend():
+    return get_cache(_get_config().get('backend', 'default'))
+
+
+def _hash(*parts):
+    return hashlib.md5(json.dumps(parts, sort_keys=True,
+                                  default=repr)).hexdigest()
+
+
+def _get_scope(request):
+    """Returns the identity the cached data is visible to.
+
+    Listings depend on the project the token is scoped to and, for some
+    services, on whether the user holds an administrative role, so both
+    are part of the cache key.
+    """
+    user = request.user
+    roles = sorted(role['name'] for role in getattr(user, 'roles', []))
+    return (user.tenant_id, roles)
+
+
+def _generation_key(namespace, endpoint):
+    return "%s:gen:%s:%s" % (KEY_PREFIX, namespace, _hash(endpoint))
+
+
+def _get_generation(backend, namespace, endpoint):
+    key = _generation_key(namespace, endpoint)
+    generation = backend.get(key)
+    if generation is None:
+        # Another process may race us here; add() keeps whichever
+        # generation was stored first.
+        backend.add(key, uuid.uuid4().hex, get_timeout(namespace))
+        generation = backend.get(key)
+    return generation
+
+
+def invalidate(request, *namespaces):
+    """Drops every cached entry of the given namespaces.
+
+    Entries are invalidated for the endpoints the request's user sees, for
+    all projects, since most changes (e.g. a new public flavor) are visible
+    beyond the project they were made from.
+    """
+    if not is_enabled():
+        return
+    backend = _get_backend()
+    for namespace in namespaces:
+        try:
+            endpoint = base.url_for(request, _NAMESPACES[namespace])
+        except Exception:
+            LOG.debug("Unable to invalidate the %s API cache.", namespace)
+            continue
+        backend.set(_generation_key(namespace, endpoint), uuid.uuid4().hex,
+                    get_timeout(namespace))
+
+
+def _get_key(request, backend, namespace, *parts):
+    endpoint = base.url_for(request, _NAMESPACES[namespace])
+    generation = _get_generation(backend, namespace, endpoint)
+    return "%s:%s:%s:%s" % (KEY_PREFIX, namespace, generation,
+                            _hash(endpoint, _get_scope(request), parts))
+
+
+def get_value(request, namespace, *parts):
+    """Returns the value stored by :func:`set_value` or None.
+
+    ``parts`` identify the value within the namespace.
+    """
+    if not is_enabled():
+        return None
+    backend = _get_backend()
+    return backend.get(_get_key(request, backend, namespace, *parts))
+
+
+def set_value(request, namespace, value, *parts):
+    """Stores a value in a namespace until it is invalidated or expires."""
+    if not is_enabled():
+        return
+    backend = _get_backend()
+    backend.set(_get_key(request, backend, namespace, *parts), value,
+                get_timeout(namespace))
+
+
+def register(namespace, service_type, timeout=None):
+    """Registers a namespace holding data from the given service.
+
+    ``timeout`` replaces ``default_timeout`` for this namespace, unless the
+    namespace is given its own timeout in the settings.
+    """
+    _NAMESPACES[namespace] = service_type
+    if timeout is not None:
+        _TIMEOUTS[namespace] = timeout
+
+
+def cached(namespace, service_type, dump=None, load=None, timeout=None):
+    """Decorator caching the result of an API listing function.
+
+    The decorated function must take the request as its first argument.
+    The remaining arguments, the service endpoint and the scope of the
+    request's token are used to compute the cache key.
+
+    Results are pickled by the cache backend. ``dump`` and ``load`` can be
+    given to convert results which cannot be pickled (e.g. client resources
+    holding a reference to their manager) into plain data and back; ``load``
+    is called with the request and the cached data. ``timeout`` is passed
+    to :func:`register`.
+    """
+    register(namespace, service_type, timeout)
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapped(request, *args, **kwargs):
+            if not is_enabled():
+                return func(request, *args, **kwargs)
+            backend = _get_backend()
+            key = _get_key(request, backend, namespace,
+                           func.__name__, args, kwargs)
+            data = backend.get(key)
+            if data is None:
+                LOG.debug("API cache miss for %s.", func.__name__)
+                profiler.annotate('cache', 'miss')
+                result = func(request, *args, **kwargs)
+                data = dump(result) if dump else result
+                backend.set(key, data, get_timeout(namespace))
+                return result
+            LOG.debug("API cache hit for %s.", func.__name__)
+            profiler.annotate('cache', 'hit')
+            return load(request, data) if load else data
+        wrapped.__wrapped__ = func
+        return wrapped
+    return decorator
+
+
+def invalidates(*namespaces):
+    """Decorator invalidating namespaces after a call modifying resources.
+
+    The namespaces are invalidated even if the call fails, since the
+    resources may have been partially modified.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapped(request, *args, **kwargs):
+            try:
+                return func(request, *args, **kwargs)
+            finally:
+                invalidate(request, *namespaces)
+        wrapped.__wrapped__ = func
+        return wrapped
+    return decorator
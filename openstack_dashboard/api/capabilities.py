@@ -0,0 +1,206 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Process-wide registry of the capabilities of the OpenStack services.
+
+The extensions a service supports and the API versions it exposes only
+change when the service is reconfigured, yet
+:func:`horizon.utils.memoized.memoized` only remembers them for a single
+request. This module keeps them for ``timeout`` seconds:
+
+* in memory, so a process asks each endpoint once per timeout;
+* in one of Django's cache backends, so that with a backend shared by all
+  the dashboard processes (e.g. memcached) the capabilities are discovered
+  once for all of them, and can be discovered ahead of time by the
+  ``discover_capabilities`` management command.
+
+Extensions are stored per endpoint. API versions are stored per service
+type, since :class:`~openstack_dashboard.api.base.APIVersionManager` chooses
+the version of a service for the whole process; they are only discovered by
+:func:`discover_versions`, never while serving a request.
+
+The registry is configured through the ``OPENSTACK_CAPABILITIES``
+setting, and disabled by default.
+"""
+
+import hashlib
+import logging
+import re
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import get_cache
+import requests
+from six.moves.urllib import parse as urlparse
+
+from openstack_dashboard.api import base
+from openstack_dashboard.api import connection_pool
+
+
+LOG = logging.getLogger(__name__)
+
+KEY_PREFIX = "horizon:capabilities"
+
+# Matches the version part of an endpoint's path, e.g. "/v2/<tenant_id>".
+VERSION_PATH_RE = re.compile(r'/v\d+(\.\d+)?(/.*)?$')
+
+# The number of seconds a process waits before looking again for versions
+# which have not been discovered yet.
+MISS_TIMEOUT = 60
+
+# Maps service types to the functions listing their extensions.
+_DISCOVERERS = {}
+
+# Maps keys to (expiry time, value); None values are stored too.
+_entries = {}
+_lock = threading.Lock()
+
+
+def _get_config():
+    return getattr(settings, 'OPENSTACK_CAPABILITIES', {})
+
+
+def is_enabled():
+    return _get_config().get('enabled', False)
+
+
+def get_timeout():
+    return _get_config().get('timeout', 3600)
+
+
+def _get_backend():
+    return get_cache(_get_config().get('backend', 'default'))
+
+
+def _get_key(*parts):
+    return "%s:%s" % (KEY_PREFIX, hashlib.md5(repr(parts)).hexdigest())
+
+
+def _lookup(key):
+    """Returns (found, value) from memory, then from the cache backend."""
+    now = time.time()
+    with _lock:
+        entry = _entries.get(key)
+    if entry is not None and entry[0] > now:
+        return True, entry[1]
+    data = _get_backend().get(key)
+    if data is not None:
+        _remember(key, data[0], get_timeout(), now)
+        return True, data[0]
+    return False, None
+
+
+def _remember(key, value, timeout, now=None):
+    now = now or time.time()
+    with _lock:
+        _entries[key] = (now + timeout, value)
+
+
+def _store(key, value):
+    _remember(key, value, get_timeout())
+    # Wrapped in a tuple so that None values can be told from misses.
+    _get_backend().set(key, (value,), get_timeout())
+
+
+def clear():
+    """Forgets the capabilities remembered by this process."""
+    with _lock:
+        _entries.clear()
+
+
+def register(service_type, discover):
+    """Registers the function listing the extensions of a service.
+
+    ``discover`` is called with a request when the extensions of its
+    endpoint are not known, or known for longer than the timeout. It must
+    return data which can be pickled.
+    """
+    _DISCOVERERS[service_type] = discover
+
+
+def get_registered():
+    """Returns the service types whose extensions can be discovered."""
+    return sorted(_DISCOVERERS)
+
+
+def get_extensions(request, service_type, refresh=False):
+    """Returns the extensions of the request's endpoint for a service.
+
+    ``refresh`` discovers them again even if they are known.
+    """
+    discover = _DISCOVERERS[service_type]
+    if not is_enabled():
+        return discover(request)
+    endpoint = base.url_for(request, service_type)
+    key = _get_key('extensions', service_type, endpoint)
+    found, extensions = (False, None) if refresh else _lookup(key)
+    if not found:
+        LOG.debug("Discovering the extensions of %s.", endpoint)
+        extensions = discover(request)
+        _store(key, extensions)
+    return extensions
+
+
+def get_versions(service_type):
+    """Returns the API versions discovered for a service type, or None.
+
+    Versions are (major, minor) tuples.
+    """
+    if not is_enabled():
+        return None
+    key = _get_key('versions', service_type)
+    found, versions = _lookup(key)
+    if not found:
+        _remember(key, None, MISS_TIMEOUT)
+    return versions
+
+
+def _get_unversioned_url(url):
+    parsed = urlparse.urlparse(url)
+    path = VERSION_PATH_RE.sub('', parsed.path)
+    return urlparse.urlunparse((parsed.scheme, parsed.netloc, path or '/',
+                                '', '', ''))
+
+
+def _parse_versions(data):
+    versions = data.get('versions', [])
+    # Keystone wraps its versions in a "values" list.
+    if isinstance(versions, dict):
+        versions = versions.get('values', [])
+    parsed = []
+    for version in versions:
+        match = re.match(r'^v(\d+)(?:\.(\d+))?$', version.get('id', ''))
+        if match:
+            parsed.append((int(match.group(1)), int(match.group(2) or 0)))
+    return sorted(set(parsed))
+
+
+def discover_versions(request, service_type):
+    """Asks the request's endpoint for a service which API versions it
+    exposes, and stores them for :func:`get_versions`.
+
+    Returns the versions, or None if the endpoint did not list them.
+    """
+    url = _get_unversioned_url(base.url_for(request, service_type))
+    session = connection_pool.mount(requests.Session(), url)
+    try:
+        response = session.get(url, headers={'Accept': 'application/json'},
+                               verify=connection_pool._get_verify())
+        versions = _parse_versions(response.json()) or None
+    except (requests.RequestException, ValueError, AttributeError):
+        LOG.warning("Unable to discover the API versions of %s.", url)
+        versions = None
+    if is_enabled():
+        _store(_get_key('versions', service_type), versions)
+    return versions
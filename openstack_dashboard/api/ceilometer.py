@@ -12,6 +12,7 @@
 
 import logging
 import threading
+import time
 
 from ceilometerclient import client as ceilometer_client
 from django.conf import settings
@@ -20,13 +21,19 @@ from django.utils.translation import ugettext_lazy as _
 
 from horizon import exceptions
 from horizon.utils.memoized import memoized  # noqa
+from horizon.utils import parallel
 
 from openstack_dashboard.api import base
 from openstack_dashboard.api import keystone
 from openstack_dashboard.api import nova
+from openstack_dashboard.api import resilience
 
 LOG = logging.getLogger(__name__)
 
+# Pools running the statistics calls, by metering endpoint and size.
+_statistics_pools = {}
+_statistics_lock = threading.Lock()
+
 
 def get_flavor_names(request):
     # TODO(lsmola) The flavors can be set per project,
@@ -280,7 +287,9 @@ def ceilometerclient(request):
     return ceilometer_client.Client('2', endpoint,
                                     token=(lambda: request.user.token.id),
                                     insecure=insecure,
-                                    cacert=cacert)
+                                    cacert=cacert,
+                                    timeout=resilience.get_service_timeout(
+                                        'metering'))
 
 
 def resource_list(request, query=None, ceilometer_usage_object=None):
@@ -309,72 +318,23 @@ def statistic_list(request, meter_name, query=None, period=None):
     return [Statistic(s) for s in statistics]
 
 
-class ThreadedUpdateResourceWithStatistics(threading.Thread):
-    """Multithread wrapper for update_with_statistics method of
-    resource_usage.
-
-    A join logic is placed in process_list class method. All resources
-    will have its statistics attribute filled in separate threads.
-
-    The resource_usage object is shared between threads. Each thread is
-    updating one Resource.
+def _get_statistics_pool(request):
+    """Returns the pool running the statistics calls to the metering
+    endpoint of the request.
 
-    :Parameters:
-      - `resource`: Resource or ResourceAggregate object, that will
-                    be filled by statistic data.
-      - `resources`: List of Resource or ResourceAggregate object,
-                     that will be filled by statistic data.
-      - `resource_usage`: Wrapping resource usage object, that holds
-                          all statistics data.
-      - `meter_names`: List of meter names of the statistics we want.
-      - `period`: In seconds. If no period is given, only one aggregate
-                  statistic is returned. If given, a faceted result will be
-                  returned, divided into given periods. Periods with no
-                  data are ignored.
-      - `stats_attr`: String representing the attribute name of the stats.
-                      E.g. (avg, max, min...) If None is given, whole
-                      statistic object is returned,
-      - `additional_query`: Additional query for the statistics.
-                            E.g. timespan, etc.
+    Pools are shared by all the requests of the process, so that the number
+    of concurrent calls to each endpoint stays bounded by the
+    ``CEILOMETER_STATISTICS_WORKERS`` setting however many resources are
+    listed.
     """
-    # TODO(lsmola) Can be removed once Ceilometer supports sample-api
-    # and group-by, so all of this optimization will not be necessary.
-    # It is planned somewhere to I.
-
-    def __init__(self, resource_usage, resource, meter_names=None,
-                 period=None, filter_func=None, stats_attr=None,
-                 additional_query=None):
-        super(ThreadedUpdateResourceWithStatistics, self).__init__()
-        self.resource_usage = resource_usage
-        self.resource = resource
-        self.meter_names = meter_names
-        self.period = period
-        self.stats_attr = stats_attr
-        self.additional_query = additional_query
-
-    def run(self):
-        # Run the job
-        self.resource_usage.update_with_statistics(
-            self.resource,
-            meter_names=self.meter_names, period=self.period,
-            stats_attr=self.stats_attr, additional_query=self.additional_query)
-
-    @classmethod
-    def process_list(cls, resource_usage, resources, meter_names=None,
-                     period=None, filter_func=None, stats_attr=None,
-                     additional_query=None):
-        threads = []
-
-        for resource in resources:
-            # add statistics data into resource
-            thread = cls(resource_usage, resource, meter_names=meter_names,
-                         period=period, stats_attr=stats_attr,
-                         additional_query=additional_query)
-            thread.start()
-            threads.append(thread)
-
-        for thread in threads:
-            thread.join()
+    workers = getattr(settings, 'CEILOMETER_STATISTICS_WORKERS', 10)
+    if workers < 1:
+        return parallel.ThreadPool(0)
+    key = (base.url_for(request, 'metering'), workers)
+    with _statistics_lock:
+        if key not in _statistics_pools:
+            _statistics_pools[key] = parallel.ThreadPool(workers)
+        return _statistics_pools[key]
 
 
 class CeilometerUsage(object):
@@ -556,27 +516,41 @@ class CeilometerUsage(object):
           - `additional_query`: Additional query for the statistics.
                                 E.g. timespan, etc.
         """
+        self.update_list_with_statistics(
+            [resource], meter_names=meter_names, period=period,
+            stats_attr=stats_attr, additional_query=additional_query)
+        return resource
+
+    def update_list_with_statistics(self, resources, meter_names=None,
+                                    period=None, stats_attr=None,
+                                    additional_query=None):
+        """Adding statistical data into Resources or ResourceAggregates.
+
+        The statistics of each (resource, meter) pair are fetched by a
+        separate call, see :meth:`iter_statistics`. The meters whose
+        statistics could not be fetched are set to None.
+
+        The parameters are the ones of :meth:`update_with_statistics`,
+        with `resources` being a list of resources.
+        """
 
         if not meter_names:
             raise ValueError("meter_names and resources must be defined to be "
                              "able to obtain the statistics.")
+        if additional_query and not is_iterable(additional_query):
+            raise ValueError("Additional query must be list of"
+                             " conditions. See the docs for format.")
 
-        # query for identifying one resource in meters
-        query = resource.query
-        if additional_query:
-            if not is_iterable(additional_query):
-                raise ValueError("Additional query must be list of"
-                                 " conditions. See the docs for format.")
-            query = query + additional_query
-
-        # TODO(lsmola) thread for each meter will be probably overkill
-        # but I should test lets say thread pool with 100 of threads
-        # and apply it only to this code.
-        # Though I do expect Ceilometer will support bulk requests,
-        # so all of this optimization will not be necessary.
-        for meter in meter_names:
-            statistics = statistic_list(self._request, meter,
-                                        query=query, period=period)
+        calls = []
+        for resource in resources:
+            # query for identifying one resource in meters
+            query = resource.query
+            if additional_query:
+                query = query + additional_query
+            for meter in meter_names:
+                calls.append(((resource, meter), meter, query, period))
+
+        for (resource, meter), statistics in self.iter_statistics(calls):
             meter = meter.replace(".", "_")
             if statistics:
                 if stats_attr:
@@ -590,7 +564,49 @@ class CeilometerUsage(object):
             else:
                 resource.set_meter(meter, None)
 
-        return resource
+    def iter_statistics(self, calls):
+        """Fetches statistics concurrently.
+
+        Takes (key, meter name, query, period) tuples and yields
+        (key, statistics) pairs in the same order, as soon as the
+        statistics of each call are available. The calls run on the pool
+        of the metering endpoint, see :func:`_get_statistics_pool`.
+
+        Once the time budget of the request is spent, or if the iteration
+        is stopped, the calls which have not started yet are cancelled. The
+        statistics of the calls which failed or were cancelled are None.
+        """
+        pool = _get_statistics_pool(self._request)
+        futures = [(key, meter, pool.submit(statistic_list, self._request,
+                                            meter, query=query,
+                                            period=period))
+                   for key, meter, query, period in calls]
+
+        deadline = getattr(self._request, resilience.DEADLINE_ATTR, None)
+        try:
+            for index, (key, meter, future) in enumerate(futures):
+                timeout = None
+                if deadline is not None:
+                    timeout = max(deadline - time.time(), 0)
+                try:
+                    statistics = future.result(timeout)
+                except parallel.TimeoutError:
+                    cancelled = [f for k, m, f in futures[index:]
+                                 if f.cancel()]
+                    LOG.warning("The time allowed to load the page is over, "
+                                "%d statistics calls were cancelled.",
+                                len(cancelled))
+                    for k, m, f in futures[index:]:
+                        yield k, None
+                    return
+                except Exception as e:
+                    LOG.warning("Unable to retrieve the %s statistics: %s",
+                                meter, e)
+                    statistics = None
+                yield key, statistics
+        finally:
+            for key, meter, future in futures:
+                future.cancel()
 
     def resources(self, query=None, filter_func=None,
                   with_users_and_tenants=False):
@@ -650,10 +666,9 @@ class CeilometerUsage(object):
             query, filter_func=filter_func,
             with_users_and_tenants=with_users_and_tenants)
 
-        ThreadedUpdateResourceWithStatistics.process_list(
-            self, resources,
-            meter_names=meter_names, period=period, stats_attr=stats_attr,
-            additional_query=additional_query)
+        self.update_list_with_statistics(
+            resources, meter_names=meter_names, period=period,
+            stats_attr=stats_attr, additional_query=additional_query)
 
         return resources
 
@@ -699,8 +714,7 @@ class CeilometerUsage(object):
         """
         resource_aggregates = self.resource_aggregates(queries)
 
-        ThreadedUpdateResourceWithStatistics.process_list(
-            self,
+        self.update_list_with_statistics(
             resource_aggregates, meter_names=meter_names, period=period,
             stats_attr=stats_attr, additional_query=additional_query)
 
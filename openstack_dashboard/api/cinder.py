@@ -29,10 +29,14 @@ from django.utils.translation import ugettext_lazy as _
 from cinderclient.v2.contrib import list_extensions as cinder_list_extensions
 
 from horizon import exceptions
+from horizon.utils import functions as utils
 from horizon.utils.memoized import memoized  # noqa
 
 from openstack_dashboard.api import base
+from openstack_dashboard.api import cache
+from openstack_dashboard.api import capabilities
 from openstack_dashboard.api import nova
+from openstack_dashboard.api import resilience
 
 LOG = logging.getLogger(__name__)
 
@@ -159,7 +163,9 @@ def cinderclient(request):
                                      auth_url=cinder_url,
                                      insecure=insecure,
                                      cacert=cacert,
-                                     http_log_debug=settings.DEBUG)
+                                     http_log_debug=settings.DEBUG,
+                                     timeout=resilience.get_service_timeout(
+                                         'volume'))
     c.client.auth_token = request.user.token.id
     c.client.management_url = cinder_url
     return c
@@ -199,6 +205,58 @@ def volume_list(request, search_opts=None):
     return volumes
 
 
+def volume_list_paged(request, search_opts=None, marker=None, paginate=False,
+                      sort_key='created_at', sort_dir='desc',
+                      reversed_order=False):
+    """Lists the volumes, a page at a time if paginate is True.
+
+    Returns a (volumes, has_more_data, has_prev_data) tuple. Sorting and
+    pagination need the Volume API v2; with v1, all the volumes are listed
+    in the API's order. ``reversed_order`` tells that the volumes are listed
+    in the reverse of the order they are displayed in, which is how the
+    page before the marker is retrieved.
+    """
+    has_more_data = False
+    has_prev_data = False
+    c_client = cinderclient(request)
+    if c_client is None:
+        return [], has_more_data, has_prev_data
+
+    transfers = {t.volume_id: t
+                 for t in transfer_list(request, search_opts=search_opts)}
+
+    kwargs = {'search_opts': search_opts}
+    paginate = paginate and VERSIONS.active >= 2
+    if VERSIONS.active >= 2:
+        kwargs['sort_key'] = sort_key
+        kwargs['sort_dir'] = sort_dir
+    if paginate:
+        page_size = utils.get_page_size(request)
+        kwargs['marker'] = marker
+        kwargs['limit'] = page_size + 1
+
+    volumes = []
+    for v in c_client.volumes.list(**kwargs):
+        v.transfer = transfers.get(v.id)
+        volumes.append(Volume(v))
+
+    if paginate:
+        # first and middle page condition
+        if len(volumes) > page_size:
+            volumes.pop(-1)
+            has_more_data = True
+            # middle page condition
+            if marker is not None:
+                has_prev_data = True
+        # first page condition when reached via prev back
+        elif reversed_order and marker is not None:
+            has_more_data = True
+        # last page condition
+        elif marker is not None:
+            has_prev_data = True
+    return volumes, has_more_data, has_prev_data
+
+
 def volume_get(request, volume_id):
     volume_data = cinderclient(request).volumes.get(volume_id)
 
@@ -222,6 +280,7 @@ def volume_get(request, volume_id):
     return Volume(volume_data)
 
 
+@cache.invalidates('quota_usages')
 def volume_create(request, size, name, description, volume_type,
                   snapshot_id=None, metadata=None, image_id=None,
                   availability_zone=None, source_volid=None):
@@ -239,10 +298,12 @@ def volume_create(request, size, name, description, volume_type,
     return Volume(volume)
 
 
+@cache.invalidates('quota_usages')
 def volume_extend(request, volume_id, new_size):
     return cinderclient(request).volumes.extend(volume_id, new_size)
 
 
+@cache.invalidates('quota_usages')
 def volume_delete(request, volume_id):
     return cinderclient(request).volumes.delete(volume_id)
 
@@ -296,6 +357,7 @@ def volume_snapshot_list(request, search_opts=None):
         search_opts=search_opts)]
 
 
+@cache.invalidates('quota_usages')
 def volume_snapshot_create(request, volume_id, name,
                            description=None, force=False):
     data = {'name': name,
@@ -307,6 +369,7 @@ def volume_snapshot_create(request, volume_id, name,
         volume_id, **data))
 
 
+@cache.invalidates('quota_usages')
 def volume_snapshot_delete(request, snapshot_id):
     return cinderclient(request).volume_snapshots.delete(snapshot_id)
 
@@ -403,6 +466,7 @@ def tenant_quota_get(request, tenant_id):
     return base.QuotaSet(c_client.quotas.get(tenant_id))
 
 
+@cache.invalidates('quota_usages')
 def tenant_quota_update(request, tenant_id, **kwargs):
     return cinderclient(request).quotas.update(tenant_id, **kwargs)
 
@@ -564,10 +628,20 @@ def availability_zone_list(request, detailed=False):
     return cinderclient(request).availability_zones.list(detailed=detailed)
 
 
+def _discover_extensions(request):
+    manager = cinder_list_extensions.ListExtManager(cinderclient(request))
+    # Only the data of the resources is kept, not their client.
+    return [extension._info for extension in manager.show_all()]
+
+
+capabilities.register('volume', _discover_extensions)
+
+
 @memoized
 def list_extensions(request):
-    return cinder_list_extensions.ListExtManager(cinderclient(request))\
-        .show_all()
+    extensions = capabilities.get_extensions(request, 'volume')
+    return [cinder_list_extensions.ListExtResource(None, info, loaded=True)
+            for info in extensions]
 
 
 @memoized
@@ -0,0 +1,136 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Keep-alive HTTP connections shared by the API clients of a process.
+
+The client factories (``novaclient``, ``glanceclient``...) build a new client
+for every request, and by default every client opens its own connections,
+which means a new TCP and TLS handshake to the same endpoints on every page.
+
+This module keeps one :class:`requests.adapters.HTTPAdapter`, and therefore
+one pool of keep-alive connections, per endpoint and TLS settings. Clients
+still get their own :class:`requests.Session`, so nothing specific to a user
+(tokens, cookies...) is shared between them; only the connections are.
+
+The adapters apply the timeout given to the API call being made by
+:mod:`resilience`. Adapters which have not been used for ``idle_timeout``
+seconds are closed.
+Pooling can be configured or disabled through the ``OPENSTACK_HTTP_POOL``
+setting.
+"""
+
+import logging
+import threading
+import time
+
+from django.conf import settings
+from keystoneclient.auth import token_endpoint
+from keystoneclient import session as keystone_session
+import requests
+from requests import adapters
+from six.moves.urllib import parse as urlparse
+
+from openstack_dashboard.api import resilience
+
+
+LOG = logging.getLogger(__name__)
+
+# Maps (scheme, netloc, TLS verification, see _get_verify) to
+# [adapter, time of last use].
+_adapters = {}
+_lock = threading.Lock()
+
+
+def _get_config():
+    return getattr(settings, 'OPENSTACK_HTTP_POOL', {})
+
+
+def is_enabled():
+    return _get_config().get('enabled', True)
+
+
+def _get_verify():
+    if getattr(settings, 'OPENSTACK_SSL_NO_VERIFY', False):
+        return False
+    return getattr(settings, 'OPENSTACK_SSL_CACERT', None) or True
+
+
+class HTTPAdapter(adapters.HTTPAdapter):
+    """An adapter applying the timeout of the API call being made."""
+
+    def send(self, request, timeout=None, **kwargs):
+        limit = resilience.get_timeout()
+        if limit is not None and (timeout is None or
+                                  isinstance(timeout, (int, float)) and
+                                  timeout > limit):
+            timeout = limit
+        return super(HTTPAdapter, self).send(request, timeout=timeout,
+                                             **kwargs)
+
+
+def _evict_idle(now):
+    idle_timeout = _get_config().get('idle_timeout', 300)
+    for key, (adapter, last_used) in list(_adapters.items()):
+        if now - last_used > idle_timeout:
+            LOG.debug("Closing idle connections to %s://%s.", *key[:2])
+            del _adapters[key]
+            adapter.close()
+
+
+def get_adapter(url):
+    """Returns the adapter holding the connections to the endpoint of url."""
+    parsed = urlparse.urlparse(url)
+    # requests configures the TLS verification of pooled connections at
+    # each request, so endpoints are only shared with the same settings.
+    key = (parsed.scheme, parsed.netloc, _get_verify())
+    now = time.time()
+    with _lock:
+        _evict_idle(now)
+        if key not in _adapters:
+            config = _get_config()
+            adapter = HTTPAdapter(
+                pool_connections=1,
+                pool_maxsize=config.get('maxsize', 10))
+            _adapters[key] = [adapter, now]
+        _adapters[key][1] = now
+        return _adapters[key][0]
+
+
+def mount(session, url):
+    """Makes a :class:`requests.Session` use the pool for url's endpoint."""
+    if is_enabled():
+        parsed = urlparse.urlparse(url)
+        session.mount("%s://%s" % (parsed.scheme, parsed.netloc),
+                      get_adapter(url))
+    return session
+
+
+def get_session(request, url, original_ip=None):
+    """Returns a keystoneclient session for the service at url.
+
+    The session authenticates with the token of the request's user and
+    sends its requests through the pooled connections of the endpoint.
+    """
+    return keystone_session.Session(
+        auth=token_endpoint.Token(url, request.user.token.id),
+        session=mount(requests.Session(), url),
+        original_ip=original_ip,
+        verify=_get_verify())
+
+
+def close_all():
+    """Closes every pooled connection."""
+    with _lock:
+        for adapter, last_used in _adapters.values():
+            adapter.close()
+        _adapters.clear()
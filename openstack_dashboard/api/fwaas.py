@@ -75,13 +75,19 @@ def rule_list(request, **kwargs):
 
 
 def _rule_list(request, expand_policy, **kwargs):
-    rules = neutronclient(request).list_firewall_rules(
-        **kwargs).get('firewall_rules')
+    graph = neutron.get_resource_graph(request)
+    # The listed rules are shared through the graph, so they are expanded
+    # on copies.
+    rules = [dict(r._apidict) for r in graph.list('firewall_rules', **kwargs)]
     if expand_policy:
-        policies = _policy_list(request, expand_rule=False)
-        policy_dict = SortedDict((p.id, p) for p in policies)
         for rule in rules:
-            rule['policy'] = policy_dict.get(rule['firewall_policy_id'])
+            rule['policy'] = _get_policy(graph, rule['firewall_policy_id'])
+    return [Rule(r) for r in rules]
+
+
+def _list_rules(request, **kwargs):
+    rules = neutronclient(request).list_firewall_rules(
+        **kwargs).get('firewall_rules')
     return [Rule(r) for r in rules]
 
 
@@ -134,16 +140,32 @@ def policy_list(request, **kwargs):
 
 
 def _policy_list(request, expand_rule, **kwargs):
-    policies = neutronclient(request).list_firewall_policies(
-        **kwargs).get('firewall_policies')
+    graph = neutron.get_resource_graph(request)
+    policies = [dict(p._apidict)
+                for p in graph.list('firewall_policies', **kwargs)]
     if expand_rule:
-        rules = _rule_list(request, expand_policy=False)
-        rule_dict = SortedDict((rule.id, rule) for rule in rules)
         for p in policies:
-            p['rules'] = [rule_dict.get(rule) for rule in p['firewall_rules']]
+            p['rules'] = [graph.get('firewall_rules', rule)
+                          for rule in p['firewall_rules']]
     return [Policy(p) for p in policies]
 
 
+def _list_policies(request, **kwargs):
+    policies = neutronclient(request).list_firewall_policies(
+        **kwargs).get('firewall_policies')
+    return [Policy(p) for p in policies]
+
+
+def _get_policy(graph, policy_id):
+    if policy_id is None:
+        return None
+    return graph.get('firewall_policies', policy_id)
+
+
+neutron.register_graph_collection('firewall_rules', _list_rules)
+neutron.register_graph_collection('firewall_policies', _list_policies)
+
+
 def policy_get(request, policy_id):
     return _policy_get(request, policy_id, expand_rule=True)
 
@@ -210,10 +232,9 @@ def _firewall_list(request, expand_policy, **kwargs):
     firewalls = neutronclient(request).list_firewalls(
         **kwargs).get('firewalls')
     if expand_policy:
-        policies = _policy_list(request, expand_rule=False)
-        policy_dict = SortedDict((p.id, p) for p in policies)
+        graph = neutron.get_resource_graph(request)
         for fw in firewalls:
-            fw['policy'] = policy_dict.get(fw['firewall_policy_id'])
+            fw['policy'] = _get_policy(graph, fw['firewall_policy_id'])
     return [Firewall(f) for f in firewalls]
 
 
@@ -28,12 +28,15 @@ import os
 from django.conf import settings
 
 import glanceclient as glance_client
+from glanceclient.v1 import images as glance_images
 from six.moves import _thread as thread
 
 from horizon import exceptions
 from horizon.utils import functions as utils
 from horizon.utils.memoized import memoized  # noqa
 from openstack_dashboard.api import base
+from openstack_dashboard.api import cache
+from openstack_dashboard.api import connection_pool
 
 
 LOG = logging.getLogger(__name__)
@@ -45,10 +48,25 @@ def glanceclient(request, version='1'):
     url = base.url_for(request, 'image')
     insecure = getattr(settings, 'OPENSTACK_SSL_NO_VERIFY', False)
     cacert = getattr(settings, 'OPENSTACK_SSL_CACERT', None)
-    return glance_client.Client(version, url, token=request.user.token.id,
-                                insecure=insecure, cacert=cacert)
+    c = glance_client.Client(version, url, token=request.user.token.id,
+                             insecure=insecure, cacert=cacert)
+    connection_pool.mount(c.http_client.session, url)
+    return c
 
 
+def _dump_images(result):
+    images, has_more_data, has_prev_data = result
+    return ([image._info for image in images], has_more_data, has_prev_data)
+
+
+def _load_images(request, data):
+    images, has_more_data, has_prev_data = data
+    manager = glanceclient(request).images
+    return ([glance_images.Image(manager, info, loaded=True)
+             for info in images], has_more_data, has_prev_data)
+
+
+@cache.invalidates('images')
 def image_delete(request, image_id):
     return glanceclient(request).images.delete(image_id)
 
@@ -63,8 +81,16 @@ def image_get(request, image_id):
     return image
 
 
+@cache.cached('images', 'image', dump=_dump_images, load=_load_images)
 def image_list_detailed(request, marker=None, sort_dir='desc',
-                        sort_key='created_at', filters=None, paginate=False):
+                        sort_key='created_at', filters=None, paginate=False,
+                        reversed_order=False):
+    """Lists the images, sorted by sort_key in the sort_dir direction.
+
+    ``reversed_order`` tells that the images are listed in the reverse of
+    the order they are displayed in, which is how the page before the
+    marker is retrieved.
+    """
     limit = getattr(settings, 'API_RESULT_LIMIT', 1000)
     page_size = utils.get_page_size(request)
 
@@ -94,7 +120,7 @@ def image_list_detailed(request, marker=None, sort_dir='desc',
             if marker is not None:
                 has_prev_data = True
         # first page condition when reached via prev back
-        elif sort_dir == 'asc' and marker is not None:
+        elif reversed_order and marker is not None:
             has_more_data = True
         # last page condition
         elif marker is not None:
@@ -104,6 +130,7 @@ def image_list_detailed(request, marker=None, sort_dir='desc',
     return (images, has_more_data, has_prev_data)
 
 
+@cache.invalidates('images')
 def image_update(request, image_id, **kwargs):
     image_data = kwargs.get('data', None)
     try:
@@ -122,6 +149,7 @@ def image_update(request, image_id, **kwargs):
     return image
 
 
+@cache.invalidates('images')
 def image_create(request, **kwargs):
     copy_from = kwargs.pop('copy_from', None)
     data = kwargs.pop('data', None)
@@ -142,6 +170,7 @@ def image_create(request, **kwargs):
     return image
 
 
+@cache.invalidates('images')
 def image_update_properties(request, image_id, remove_props=None, **kwargs):
     """Add or update a custom property of an image."""
     return glanceclient(request, '2').images.update(image_id,
@@ -149,6 +178,7 @@ def image_update_properties(request, image_id, remove_props=None, **kwargs):
                                                     **kwargs)
 
 
+@cache.invalidates('images')
 def image_delete_properties(request, image_id, keys):
     """Delete custom properties for an image."""
     return glanceclient(request, '2').images.update(image_id, keys)
@@ -18,6 +18,7 @@ from heatclient import client as heat_client
 from horizon.utils import functions as utils
 from horizon.utils.memoized import memoized  # noqa
 from openstack_dashboard.api import base
+from openstack_dashboard.api import resilience
 
 LOG = logging.getLogger(__name__)
 
@@ -41,8 +42,8 @@ def heatclient(request, password=None):
         'insecure': insecure,
         'ca_file': cacert,
         'username': request.user.username,
-        'password': password
-        # 'timeout': args.timeout,
+        'password': password,
+        'timeout': resilience.get_service_timeout('orchestration'),
         # 'ca_file': args.ca_file,
         # 'cert_file': args.cert_file,
         # 'key_file': args.key_file,
@@ -34,6 +34,7 @@ from horizon import messages
 from horizon.utils import functions as utils
 
 from openstack_dashboard.api import base
+from openstack_dashboard.api import connection_pool
 from openstack_dashboard import policy
 
 
@@ -168,13 +169,18 @@ def keystoneclient(request, admin=False):
         cacert = getattr(settings, 'OPENSTACK_SSL_CACERT', None)
         LOG.debug("Creating a new keystoneclient connection to %s." % endpoint)
         remote_addr = request.environ.get('REMOTE_ADDR', '')
+        session = None
+        if user.token.id and connection_pool.is_enabled():
+            session = connection_pool.get_session(request, endpoint,
+                                                  original_ip=remote_addr)
         conn = api_version['client'].Client(token=user.token.id,
                                             endpoint=endpoint,
                                             original_ip=remote_addr,
                                             insecure=insecure,
                                             cacert=cacert,
                                             auth_url=endpoint,
-                                            debug=settings.DEBUG)
+                                            debug=settings.DEBUG,
+                                            session=session)
         setattr(request, cache_attr, conn)
     return conn
 
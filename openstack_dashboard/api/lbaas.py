@@ -14,7 +14,6 @@
 
 from __future__ import absolute_import
 
-from django.utils.datastructures import SortedDict
 from django.utils.translation import ugettext_lazy as _
 
 from horizon import messages
@@ -141,12 +140,11 @@ def pool_create(request, **kwargs):
     return Pool(pool)
 
 
-def _get_vip(request, pool, vip_dict, expand_name_only=False):
+def _get_vip(request, pool, graph=None, expand_name_only=False):
     if pool['vip_id'] is not None:
         try:
-            if vip_dict:
-                vip = vip_dict.get(pool['vip_id'])
-            else:
+            vip = graph.get('vips', pool['vip_id']) if graph else None
+            if vip is None:
                 vip = _vip_get(request, pool['vip_id'])
         except Exception:
             messages.warning(request, _("Unable to get VIP for pool "
@@ -164,22 +162,32 @@ def pool_list(request, **kwargs):
 
 
 def _pool_list(request, expand_subnet=False, expand_vip=False, **kwargs):
-    pools = neutronclient(request).list_pools(**kwargs).get('pools')
+    graph = neutron.get_resource_graph(request)
+    # The listed pools are shared through the graph, so they are expanded
+    # on copies.
+    pools = [dict(p._apidict) for p in graph.list('pools', **kwargs)]
     if expand_subnet:
-        subnets = neutron.subnet_list(request)
-        subnet_dict = SortedDict((s.id, s) for s in subnets)
         for p in pools:
-            subnet = subnet_dict.get(p['subnet_id'])
+            subnet = graph.get('subnets', p['subnet_id'])
             p['subnet_name'] = subnet.cidr if subnet else None
     if expand_vip:
-        vips = vip_list(request)
-        vip_dict = SortedDict((v.id, v) for v in vips)
         for p in pools:
-            p['vip_name'] = _get_vip(request, p, vip_dict,
+            p['vip_name'] = _get_vip(request, p, graph,
                                      expand_name_only=True)
     return [Pool(p) for p in pools]
 
 
+def _list_pools(request, **kwargs):
+    pools = neutronclient(request).list_pools(**kwargs).get('pools')
+    return [Pool(p) for p in pools]
+
+
+neutron.register_graph_collection('pools', _list_pools)
+# vip_list is looked up when called, so that it can be stubbed out.
+neutron.register_graph_collection(
+    'vips', lambda request, **params: vip_list(request, **params))
+
+
 def pool_get(request, pool_id):
     return _pool_get(request, pool_id, expand_resource=True)
 
@@ -202,8 +210,7 @@ def _pool_get(request, pool_id, expand_resource=False):
         except Exception:
             messages.warning(request, _("Unable to get subnet for pool "
                                         "%(pool)s.") % {"pool": pool_id})
-        pool['vip'] = _get_vip(request, pool, vip_dict=None,
-                               expand_name_only=False)
+        pool['vip'] = _get_vip(request, pool, expand_name_only=False)
         try:
             pool['members'] = _member_list(request, expand_pool=False,
                                            pool_id=pool_id)
@@ -322,10 +329,9 @@ def member_list(request, **kwargs):
 def _member_list(request, expand_pool, **kwargs):
     members = neutronclient(request).list_members(**kwargs).get('members')
     if expand_pool:
-        pools = _pool_list(request)
-        pool_dict = SortedDict((p.id, p) for p in pools)
+        graph = neutron.get_resource_graph(request)
         for m in members:
-            m['pool_name'] = pool_dict.get(m['pool_id']).name_or_id
+            m['pool_name'] = graph.get('pools', m['pool_id']).name_or_id
     return [Member(m) for m in members]
 
 
@@ -20,6 +20,7 @@ different dashboard implementations.
 """
 
 from openstack_dashboard.api import base
+from openstack_dashboard.api import cache
 from openstack_dashboard.api import neutron
 from openstack_dashboard.api import nova
 
@@ -52,10 +53,12 @@ def tenant_floating_ip_get(request, floating_ip_id):
     return NetworkClient(request).floating_ips.get(floating_ip_id)
 
 
+@cache.invalidates('quota_usages')
 def tenant_floating_ip_allocate(request, pool=None):
     return NetworkClient(request).floating_ips.allocate(pool)
 
 
+@cache.invalidates('quota_usages')
 def tenant_floating_ip_release(request, floating_ip_id):
     return NetworkClient(request).floating_ips.release(floating_ip_id)
 
@@ -69,8 +72,8 @@ def floating_ip_disassociate(request, floating_ip_id):
     return NetworkClient(request).floating_ips.disassociate(floating_ip_id)
 
 
-def floating_ip_target_list(request):
-    return NetworkClient(request).floating_ips.list_targets()
+def floating_ip_target_list(request, instance_ids=None):
+    return NetworkClient(request).floating_ips.list_targets(instance_ids)
 
 
 def floating_ip_target_get_by_instance(request, instance_id, cache=None):
@@ -99,10 +102,12 @@ def security_group_get(request, sg_id):
     return NetworkClient(request).secgroups.get(sg_id)
 
 
+@cache.invalidates('quota_usages')
 def security_group_create(request, name, desc):
     return NetworkClient(request).secgroups.create(name, desc)
 
 
+@cache.invalidates('quota_usages')
 def security_group_delete(request, sg_id):
     return NetworkClient(request).secgroups.delete(sg_id)
 
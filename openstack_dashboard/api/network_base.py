@@ -20,10 +20,59 @@ methods defined in this module.
 """
 
 import abc
+import collections
 
 import six
 
 
+class FloatingIpTargetList(collections.Sequence):
+    """The association targets returned by list_targets().
+
+    Targets are looked up by their id and by the id of their instance in
+    constant time, so callers can look up the targets of many instances in
+    a single list. Targets without an ``instance_id`` (Nova) are targets of
+    the instance whose id they have.
+    """
+
+    def __init__(self, targets=()):
+        self._targets = list(targets)
+        self._by_id = {}
+        self._by_instance = {}
+        for target in self._targets:
+            self._by_id.setdefault(target['id'], target)
+            instance_id = target.get('instance_id', target['id'])
+            self._by_instance.setdefault(instance_id, []).append(target)
+
+    def __getitem__(self, index):
+        return self._targets[index]
+
+    def __len__(self):
+        return len(self._targets)
+
+    def __repr__(self):
+        return '<%s: %r>' % (self.__class__.__name__, self._targets)
+
+    def get(self, target_id, default=None):
+        """Returns the target with the given id."""
+        return self._by_id.get(target_id, default)
+
+    def get_by_instance(self, instance_id):
+        """Returns the targets of an instance, in the order of the list."""
+        return list(self._by_instance.get(instance_id, ()))
+
+
+def get_targets_by_instance(target_list, instance_id):
+    """Returns the targets of an instance from a list of targets.
+
+    ``target_list`` is usually a :class:`FloatingIpTargetList`; plain lists
+    of targets are searched.
+    """
+    if isinstance(target_list, FloatingIpTargetList):
+        return target_list.get_by_instance(instance_id)
+    return [target for target in target_list
+            if target['instance_id'] == instance_id]
+
+
 @six.add_metaclass(abc.ABCMeta)
 class FloatingIpManager(object):
     """Abstract class to implement Floating IP methods
@@ -95,7 +144,7 @@ class FloatingIpManager(object):
         pass
 
     @abc.abstractmethod
-    def list_targets(self):
+    def list_targets(self, instance_ids=None):
         """Returns a list of association targets of instance VIFs.
 
         Each association target is represented as FloatingIpTarget object.
@@ -103,6 +152,11 @@ class FloatingIpManager(object):
         'id' and 'name' attributes must be defined in each object.
         FloatingIpTarget.id can be passed as port_id in associate().
         FloatingIpTarget.name is displayed in Floating Ip Association Form.
+
+        The targets are returned as a FloatingIpTargetList.
+
+        :param instance_ids: (optional) only return the targets of these
+            instances, which may take fewer or cheaper calls to a back-end.
         """
         pass
 
@@ -21,6 +21,7 @@ from __future__ import absolute_import
 
 import collections
 import logging
+import threading
 import warnings
 
 import netaddr
@@ -34,8 +35,12 @@ from neutronclient.v2_0 import client as neutron_client
 from horizon import messages
 from horizon.utils.memoized import memoized  # noqa
 from openstack_dashboard.api import base
+from openstack_dashboard.api import cache
+from openstack_dashboard.api import capabilities
+from openstack_dashboard.api import connection_pool
 from openstack_dashboard.api import network_base
 from openstack_dashboard.api import nova
+from openstack_dashboard.api import resilience
 from openstack_dashboard import policy
 
 
@@ -410,20 +415,26 @@ class FloatingIpManager(network_base.FloatingIpManager):
         self.client.update_floatingip(floating_ip_id,
                                       {'floatingip': update_dict})
 
-    def _get_reachable_subnets(self, ports):
+    def _get_reachable_subnets(self, ports=None):
         # Retrieve subnet list reachable from external network
         ext_net_ids = [ext_net.id for ext_net in self.list_pools()]
         gw_routers = [r.id for r in router_list(self.request)
                       if (r.external_gateway_info and
                           r.external_gateway_info.get('network_id')
                           in ext_net_ids)]
+        if ports is None:
+            # Only the interfaces of the gateway routers are needed.
+            ports = (port_list(self.request, device_id=gw_routers)
+                     if gw_routers else [])
         reachable_subnets = set([p.fixed_ips[0]['subnet_id'] for p in ports
                                 if ((p.device_owner in
                                      ROUTER_INTERFACE_OWNERS)
                                     and (p.device_id in gw_routers))])
         return reachable_subnets
 
-    def list_targets(self):
+    def list_targets(self, instance_ids=None):
+        if instance_ids is not None:
+            return self._list_instance_targets(instance_ids)
         tenant_id = self.request.user.tenant_id
         ports = port_list(self.request, tenant_id=tenant_id)
         servers, has_more = nova.server_list(self.request)
@@ -437,7 +448,24 @@ class FloatingIpManager(network_base.FloatingIpManager):
                         for v in self.client.list_vips().get('vips', [])}
         else:
             vip_dict = {}
-
+        return self._make_targets(ports, reachable_subnets,
+                                  server_dict, vip_dict)
+
+    def _list_instance_targets(self, instance_ids):
+        # Only the ports of the instances and the interfaces of the gateway
+        # routers are listed. Servers are not, so targets are named after
+        # the instance ids.
+        instance_ids = list(instance_ids)
+        if not instance_ids:
+            return network_base.FloatingIpTargetList()
+        device_id = instance_ids[0] if len(instance_ids) == 1 else instance_ids
+        ports = port_list(self.request, device_id=device_id)
+        reachable_subnets = self._get_reachable_subnets()
+        server_dict = dict((instance_id, instance_id)
+                           for instance_id in instance_ids)
+        return self._make_targets(ports, reachable_subnets, server_dict, {})
+
+    def _make_targets(self, ports, reachable_subnets, server_dict, vip_dict):
         targets = []
         for p in ports:
             # Remove network ports from Floating IP targets
@@ -453,7 +481,7 @@ class FloatingIpManager(network_base.FloatingIpManager):
                           'id': '%s_%s' % (port_id, ip['ip_address']),
                           'instance_id': p.device_id}
                 targets.append(FloatingIpTarget(target))
-        return targets
+        return network_base.FloatingIpTargetList(targets)
 
     def _target_ports_by_instance(self, instance_id):
         if not instance_id:
@@ -463,8 +491,8 @@ class FloatingIpManager(network_base.FloatingIpManager):
 
     def get_target_id_by_instance(self, instance_id, target_list=None):
         if target_list is not None:
-            targets = [target for target in target_list
-                       if target['instance_id'] == instance_id]
+            targets = network_base.get_targets_by_instance(target_list,
+                                                           instance_id)
             if not targets:
                 return None
             return targets[0]['id']
@@ -479,8 +507,9 @@ class FloatingIpManager(network_base.FloatingIpManager):
 
     def list_target_id_by_instance(self, instance_id, target_list=None):
         if target_list is not None:
-            return [target['id'] for target in target_list
-                    if target['instance_id'] == instance_id]
+            return [target['id'] for target
+                    in network_base.get_targets_by_instance(target_list,
+                                                            instance_id)]
         else:
             ports = self._target_ports_by_instance(instance_id)
             return ['{0}_{1}'.format(p.id, p.fixed_ips[0]['ip_address'])
@@ -508,12 +537,18 @@ def get_ipver_str(ip_version):
 
 @memoized
 def neutronclient(request):
+    if connection_pool.is_enabled():
+        url = base.url_for(request, 'network')
+        return neutron_client.Client(
+            session=connection_pool.get_session(request, url))
     insecure = getattr(settings, 'OPENSTACK_SSL_NO_VERIFY', False)
     cacert = getattr(settings, 'OPENSTACK_SSL_CACERT', None)
     c = neutron_client.Client(token=request.user.token.id,
                               auth_url=base.url_for(request, 'identity'),
                               endpoint_url=base.url_for(request, 'network'),
-                              insecure=insecure, ca_cert=cacert)
+                              insecure=insecure, ca_cert=cacert,
+                              timeout=resilience.get_service_timeout(
+                                  'network'))
     return c
 
 
@@ -571,6 +606,78 @@ def list_resources_with_long_filters(list_method,
         return resources
 
 
+# Maps the names of the collections a ResourceGraph can hold to the
+# functions listing them.
+_GRAPH_COLLECTIONS = {}
+
+
+def register_graph_collection(name, loader):
+    """Registers a collection which can be loaded into a ResourceGraph.
+
+    ``loader`` is called with the request and the filters of the listing,
+    and must return the unexpanded resources as a list of API wrappers.
+    """
+    _GRAPH_COLLECTIONS[name] = loader
+
+
+class ResourceGraph(object):
+    """The neutron resources listed while serving a request.
+
+    Listing functions expand the resources they return with the resources
+    they refer to (e.g. the subnet of a load balancer pool). Pages calling
+    several of them share the graph of their request, so each listing is
+    only made once and every resource it returns is indexed by id. Like
+    :func:`horizon.utils.memoized.memoized`, the graph is not refreshed
+    when the resources change during the request.
+    """
+
+    def __init__(self, request):
+        self.request = request
+        self._lists = {}
+        self._indexes = collections.defaultdict(dict)
+        self._lock = threading.Lock()
+        self._locks = collections.defaultdict(threading.Lock)
+
+    def list(self, name, **params):
+        """Returns the resources of a collection matching ``params``."""
+        key = (name, repr(sorted(params.items())))
+        # Listings are made under their own lock, so that tables loaded
+        # concurrently do not wait for each other's listings.
+        with self._lock:
+            lock = self._locks[key]
+        with lock:
+            if key not in self._lists:
+                resources = _GRAPH_COLLECTIONS[name](self.request, **params)
+                self._indexes[name].update((resource.id, resource)
+                                           for resource in resources)
+                self._lists[key] = resources
+        return self._lists[key]
+
+    def get(self, name, resource_id, default=None, **params):
+        """Returns a resource of a collection by id.
+
+        The resource is looked for among the resources already listed,
+        then in the listing matching ``params`` and, if it is still not
+        found, in the whole collection.
+        """
+        index = self._indexes[name]
+        if resource_id not in index:
+            self.list(name, **params)
+            if resource_id not in index and params:
+                self.list(name)
+        return index.get(resource_id, default)
+
+
+def get_resource_graph(request):
+    """Returns the ResourceGraph of a request."""
+    graph = getattr(request, '_neutron_resource_graph', None)
+    if graph is None:
+        graph = ResourceGraph(request)
+        request._neutron_resource_graph = graph
+    return graph
+
+
+@cache.cached('networks', 'network')
 def network_list(request, **params):
     LOG.debug("network_list(): params=%s", params)
     networks = neutronclient(request).list_networks(**params).get('networks')
@@ -622,6 +729,7 @@ def network_get(request, network_id, expand_subnet=True, **params):
     return Network(network)
 
 
+@cache.invalidates('networks', 'subnets', 'quota_usages')
 def network_create(request, **kwargs):
     """Create a subnet on a specified network.
 
@@ -641,6 +749,7 @@ def network_create(request, **kwargs):
     return Network(network)
 
 
+@cache.invalidates('networks', 'subnets')
 def network_update(request, network_id, **kwargs):
     LOG.debug("network_update(): netid=%s, params=%s" % (network_id, kwargs))
     body = {'network': kwargs}
@@ -649,11 +758,13 @@ def network_update(request, network_id, **kwargs):
     return Network(network)
 
 
+@cache.invalidates('networks', 'subnets', 'quota_usages')
 def network_delete(request, network_id):
     LOG.debug("network_delete(): netid=%s" % network_id)
     neutronclient(request).delete_network(network_id)
 
 
+@cache.cached('subnets', 'network')
 def subnet_list(request, **params):
     LOG.debug("subnet_list(): params=%s" % (params))
     subnets = neutronclient(request).list_subnets(**params).get('subnets')
@@ -667,6 +778,7 @@ def subnet_get(request, subnet_id, **params):
     return Subnet(subnet)
 
 
+@cache.invalidates('networks', 'subnets', 'quota_usages')
 def subnet_create(request, network_id, cidr, ip_version, **kwargs):
     """Create a subnet on a specified network.
 
@@ -692,6 +804,7 @@ def subnet_create(request, network_id, cidr, ip_version, **kwargs):
     return Subnet(subnet)
 
 
+@cache.invalidates('networks', 'subnets')
 def subnet_update(request, subnet_id, **kwargs):
     LOG.debug("subnet_update(): subnetid=%s, kwargs=%s" % (subnet_id, kwargs))
     body = {'subnet': kwargs}
@@ -700,6 +813,7 @@ def subnet_update(request, subnet_id, **kwargs):
     return Subnet(subnet)
 
 
+@cache.invalidates('networks', 'subnets', 'quota_usages')
 def subnet_delete(request, subnet_id):
     LOG.debug("subnet_delete(): subnetid=%s" % subnet_id)
     neutronclient(request).delete_subnet(subnet_id)
@@ -810,6 +924,7 @@ def profile_bindings_list(request, type_p, **params):
     return [Profile(n) for n in bindings]
 
 
+@cache.invalidates('quota_usages')
 def router_create(request, **kwargs):
     LOG.debug("router_create():, kwargs=%s" % kwargs)
     body = {'router': {}}
@@ -839,6 +954,15 @@ def router_list(request, **params):
     return [Router(r) for r in routers]
 
 
+# The lambdas look the functions up when called, so that they can be
+# stubbed out.
+register_graph_collection(
+    'subnets', lambda request, **params: subnet_list(request, **params))
+register_graph_collection(
+    'routers', lambda request, **params: router_list(request, **params))
+
+
+@cache.invalidates('quota_usages')
 def router_delete(request, router_id):
     neutronclient(request).delete_router(router_id)
 
@@ -871,10 +995,23 @@ def router_remove_gateway(request, router_id):
     neutronclient(request).remove_gateway_router(router_id)
 
 
+def resource_count(request, resource, **params):
+    """Returns the number of resources of a type matching ``params``.
+
+    ``resource`` is the singular name of the resource, e.g. ``"network"``.
+    Only the IDs of the resources are retrieved, which is much cheaper than
+    listing them when only their number matters.
+    """
+    collection = '%ss' % resource
+    list_method = getattr(neutronclient(request), 'list_%s' % collection)
+    return len(list_method(fields='id', **params).get(collection))
+
+
 def tenant_quota_get(request, tenant_id):
     return base.QuotaSet(neutronclient(request).show_quota(tenant_id)['quota'])
 
 
+@cache.invalidates('quota_usages')
 def tenant_quota_update(request, tenant_id, **kwargs):
     quotas = {'quota': kwargs}
     return neutronclient(request).update_quota(tenant_id, quotas)
@@ -995,8 +1132,7 @@ def _server_get_addresses(request, server, ports, floating_ips, network_names):
     return dict(addresses)
 
 
-@memoized
-def list_extensions(request):
+def _discover_extensions(request):
     extensions_list = neutronclient(request).list_extensions()
     if 'extensions' in extensions_list:
         return extensions_list['extensions']
@@ -1004,6 +1140,14 @@ def list_extensions(request):
         return {}
 
 
+capabilities.register('network', _discover_extensions)
+
+
+@memoized
+def list_extensions(request):
+    return capabilities.get_extensions(request, 'network')
+
+
 @memoized
 def is_extension_supported(request, extension_alias):
     extensions = list_extensions(request)
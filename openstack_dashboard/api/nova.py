@@ -30,6 +30,7 @@ from novaclient import exceptions as nova_exceptions
 from novaclient.v1_1 import client as nova_client
 from novaclient.v1_1.contrib import instance_action as nova_instance_action
 from novaclient.v1_1.contrib import list_extensions as nova_list_extensions
+from novaclient.v1_1 import flavors as nova_flavors
 from novaclient.v1_1 import security_group_rules as nova_rules
 from novaclient.v1_1 import security_groups as nova_security_groups
 from novaclient.v1_1 import servers as nova_servers
@@ -37,9 +38,14 @@ from novaclient.v1_1 import servers as nova_servers
 from horizon import conf
 from horizon.utils import functions as utils
 from horizon.utils.memoized import memoized  # noqa
+from horizon.utils import parallel
 
 from openstack_dashboard.api import base
+from openstack_dashboard.api import cache
+from openstack_dashboard.api import capabilities
+from openstack_dashboard.api import connection_pool
 from openstack_dashboard.api import network_base
+from openstack_dashboard.api import resilience
 
 
 LOG = logging.getLogger(__name__)
@@ -408,8 +414,14 @@ class FloatingIpManager(network_base.FloatingIpManager):
         server = self.client.servers.get(fip.instance_id)
         self.client.servers.remove_floating_ip(server.id, fip.ip)
 
-    def list_targets(self):
-        return [FloatingIpTarget(s) for s in self.client.servers.list()]
+    def list_targets(self, instance_ids=None):
+        if instance_ids is None:
+            servers = self.client.servers.list()
+        else:
+            servers = [self.client.servers.get(instance_id)
+                       for instance_id in instance_ids]
+        return network_base.FloatingIpTargetList(
+            FloatingIpTarget(s) for s in servers)
 
     def get_target_id_by_instance(self, instance_id, target_list=None):
         return instance_id
@@ -426,6 +438,13 @@ class FloatingIpManager(network_base.FloatingIpManager):
 
 @memoized
 def novaclient(request):
+    if connection_pool.is_enabled():
+        url = base.url_for(request, 'compute')
+        return nova_client.Client(
+            request.user.username,
+            request.user.token.id,
+            project_id=request.user.tenant_id,
+            session=connection_pool.get_session(request, url))
     insecure = getattr(settings, 'OPENSTACK_SSL_NO_VERIFY', False)
     cacert = getattr(settings, 'OPENSTACK_SSL_CACERT', None)
     c = nova_client.Client(request.user.username,
@@ -434,7 +453,8 @@ def novaclient(request):
                            auth_url=base.url_for(request, 'compute'),
                            insecure=insecure,
                            cacert=cacert,
-                           http_log_debug=settings.DEBUG)
+                           http_log_debug=settings.DEBUG,
+                           timeout=resilience.get_service_timeout('compute'))
     c.client.auth_token = request.user.token.id
     c.client.management_url = base.url_for(request, 'compute')
     return c
@@ -455,6 +475,16 @@ def server_rdp_console(request, instance_id, console_type='rdp-html5'):
         instance_id, console_type)['console'])
 
 
+def _dump_flavors(flavors):
+    return [flavor._info for flavor in flavors]
+
+
+def _load_flavors(request, data):
+    manager = novaclient(request).flavors
+    return [nova_flavors.Flavor(manager, info, loaded=True) for info in data]
+
+
+@cache.invalidates('flavors')
 def flavor_create(request, name, memory, vcpu, disk, flavorid='auto',
                   ephemeral=0, swap=0, metadata=None, is_public=True):
     flavor = novaclient(request).flavors.create(name, memory, vcpu, disk,
@@ -466,6 +496,7 @@ def flavor_create(request, name, memory, vcpu, disk, flavorid='auto',
     return flavor
 
 
+@cache.invalidates('flavors')
 def flavor_delete(request, flavor_id):
     novaclient(request).flavors.delete(flavor_id)
 
@@ -475,23 +506,65 @@ def flavor_get(request, flavor_id):
 
 
 @memoized
+@cache.cached('flavors', 'compute', dump=_dump_flavors, load=_load_flavors)
 def flavor_list(request, is_public=True):
     """Get the list of available instance sizes (flavors)."""
     return novaclient(request).flavors.list(is_public=is_public)
 
 
+def flavor_get_by_ids(request, flavor_ids, flavors=None):
+    """Returns a dict of the flavors with the given IDs, keyed by ID.
+
+    The IDs are first looked up in ``flavors``, which defaults to
+    :func:`flavor_list`. The remaining ones, typically deleted or private
+    flavors, are fetched once each and concurrently. Flavors which nova
+    does not know about are left out of the dict and, if the API cache is
+    enabled, remembered so they are not requested again.
+
+    Flavors which cannot be fetched for another reason are logged and left
+    out of the dict too, so that a single failure does not lose the
+    flavors which were found.
+    """
+    if flavors is None:
+        flavors = flavor_list(request)
+    found = dict((flavor.id, flavor) for flavor in flavors)
+    # Instances often share their flavor, each one is only looked up once.
+    unknown = []
+    for flavor_id in flavor_ids:
+        if flavor_id not in found and flavor_id not in unknown:
+            unknown.append(flavor_id)
+    missing = [flavor_id for flavor_id in unknown
+               if not cache.get_value(request, 'flavors', 'missing',
+                                      flavor_id)]
+    pool = parallel.get_pool()
+    futures = [(flavor_id, pool.submit(flavor_get, request, flavor_id))
+               for flavor_id in missing]
+    for flavor_id, future in futures:
+        try:
+            found[flavor_id] = future.result()
+        except nova_exceptions.NotFound:
+            cache.set_value(request, 'flavors', True, 'missing', flavor_id)
+        except Exception:
+            LOG.warning("Unable to retrieve flavor %s.", flavor_id,
+                        exc_info=True)
+    return dict((flavor_id, found[flavor_id]) for flavor_id in flavor_ids
+                if flavor_id in found)
+
+
 @memoized
 def flavor_access_list(request, flavor=None):
     """Get the list of access instance sizes (flavors)."""
     return novaclient(request).flavor_access.list(flavor=flavor)
 
 
+@cache.invalidates('flavors')
 def add_tenant_to_flavor(request, flavor, tenant):
     """Add a tenant to the given flavor access list."""
     return novaclient(request).flavor_access.add_tenant_access(
         flavor=flavor, tenant=tenant)
 
 
+@cache.invalidates('flavors')
 def remove_tenant_from_flavor(request, flavor, tenant):
     """Remove a tenant from the given flavor access list."""
     return novaclient(request).flavor_access.remove_tenant_access(
@@ -522,6 +595,7 @@ def flavor_extra_set(request, flavor_id, metadata):
     return flavor.set_keys(metadata)
 
 
+@cache.invalidates('images')
 def snapshot_create(request, instance_id, name):
     return novaclient(request).servers.create_image(instance_id, name)
 
@@ -546,6 +620,7 @@ def keypair_get(request, keypair_id):
     return novaclient(request).keypairs.get(keypair_id)
 
 
+@cache.invalidates('quota_usages')
 def server_create(request, name, image, flavor, key_name, user_data,
                   security_groups, block_device_mapping=None,
                   block_device_mapping_v2=None, nics=None,
@@ -562,6 +637,7 @@ def server_create(request, name, image, flavor, key_name, user_data,
         meta=meta), request)
 
 
+@cache.invalidates('quota_usages')
 def server_delete(request, instance):
     novaclient(request).servers.delete(instance)
 
@@ -570,7 +646,14 @@ def server_get(request, instance_id):
     return Server(novaclient(request).servers.get(instance_id), request)
 
 
-def server_list(request, search_opts=None, all_tenants=False):
+def server_list(request, search_opts=None, all_tenants=False, sort_key=None,
+                sort_dir=None):
+    """Lists the servers.
+
+    If a sort_key is given, the servers are sorted by Nova on that field,
+    in the sort_dir direction; the marker of the search options is then
+    the last server of the previous page in that order.
+    """
     page_size = utils.get_page_size(request)
     c = novaclient(request)
     paginate = False
@@ -581,6 +664,13 @@ def server_list(request, search_opts=None, all_tenants=False):
         if paginate:
             search_opts['limit'] = page_size + 1
 
+    if sort_key:
+        # Passed as search options, which novaclient sends as they are in
+        # the query string, rather than with the sort_keys argument which
+        # older novaclient releases lack.
+        search_opts['sort_key'] = sort_key
+        search_opts['sort_dir'] = sort_dir or 'asc'
+
     if all_tenants:
         search_opts['all_tenants'] = True
     else:
@@ -648,6 +738,7 @@ def server_live_migrate(request, instance_id, host, block_migration=False,
                                              disk_over_commit)
 
 
+@cache.invalidates('quota_usages')
 def server_resize(request, instance_id, flavor, disk_config=None, **kwargs):
     novaclient(request).servers.resize(instance_id, flavor,
                                        disk_config, **kwargs)
@@ -681,6 +772,7 @@ def tenant_quota_get(request, tenant_id):
     return base.QuotaSet(novaclient(request).quotas.get(tenant_id))
 
 
+@cache.invalidates('quota_usages')
 def tenant_quota_update(request, tenant_id, **kwargs):
     novaclient(request).quotas.update(tenant_id, **kwargs)
 
@@ -857,9 +949,20 @@ def remove_host_from_aggregate(request, aggregate_id, host):
     return novaclient(request).aggregates.remove_host(aggregate_id, host)
 
 
+def _discover_extensions(request):
+    manager = nova_list_extensions.ListExtManager(novaclient(request))
+    # Only the data of the resources is kept, not their client.
+    return [extension._info for extension in manager.show_all()]
+
+
+capabilities.register('compute', _discover_extensions)
+
+
 @memoized
 def list_extensions(request):
-    return nova_list_extensions.ListExtManager(novaclient(request)).show_all()
+    extensions = capabilities.get_extensions(request, 'compute')
+    return [nova_list_extensions.ListExtResource(None, info, loaded=True)
+            for info in extensions]
 
 
 @memoized
@@ -0,0 +1,209 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Records the API calls made while serving a request.
+
+:func:`install` wraps the public functions of the API modules. Once a
+:class:`Profile` is attached to a request with :func:`start`, every wrapped
+function called with that request records its name, a summary of its
+arguments, its duration and, for cached listings, whether the API cache was
+hit. Calls made from the worker threads of :mod:`horizon.utils.parallel`
+are recorded too, since they are given the same request.
+
+:class:`openstack_dashboard.middleware.APIProfilerMiddleware` reports the
+recorded calls. Profiling is disabled unless enabled through the
+``OPENSTACK_PROFILER`` setting.
+"""
+
+import collections
+import functools
+import importlib
+import inspect
+import threading
+import time
+
+from django.conf import settings
+
+
+PROFILE_ATTR = '_api_profile'
+
+# The API modules whose public functions are recorded.
+MODULES = ('ceilometer', 'cinder', 'glance', 'heat', 'keystone', 'neutron',
+           'nova', 'swift')
+
+# Client factories are called by every API function, recording them would
+# only add noise.
+EXCLUDED = ('swift_api',)
+
+# Arguments whose values are never recorded.
+SENSITIVE_ARGUMENTS = ('password', 'secret', 'token')
+
+_local = threading.local()
+_installed = False
+_install_lock = threading.Lock()
+
+
+def _get_config():
+    return getattr(settings, 'OPENSTACK_PROFILER', {})
+
+
+def is_enabled():
+    return _get_config().get('enabled', False)
+
+
+def _summarize(value, max_length=40):
+    summary = repr(value)
+    if len(summary) > max_length:
+        summary = summary[:max_length - 3] + '...'
+    return summary
+
+
+def _is_sensitive(name):
+    return any(word in name for word in SENSITIVE_ARGUMENTS)
+
+
+def summarize_arguments(args, kwargs, names=()):
+    """Returns a short, readable summary of the arguments of a call.
+
+    ``names`` are the names of the positional arguments, if known. The
+    values of arguments named like passwords or tokens are left out.
+    """
+    summaries = []
+    for i, arg in enumerate(args):
+        if i < len(names) and _is_sensitive(names[i]):
+            summaries.append('***')
+        else:
+            summaries.append(_summarize(arg))
+    for key in sorted(kwargs):
+        value = '***' if _is_sensitive(key) else _summarize(kwargs[key])
+        summaries.append('%s=%s' % (key, value))
+    return ', '.join(summaries)
+
+
+class Profile(object):
+    """The API calls made while serving a request."""
+
+    def __init__(self):
+        self.start = time.time()
+        self.calls = []
+
+    def total(self):
+        """Returns the time spent in top-level calls, in milliseconds.
+
+        Concurrent calls are added up, so this may exceed the time spent
+        serving the request.
+        """
+        return sum(call['duration'] for call in self.calls
+                   if call['depth'] == 0)
+
+    def summary(self):
+        """Returns (name, number of calls, total duration) tuples.
+
+        Tuples are sorted by decreasing duration; nested calls are included.
+        """
+        totals = collections.OrderedDict()
+        for call in self.calls:
+            count, duration = totals.get(call['name'], (0, 0))
+            totals[call['name']] = (count + 1, duration + call['duration'])
+        return sorted(((name, count, duration)
+                       for name, (count, duration) in totals.items()),
+                      key=lambda item: item[2], reverse=True)
+
+
+def start(request):
+    """Attaches a new :class:`Profile` to the request and returns it."""
+    profile = Profile()
+    setattr(request, PROFILE_ATTR, profile)
+    return profile
+
+
+def get_profile(request):
+    return getattr(request, PROFILE_ATTR, None)
+
+
+def annotate(key, value):
+    """Adds information to the call being recorded in the current thread."""
+    stack = getattr(_local, 'stack', None)
+    if stack:
+        stack[-1][key] = value
+
+
+def _get_profile(args, kwargs):
+    request = args[0] if args else kwargs.get('request')
+    return getattr(request, PROFILE_ATTR, None)
+
+
+def _unwrap(func):
+    """Returns the function wrapped by the API layers (e.g. the API cache or
+    resilience), which have the signature of the function they wrap.
+    """
+    while getattr(func, '__wrapped__', None) is not None:
+        func = func.__wrapped__
+    return func
+
+
+def profiled(name, func):
+    """Wraps func to record its calls as name."""
+    try:
+        # Names of the arguments following the request.
+        names = inspect.getargspec(_unwrap(func)).args[1:]
+    except TypeError:
+        names = ()
+
+    @functools.wraps(func)
+    def wrapped(*args, **kwargs):
+        profile = _get_profile(args, kwargs)
+        if profile is None:
+            return func(*args, **kwargs)
+        stack = _local.__dict__.setdefault('stack', [])
+        call = {'name': name,
+                'args': summarize_arguments(args[1:], kwargs, names),
+                'depth': len(stack),
+                'cache': None,
+                'error': None}
+        stack.append(call)
+        start_time = time.time()
+        try:
+            return func(*args, **kwargs)
+        except Exception as e:
+            call['error'] = e.__class__.__name__
+            raise
+        finally:
+            end_time = time.time()
+            stack.pop()
+            call['start'] = (start_time - profile.start) * 1000
+            call['duration'] = (end_time - start_time) * 1000
+            profile.calls.append(call)
+    wrapped.profiled = True
+    wrapped.__wrapped__ = func
+    return wrapped
+
+
+def install():
+    """Wraps the public functions of the API modules, once per process."""
+    global _installed
+    with _install_lock:
+        if _installed:
+            return
+        for module_name in MODULES:
+            module = importlib.import_module('openstack_dashboard.api.%s'
+                                             % module_name)
+            for name, func in inspect.getmembers(module, inspect.isfunction):
+                if (name.startswith('_') or name.endswith('client') or
+                        name in EXCLUDED or
+                        func.__module__ != module.__name__ or
+                        getattr(func, 'profiled', False)):
+                    continue
+                setattr(module, name,
+                        profiled('%s.%s' % (module_name, name), func))
+        _installed = True
@@ -0,0 +1,271 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Keeps a slow or failing service from slowing down every page.
+
+:func:`install` wraps the public functions of the API modules, so that:
+
+* every call is given a timeout, which is the timeout configured for its
+  service, shortened to what is left of the time budget of the request.
+  Clients sending their requests through :mod:`connection_pool` apply it to
+  each HTTP request, the others are given the service timeout when built;
+* calls are refused once the budget of the request is spent;
+* calls to an endpoint are refused for a cooldown period after it failed
+  several times in a row (a *circuit breaker*). The first call after the
+  cooldown is let through, and closes the circuit if it succeeds.
+
+Refused calls raise :class:`ServiceUnavailable`, which is one of the
+recoverable exceptions of :mod:`horizon.exceptions`, so views fall back on
+their usual error handling straight away instead of waiting for the client
+timeouts. Only connection errors, timeouts and server errors count as
+failures of an endpoint.
+
+:class:`openstack_dashboard.middleware.APIResilienceMiddleware` starts the
+budget of each request. The layer is disabled unless enabled through the
+``OPENSTACK_API_RESILIENCE`` setting.
+"""
+
+import functools
+import importlib
+import inspect
+import logging
+import socket
+import threading
+import time
+
+from django.conf import settings
+from django.utils.translation import ugettext_lazy as _
+import requests
+
+from horizon import exceptions
+
+from openstack_dashboard.api import base
+
+
+LOG = logging.getLogger(__name__)
+
+DEADLINE_ATTR = '_api_deadline'
+
+# The service type of the endpoints called by each API module.
+MODULES = {
+    'ceilometer': 'metering',
+    'cinder': 'volume',
+    'fwaas': 'network',
+    'glance': 'image',
+    'heat': 'orchestration',
+    'keystone': 'identity',
+    'lbaas': 'network',
+    'neutron': 'network',
+    'nova': 'compute',
+    'swift': 'object-store',
+    'vpn': 'network',
+}
+
+# Words in the names of the exceptions raised by the clients when an
+# endpoint cannot be reached or does not answer in time.
+FAILURE_NAMES = ('Timeout', 'Connection', 'Communication', 'Unavailable')
+
+_local = threading.local()
+# Maps endpoints to their Circuit.
+_circuits = {}
+_lock = threading.Lock()
+_installed = False
+_install_lock = threading.Lock()
+
+
+class ServiceUnavailable(exceptions.NotAvailable):
+    """Raised instead of calling a service which is not expected to answer.
+    """
+
+    def __init__(self, message, service_type):
+        super(ServiceUnavailable, self).__init__(message)
+        self.service_type = service_type
+        # Already accounted for, the calls wrapping this one must not count
+        # it as a failure of their own endpoint.
+        self._api_failure_recorded = True
+
+
+def _get_config():
+    return getattr(settings, 'OPENSTACK_API_RESILIENCE', {})
+
+
+def is_enabled():
+    return _get_config().get('enabled', False)
+
+
+def get_service_timeout(service_type):
+    """Returns the timeout of the calls to a service, in seconds, or None.
+    """
+    config = _get_config()
+    if not config.get('enabled', False):
+        return None
+    return config.get('timeouts', {}).get(service_type,
+                                          config.get('default_timeout'))
+
+
+def get_timeout():
+    """Returns the timeout of the call being made by the current thread."""
+    timeouts = getattr(_local, 'timeouts', None)
+    return timeouts[-1] if timeouts else None
+
+
+def start(request):
+    """Starts the time budget of a request, if one is configured."""
+    budget = _get_config().get('request_budget')
+    if budget:
+        setattr(request, DEADLINE_ATTR, time.time() + budget)
+
+
+class Circuit(object):
+    """Counts the consecutive failures of an endpoint."""
+
+    def __init__(self):
+        self.failures = 0
+        self.opened_at = None
+        self._lock = threading.Lock()
+
+    def allow(self, cooldown):
+        """Tells whether the endpoint may be called."""
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            now = time.time()
+            if now - self.opened_at < cooldown:
+                return False
+            # Let this call try the endpoint, the following ones wait for
+            # another cooldown unless it succeeds.
+            self.opened_at = now
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self, threshold):
+        """Records a failure; returns True if it opened the circuit."""
+        with self._lock:
+            self.failures += 1
+            if self.failures >= threshold and self.opened_at is None:
+                self.opened_at = time.time()
+                return True
+            return False
+
+
+def get_circuit(endpoint):
+    with _lock:
+        if endpoint not in _circuits:
+            _circuits[endpoint] = Circuit()
+        return _circuits[endpoint]
+
+
+def reset():
+    """Closes every circuit."""
+    with _lock:
+        _circuits.clear()
+
+
+def is_failure(exc):
+    """Tells whether an exception shows that the endpoint is unavailable,
+    rather than the call being wrong.
+    """
+    for cls in type(exc).__mro__:
+        if any(name in cls.__name__ for name in FAILURE_NAMES):
+            return True
+    for attr in ('http_status', 'status_code', 'code'):
+        status = getattr(exc, attr, None)
+        if isinstance(status, int) and status:
+            return status >= 500
+    return isinstance(exc, (requests.RequestException, socket.error))
+
+
+def _get_request(args, kwargs):
+    request = args[0] if args else kwargs.get('request')
+    if getattr(request, 'user', None) is None:
+        return None
+    return request
+
+
+def guarded(service_type, func):
+    """Wraps func, which calls the given service, as described above."""
+
+    @functools.wraps(func)
+    def wrapped(*args, **kwargs):
+        request = _get_request(args, kwargs)
+        config = _get_config()
+        if request is None or not config.get('enabled', False):
+            return func(*args, **kwargs)
+        try:
+            endpoint = base.url_for(request, service_type)
+        except exceptions.ServiceCatalogException:
+            return func(*args, **kwargs)
+
+        timeout = get_service_timeout(service_type)
+        deadline = getattr(request, DEADLINE_ATTR, None)
+        if deadline is not None:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                raise ServiceUnavailable(
+                    _("The time allowed to load this page is over."),
+                    service_type)
+            timeout = min(timeout or remaining, remaining)
+
+        circuit = get_circuit(endpoint)
+        if not circuit.allow(config.get('cooldown', 30)):
+            raise ServiceUnavailable(
+                _("The %s service is unavailable, please try again "
+                  "later.") % service_type,
+                service_type)
+
+        timeouts = _local.__dict__.setdefault('timeouts', [])
+        timeouts.append(timeout)
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            if (is_failure(e) and
+                    not getattr(e, '_api_failure_recorded', False)):
+                try:
+                    e._api_failure_recorded = True
+                except AttributeError:
+                    pass
+                if circuit.record_failure(config.get('failure_threshold',
+                                                     5)):
+                    LOG.warning("Calls to %s are suspended after repeated "
+                                "failures.", endpoint)
+            raise
+        finally:
+            timeouts.pop()
+        circuit.record_success()
+        return result
+    wrapped.guarded = True
+    wrapped.__wrapped__ = func
+    return wrapped
+
+
+def install():
+    """Wraps the public functions of the API modules, once per process."""
+    global _installed
+    with _install_lock:
+        if _installed:
+            return
+        for module_name, service_type in MODULES.items():
+            module = importlib.import_module('openstack_dashboard.api.%s'
+                                             % module_name)
+            for name, func in inspect.getmembers(module, inspect.isfunction):
+                if (name.startswith('_') or name.endswith('client') or
+                        name == 'swift_api' or
+                        func.__module__ != module.__name__ or
+                        getattr(func, 'guarded', False)):
+                    continue
+                setattr(module, name, guarded(service_type, func))
+        _installed = True
@@ -29,6 +29,7 @@ from horizon import exceptions
 from horizon.utils.memoized import memoized  # noqa
 
 from openstack_dashboard.api import base
+from openstack_dashboard.api import connection_pool
 
 
 LOG = logging.getLogger(__name__)
@@ -105,19 +106,28 @@ def _metadata_to_header(metadata):
     return headers
 
 
+class Connection(swiftclient.client.Connection):
+    """A swift connection sending its requests through pooled connections."""
+
+    def http_connection(self, url=None):
+        parsed, conn = super(Connection, self).http_connection(url)
+        connection_pool.mount(conn.request_session, conn.url)
+        return parsed, conn
+
+
 @memoized
 def swift_api(request):
     endpoint = base.url_for(request, 'object-store')
     cacert = getattr(settings, 'OPENSTACK_SSL_CACERT', None)
     insecure = getattr(settings, 'OPENSTACK_SSL_NO_VERIFY', False)
-    return swiftclient.client.Connection(None,
-                                         request.user.username,
-                                         None,
-                                         preauthtoken=request.user.token.id,
-                                         preauthurl=endpoint,
-                                         cacert=cacert,
-                                         insecure=insecure,
-                                         auth_version="2.0")
+    return Connection(None,
+                      request.user.username,
+                      None,
+                      preauthtoken=request.user.token.id,
+                      preauthurl=endpoint,
+                      cacert=cacert,
+                      insecure=insecure,
+                      auth_version="2.0")
 
 
 def swift_container_exists(request, container_name):
@@ -326,10 +336,23 @@ def swift_delete_object(request, container_name, object_name):
     return True
 
 
-def swift_get_object(request, container_name, object_name, with_data=True):
+def swift_get_object(request, container_name, object_name, with_data=True,
+                     resp_chunk_size=None, extra_headers=None):
+    """Returns an object and, if ``with_data`` is True, its content.
+
+    If ``resp_chunk_size`` is given, the content is an iterator over chunks
+    of that size, read as they are consumed, rather than a string.
+    ``extra_headers`` are sent along with the request, e.g. a ``Range``
+    header to get a part of the content only.
+    """
     if with_data:
+        kwargs = {}
+        if resp_chunk_size:
+            kwargs['resp_chunk_size'] = resp_chunk_size
+        if extra_headers:
+            kwargs['headers'] = extra_headers
         headers, data = swift_api(request).get_object(container_name,
-                                                      object_name)
+                                                      object_name, **kwargs)
     else:
         data = None
         headers = swift_api(request).head_object(container_name,
@@ -346,6 +369,7 @@ def swift_get_object(request, container_name, object_name, with_data=True):
         'bytes': headers.get('content-length'),
         'content_type': headers.get('content-type'),
         'etag': headers.get('etag'),
+        'content_range': headers.get('content-range'),
         'timestamp': timestamp,
     }
     return StorageObject(obj_info,
@@ -14,7 +14,7 @@
 
 from __future__ import absolute_import
 
-from django.utils.datastructures import SortedDict
+import collections
 
 from horizon.utils.memoized import memoized  # noqa
 
@@ -84,26 +84,41 @@ def vpnservice_list(request, **kwargs):
 
 def _vpnservice_list(request, expand_subnet=False, expand_router=False,
                      expand_conns=False, **kwargs):
-    vpnservices = neutronclient(request).list_vpnservices(
-        **kwargs).get('vpnservices')
+    graph = neutron.get_resource_graph(request)
+    # The listed services are shared through the graph, so they are
+    # expanded on copies.
+    vpnservices = [dict(s._apidict)
+                   for s in graph.list('vpnservices', **kwargs)]
     if expand_subnet:
-        subnets = neutron.subnet_list(request)
-        subnet_dict = SortedDict((s.id, s) for s in subnets)
         for s in vpnservices:
-            s['subnet_name'] = subnet_dict.get(s['subnet_id']).cidr
+            s['subnet_name'] = graph.get('subnets', s['subnet_id']).cidr
     if expand_router:
-        routers = neutron.router_list(request)
-        router_dict = SortedDict((r.id, r) for r in routers)
         for s in vpnservices:
-            s['router_name'] = router_dict.get(s['router_id']).name_or_id
+            s['router_name'] = graph.get('routers',
+                                         s['router_id']).name_or_id
     if expand_conns:
-        ipsecsiteconns = _ipsecsiteconnection_list(request, **kwargs)
+        conn_ids = _get_conn_ids(graph, 'vpnservice_id', **kwargs)
         for s in vpnservices:
-            s['ipsecsiteconns'] = [c.id for c in ipsecsiteconns
-                                   if c.vpnservice_id == s['id']]
+            s['ipsecsiteconns'] = conn_ids.get(s['id'], [])
     return [VPNService(v) for v in vpnservices]
 
 
+def _list_vpnservices(request, **kwargs):
+    vpnservices = neutronclient(request).list_vpnservices(
+        **kwargs).get('vpnservices')
+    return [VPNService(v) for v in vpnservices]
+
+
+def _get_conn_ids(graph, attr, **kwargs):
+    """Returns the ids of the IPSec site connections listed with
+    ``kwargs``, grouped by the value of their ``attr`` attribute.
+    """
+    conn_ids = collections.defaultdict(list)
+    for c in graph.list('ipsecsiteconnections', **kwargs):
+        conn_ids[getattr(c, attr)].append(c.id)
+    return conn_ids
+
+
 def vpnservice_get(request, vpnservice_id):
     return _vpnservice_get(request, vpnservice_id, expand_subnet=True,
                            expand_router=True, expand_conns=True)
@@ -169,13 +184,19 @@ def ikepolicy_list(request, **kwargs):
 
 
 def _ikepolicy_list(request, expand_conns=False, **kwargs):
-    ikepolicies = neutronclient(request).list_ikepolicies(
-        **kwargs).get('ikepolicies')
+    graph = neutron.get_resource_graph(request)
+    ikepolicies = [dict(p._apidict)
+                   for p in graph.list('ikepolicies', **kwargs)]
     if expand_conns:
-        ipsecsiteconns = _ipsecsiteconnection_list(request, **kwargs)
+        conn_ids = _get_conn_ids(graph, 'ikepolicy_id', **kwargs)
         for p in ikepolicies:
-            p['ipsecsiteconns'] = [c.id for c in ipsecsiteconns
-                                   if c.ikepolicy_id == p['id']]
+            p['ipsecsiteconns'] = conn_ids.get(p['id'], [])
+    return [IKEPolicy(v) for v in ikepolicies]
+
+
+def _list_ikepolicies(request, **kwargs):
+    ikepolicies = neutronclient(request).list_ikepolicies(
+        **kwargs).get('ikepolicies')
     return [IKEPolicy(v) for v in ikepolicies]
 
 
@@ -236,13 +257,19 @@ def ipsecpolicy_list(request, **kwargs):
 
 
 def _ipsecpolicy_list(request, expand_conns=False, **kwargs):
-    ipsecpolicies = neutronclient(request).list_ipsecpolicies(
-        **kwargs).get('ipsecpolicies')
+    graph = neutron.get_resource_graph(request)
+    ipsecpolicies = [dict(p._apidict)
+                     for p in graph.list('ipsecpolicies', **kwargs)]
     if expand_conns:
-        ipsecsiteconns = _ipsecsiteconnection_list(request, **kwargs)
+        conn_ids = _get_conn_ids(graph, 'ipsecpolicy_id', **kwargs)
         for p in ipsecpolicies:
-            p['ipsecsiteconns'] = [c.id for c in ipsecsiteconns
-                                   if c.ipsecpolicy_id == p['id']]
+            p['ipsecsiteconns'] = conn_ids.get(p['id'], [])
+    return [IPSecPolicy(v) for v in ipsecpolicies]
+
+
+def _list_ipsecpolicies(request, **kwargs):
+    ipsecpolicies = neutronclient(request).list_ipsecpolicies(
+        **kwargs).get('ipsecpolicies')
     return [IPSecPolicy(v) for v in ipsecpolicies]
 
 
@@ -316,32 +343,41 @@ def ipsecsiteconnection_list(request, **kwargs):
                                      expand_vpnservices=True, **kwargs)
 
 
-@memoized
 def _ipsecsiteconnection_list(request, expand_ikepolicies=False,
                               expand_ipsecpolicies=False,
                               expand_vpnservices=False, **kwargs):
-    ipsecsiteconnections = neutronclient(request).list_ipsec_site_connections(
-        **kwargs).get('ipsec_site_connections')
+    graph = neutron.get_resource_graph(request)
+    ipsecsiteconnections = [
+        dict(c._apidict)
+        for c in graph.list('ipsecsiteconnections', **kwargs)]
     if expand_ikepolicies:
-        ikepolicies = _ikepolicy_list(request, **kwargs)
-        policy_dict = SortedDict((p.id, p) for p in ikepolicies)
         for c in ipsecsiteconnections:
-            c['ikepolicy_name'] = policy_dict.get(c['ikepolicy_id']).name_or_id
+            c['ikepolicy_name'] = graph.get(
+                'ikepolicies', c['ikepolicy_id'], **kwargs).name_or_id
     if expand_ipsecpolicies:
-        ipsecpolicies = _ipsecpolicy_list(request, **kwargs)
-        policy_dict = SortedDict((p.id, p) for p in ipsecpolicies)
         for c in ipsecsiteconnections:
-            c['ipsecpolicy_name'] = policy_dict.get(c['ipsecpolicy_id']
-                                                    ).name_or_id
+            c['ipsecpolicy_name'] = graph.get(
+                'ipsecpolicies', c['ipsecpolicy_id'], **kwargs).name_or_id
     if expand_vpnservices:
-        vpnservices = _vpnservice_list(request, **kwargs)
-        service_dict = SortedDict((s.id, s) for s in vpnservices)
         for c in ipsecsiteconnections:
-            c['vpnservice_name'] = service_dict.get(c['vpnservice_id']
-                                                    ).name_or_id
+            c['vpnservice_name'] = graph.get(
+                'vpnservices', c['vpnservice_id'], **kwargs).name_or_id
+    return [IPSecSiteConnection(v) for v in ipsecsiteconnections]
+
+
+def _list_ipsecsiteconnections(request, **kwargs):
+    ipsecsiteconnections = neutronclient(request).list_ipsec_site_connections(
+        **kwargs).get('ipsec_site_connections')
     return [IPSecSiteConnection(v) for v in ipsecsiteconnections]
 
 
+neutron.register_graph_collection('vpnservices', _list_vpnservices)
+neutron.register_graph_collection('ikepolicies', _list_ikepolicies)
+neutron.register_graph_collection('ipsecpolicies', _list_ipsecpolicies)
+neutron.register_graph_collection('ipsecsiteconnections',
+                                  _list_ipsecsiteconnections)
+
+
 def ipsecsiteconnection_get(request, ipsecsiteconnection_id):
     return _ipsecsiteconnection_get(request, ipsecsiteconnection_id,
                                     expand_ikepolicies=True,
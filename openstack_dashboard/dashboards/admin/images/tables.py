@@ -75,6 +75,10 @@ class AdminImagesTable(project_tables.ImagesTable):
         row_class = UpdateRow
         status_columns = ["status"]
         verbose_name = _("Images")
+        server_sort_fields = {"name": "name",
+                              "status": "status",
+                              "disk_format": "disk_format",
+                              "size": "size"}
         table_actions = (AdminCreateImage, AdminDeleteImage,
                          AdminImageFilterAction)
         row_actions = (AdminEditImage, UpdateMetadata, AdminDeleteImage)
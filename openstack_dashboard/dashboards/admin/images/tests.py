@@ -46,7 +46,9 @@ class ImagesViewTest(test.BaseAdminViewTests):
                                        marker=None,
                                        paginate=True,
                                        filters=filters,
-                                       sort_dir='desc') \
+                                       sort_key='created_at',
+                                       sort_dir='desc',
+                                       reversed_order=False) \
             .AndReturn([self.images.list(),
                         False, False])
         self.mox.ReplayAll()
@@ -66,25 +68,33 @@ class ImagesViewTest(test.BaseAdminViewTests):
                                        marker=None,
                                        paginate=True,
                                        filters=filters,
-                                       sort_dir='desc') \
+                                       sort_key='created_at',
+                                       sort_dir='desc',
+                                       reversed_order=False) \
             .AndReturn([images, True, True])
         api.glance.image_list_detailed(IsA(http.HttpRequest),
                                        marker=None,
                                        paginate=True,
                                        filters=filters,
-                                       sort_dir='desc') \
+                                       sort_key='created_at',
+                                       sort_dir='desc',
+                                       reversed_order=False) \
             .AndReturn([images[:2], True, True])
         api.glance.image_list_detailed(IsA(http.HttpRequest),
                                        marker=images[2].id,
                                        paginate=True,
                                        filters=filters,
-                                       sort_dir='desc') \
+                                       sort_key='created_at',
+                                       sort_dir='desc',
+                                       reversed_order=False) \
             .AndReturn([images[2:4], True, True])
         api.glance.image_list_detailed(IsA(http.HttpRequest),
                                        marker=images[4].id,
                                        paginate=True,
                                        filters=filters,
-                                       sort_dir='desc') \
+                                       sort_key='created_at',
+                                       sort_dir='desc',
+                                       reversed_order=False) \
             .AndReturn([images[4:], True, True])
         self.mox.ReplayAll()
 
@@ -116,6 +126,33 @@ class ImagesViewTest(test.BaseAdminViewTests):
         self.assertEqual(len(res.context['images_table'].data),
                          1)
 
+    @override_settings(API_RESULT_PAGE_SIZE=2)
+    @test.create_stubs({api.glance: ('image_list_detailed',)})
+    def test_images_list_get_sorted_prev_pagination(self):
+        images = self.images.list()[:2]
+        filters = {'is_public': None}
+        # The page before the marker is listed in the reverse order.
+        api.glance.image_list_detailed(IsA(http.HttpRequest),
+                                       marker=images[1].id,
+                                       paginate=True,
+                                       filters=filters,
+                                       sort_key='name',
+                                       sort_dir='desc',
+                                       reversed_order=True) \
+            .AndReturn([images[::-1], True, False])
+        self.mox.ReplayAll()
+
+        params = "&".join([
+            "=".join([tables.AdminImagesTable._meta.prev_pagination_param,
+                      images[1].id]),
+            "sort=name",
+            "sort_dir=asc"])
+        url = "?".join([reverse('horizon:admin:images:index'), params])
+        res = self.client.get(url)
+        self.assertEqual(res.context['images_table'].data, images)
+        self.assertContains(res, 'href="?sort=name&amp;sort_dir=desc"')
+        self.assertContains(res, 'sort=name&amp;sort_dir=asc">Next')
+
     @test.create_stubs({api.glance: ('image_get',
                                      'metadefs_namespace_list',
                                      'metadefs_namespace_get')})
@@ -183,25 +220,33 @@ class ImagesViewTest(test.BaseAdminViewTests):
                                        marker=None,
                                        paginate=True,
                                        filters=filters,
-                                       sort_dir='desc') \
+                                       sort_key='created_at',
+                                       sort_dir='desc',
+                                       reversed_order=False) \
             .AndReturn([images, True, False])
         api.glance.image_list_detailed(IsA(http.HttpRequest),
                                        marker=None,
                                        paginate=True,
                                        filters=filters,
-                                       sort_dir='desc') \
+                                       sort_key='created_at',
+                                       sort_dir='desc',
+                                       reversed_order=False) \
             .AndReturn([images[:2], True, True])
         api.glance.image_list_detailed(IsA(http.HttpRequest),
                                        marker=images[2].id,
                                        paginate=True,
                                        filters=filters,
-                                       sort_dir='desc') \
+                                       sort_key='created_at',
+                                       sort_dir='desc',
+                                       reversed_order=False) \
             .AndReturn([images[2:], True, True])
         api.glance.image_list_detailed(IsA(http.HttpRequest),
                                        marker=images[2].id,
                                        paginate=True,
                                        filters=filters,
-                                       sort_dir='asc') \
+                                       sort_key='created_at',
+                                       sort_dir='asc',
+                                       reversed_order=True) \
             .AndReturn([images[:2], True, True])
         self.mox.ReplayAll()
 
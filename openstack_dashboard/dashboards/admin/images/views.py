@@ -50,30 +50,30 @@ class IndexView(tables.DataTableView):
     def has_more_data(self, table):
         return self._more
 
-    def get_data(self):
+    def get_data(self, marker=None, prev_marker=None, sort_key=None,
+                 sort_dir=None):
         images = []
         filters = self.get_filters()
-        prev_marker = self.request.GET.get(
-            project_tables.AdminImagesTable._meta.prev_pagination_param, None)
-
-        if prev_marker is not None:
-            sort_dir = 'asc'
+        if sort_key is None:
+            sort_key, sort_dir = 'created_at', 'desc'
+        reversed_order = prev_marker is not None
+        if reversed_order:
+            # The previous page is listed backward, starting from the first
+            # image of the current one.
             marker = prev_marker
-        else:
-            sort_dir = 'desc'
-            marker = self.request.GET.get(
-                project_tables.AdminImagesTable._meta.pagination_param, None)
+            sort_dir = 'desc' if sort_dir == 'asc' else 'asc'
         try:
             images, self._more, self._prev = api.glance.image_list_detailed(
                 self.request,
                 marker=marker,
                 paginate=True,
                 filters=filters,
-                sort_dir=sort_dir)
+                sort_key=sort_key,
+                sort_dir=sort_dir,
+                reversed_order=reversed_order)
 
-            if prev_marker is not None:
-                images = sorted(images, key=lambda image:
-                                getattr(image, 'created_at'), reverse=True)
+            if reversed_order:
+                images.reverse()
 
         except Exception:
             self._prev = False
@@ -162,6 +162,11 @@ class AdminInstancesTable(tables.DataTable):
         name = "instances"
         verbose_name = _("Instances")
         status_columns = ["status", "task"]
+        server_sort_fields = {"host": "host",
+                              "name": "display_name",
+                              "status": "vm_state",
+                              "task": "task_state",
+                              "created": "created_at"}
         table_actions = (project_tables.TerminateInstance,
                          AdminInstanceFilterAction)
         row_class = AdminUpdateRow
@@ -178,3 +183,5 @@ class AdminInstancesTable(tables.DataTable):
                        project_tables.SoftRebootInstance,
                        project_tables.RebootInstance,
                        project_tables.TerminateInstance)
+        # The row actions only depend on the instance ids and states.
+        cache_row_actions = True
@@ -43,7 +43,8 @@ class InstanceViewTest(test.BaseAdminViewTests):
             AndReturn([tenants, False])
         search_opts = {'marker': None, 'paginate': True}
         api.nova.server_list(IsA(http.HttpRequest),
-                             all_tenants=True, search_opts=search_opts) \
+                             all_tenants=True, search_opts=search_opts,
+                             sort_key=None, sort_dir=None) \
             .AndReturn([servers, False])
         api.network.servers_update_addresses(IsA(http.HttpRequest), servers,
                                              all_tenants=True)
@@ -55,6 +56,35 @@ class InstanceViewTest(test.BaseAdminViewTests):
         instances = res.context['table'].data
         self.assertItemsEqual(instances, servers)
 
+    @test.create_stubs({api.nova: ('flavor_list', 'server_list',
+                                   'extension_supported',),
+                        api.keystone: ('tenant_list',),
+                        api.network: ('servers_update_addresses',)})
+    def test_index_sorted(self):
+        servers = self.servers.list()
+        flavors = self.flavors.list()
+        tenants = self.tenants.list()
+        api.nova.extension_supported('AdminActions', IsA(http.HttpRequest)) \
+            .MultipleTimes().AndReturn(True)
+        api.keystone.tenant_list(IsA(http.HttpRequest)).\
+            AndReturn([tenants, False])
+        search_opts = {'marker': servers[0].id, 'paginate': True}
+        api.nova.server_list(IsA(http.HttpRequest),
+                             all_tenants=True, search_opts=search_opts,
+                             sort_key='display_name', sort_dir='desc') \
+            .AndReturn([servers, True])
+        api.network.servers_update_addresses(IsA(http.HttpRequest), servers,
+                                             all_tenants=True)
+        api.nova.flavor_list(IsA(http.HttpRequest)).AndReturn(flavors)
+        self.mox.ReplayAll()
+
+        res = self.client.get(INDEX_URL, {'marker': servers[0].id,
+                                          'sort': 'name',
+                                          'sort_dir': 'desc'})
+        self.assertItemsEqual(res.context['table'].data, servers)
+        self.assertContains(res, 'marker=%s&amp;sort=name&amp;sort_dir=desc'
+                            % servers[-1].id)
+
     @test.create_stubs({api.nova: ('flavor_list', 'flavor_get',
                                    'server_list', 'extension_supported',),
                         api.keystone: ('tenant_list',),
@@ -67,7 +97,8 @@ class InstanceViewTest(test.BaseAdminViewTests):
 
         search_opts = {'marker': None, 'paginate': True}
         api.nova.server_list(IsA(http.HttpRequest),
-                             all_tenants=True, search_opts=search_opts) \
+                             all_tenants=True, search_opts=search_opts,
+                             sort_key=None, sort_dir=None) \
             .AndReturn([servers, False])
         api.network.servers_update_addresses(IsA(http.HttpRequest), servers,
                                              all_tenants=True)
@@ -77,9 +108,11 @@ class InstanceViewTest(test.BaseAdminViewTests):
             AndRaise(self.exceptions.nova)
         api.keystone.tenant_list(IsA(http.HttpRequest)).\
             AndReturn([tenants, False])
-        for server in servers:
-            api.nova.flavor_get(IsA(http.HttpRequest), server.flavor["id"]). \
-                AndReturn(full_flavors[server.flavor["id"]])
+        # Each missing flavor is only fetched once.
+        flavor_ids = SortedDict([(s.flavor["id"], None) for s in servers])
+        for flavor_id in flavor_ids:
+            api.nova.flavor_get(IsA(http.HttpRequest), flavor_id). \
+                AndReturn(full_flavors[flavor_id])
 
         self.mox.ReplayAll()
 
@@ -103,7 +136,8 @@ class InstanceViewTest(test.BaseAdminViewTests):
 
         search_opts = {'marker': None, 'paginate': True}
         api.nova.server_list(IsA(http.HttpRequest),
-                             all_tenants=True, search_opts=search_opts) \
+                             all_tenants=True, search_opts=search_opts,
+                             sort_key=None, sort_dir=None) \
             .AndReturn([servers, False])
         api.network.servers_update_addresses(IsA(http.HttpRequest), servers,
                                              all_tenants=True)
@@ -131,7 +165,8 @@ class InstanceViewTest(test.BaseAdminViewTests):
     def test_index_server_list_exception(self):
         search_opts = {'marker': None, 'paginate': True}
         api.nova.server_list(IsA(http.HttpRequest),
-                             all_tenants=True, search_opts=search_opts) \
+                             all_tenants=True, search_opts=search_opts,
+                             sort_key=None, sort_dir=None) \
             .AndRaise(self.exceptions.nova)
 
         self.mox.ReplayAll()
@@ -185,7 +220,8 @@ class InstanceViewTest(test.BaseAdminViewTests):
             AndReturn([self.tenants.list(), False])
         search_opts = {'marker': None, 'paginate': True}
         api.nova.server_list(IsA(http.HttpRequest),
-                             all_tenants=True, search_opts=search_opts) \
+                             all_tenants=True, search_opts=search_opts,
+                             sort_key=None, sort_dir=None) \
             .AndReturn([servers, False])
         api.network.servers_update_addresses(IsA(http.HttpRequest), servers,
                                              all_tenants=True)
@@ -216,7 +252,8 @@ class InstanceViewTest(test.BaseAdminViewTests):
         api.nova.extension_supported('AdminActions', IsA(http.HttpRequest)) \
             .MultipleTimes().AndReturn(True)
         api.nova.server_list(IsA(http.HttpRequest),
-                             all_tenants=True, search_opts=search_opts) \
+                             all_tenants=True, search_opts=search_opts,
+                             sort_key=None, sort_dir=None) \
             .AndReturn([servers, False])
         api.network.servers_update_addresses(IsA(http.HttpRequest), servers,
                                              all_tenants=True)
@@ -24,6 +24,7 @@ from django.utils.translation import ugettext_lazy as _
 
 from horizon import exceptions
 from horizon import forms
+from horizon import messages
 from horizon import tables
 from horizon.utils import memoized
 
@@ -65,14 +66,16 @@ class AdminIndexView(tables.DataTableView):
     table_class = project_tables.AdminInstancesTable
     template_name = 'admin/instances/index.html'
     page_title = _("Instances")
+    streaming_threshold = 100
 
     def has_more_data(self, table):
         return self._more
 
-    def get_data(self):
+    def get_data(self, marker=None, prev_marker=None, sort_key=None,
+                 sort_dir=None):
+        # Nova can only page forward, prev_marker is never set since
+        # has_prev_data is always False.
         instances = []
-        marker = self.request.GET.get(
-            project_tables.AdminInstancesTable._meta.pagination_param, None)
         search_opts = self.get_filters({'marker': marker, 'paginate': True})
         # Gather our tenants to correlate against IDs
         try:
@@ -96,7 +99,9 @@ class AdminIndexView(tables.DataTableView):
             instances, self._more = api.nova.server_list(
                 self.request,
                 search_opts=search_opts,
-                all_tenants=True)
+                all_tenants=True,
+                sort_key=sort_key,
+                sort_dir=sort_dir)
         except Exception:
             self._more = False
             exceptions.handle(self.request,
@@ -118,24 +123,26 @@ class AdminIndexView(tables.DataTableView):
                 # If fails to retrieve flavor list, creates an empty list.
                 flavors = []
 
-            full_flavors = SortedDict([(f.id, f) for f in flavors])
+            # The flavors which cannot be retrieved are left out.
+            full_flavors = api.nova.flavor_get_by_ids(
+                self.request,
+                [inst.flavor["id"] for inst in instances],
+                flavors)
             tenant_dict = SortedDict([(t.id, t) for t in tenants])
+            missing_flavors = False
             # Loop through instances to get flavor and tenant info.
             for inst in instances:
                 flavor_id = inst.flavor["id"]
-                try:
-                    if flavor_id in full_flavors:
-                        inst.full_flavor = full_flavors[flavor_id]
-                    else:
-                        # If the flavor_id is not in full_flavors list,
-                        # gets it via nova api.
-                        inst.full_flavor = api.nova.flavor_get(
-                            self.request, flavor_id)
-                except Exception:
-                    msg = _('Unable to retrieve instance size information.')
-                    exceptions.handle(self.request, msg)
+                if flavor_id in full_flavors:
+                    inst.full_flavor = full_flavors[flavor_id]
+                else:
+                    missing_flavors = True
                 tenant = tenant_dict.get(inst.tenant_id, None)
                 inst.tenant_name = getattr(tenant, "name", None)
+            if missing_flavors:
+                messages.error(self.request,
+                               _('Unable to retrieve instance size '
+                                 'information.'))
         return instances
 
     def get_filters(self, filters):
@@ -58,18 +58,6 @@ class UsageReportTab(tabs.TableTab):
     table_classes = (metering_tables.ReportTable,)
 
     def get_report_table_data(self):
-        meters = ceilometer.Meters(self.request)
-        services = {
-            _('Nova'): meters.list_nova(),
-            _('Neutron'): meters.list_neutron(),
-            _('Glance'): meters.list_glance(),
-            _('Cinder'): meters.list_cinder(),
-            _('Swift_meters'): meters.list_swift(),
-            _('Kwapi'): meters.list_kwapi(),
-            _('IPMI'): meters.list_ipmi(),
-        }
-        report_rows = []
-
         date_options = self.request.session.get('period', 7)
         date_from = self.request.session.get('date_from', '')
         date_to = self.request.session.get('date_to', '')
@@ -81,35 +69,12 @@ class UsageReportTab(tabs.TableTab):
         except Exception:
             exceptions.handle(self.request, _('Dates cannot be recognized.'))
         try:
-            project_aggregates = metering.ProjectAggregatesQuery(self.request,
-                                                                 date_from,
-                                                                 date_to,
-                                                                 3600 * 24)
+            report = metering.UsageReport(self.request, date_from, date_to)
         except Exception:
             exceptions.handle(self.request,
                               _('Unable to retrieve project list.'))
-        for meter in meters._cached_meters.values():
-            service = None
-            for name, m_list in services.items():
-                if meter in m_list:
-                    service = name
-                    break
-            res, unit = project_aggregates.query(meter.name)
-
-            for re in res:
-                values = re.get_meter(meter.name.replace(".", "_"))
-                if values:
-                    for value in values:
-                        row = {"name": 'none',
-                               "project": re.id,
-                               "meter": meter.name,
-                               "description": meter.description,
-                               "service": service,
-                               "time": value._apiresource.period_end,
-                               "value": value._apiresource.avg,
-                               "unit": meter.unit}
-                        report_rows.append(row)
-        return report_rows
+            return []
+        return list(report.rows())
 
 
 class CeilometerOverviewTabs(tabs.TabGroup):
@@ -9,21 +9,32 @@
 # WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 # License for the specific language governing permissions and limitations
 # under the License.
+import calendar
+import datetime
 import json
+import time
 
+from ceilometerclient.v2 import statistics as ceilometer_statistics
 from django.core.urlresolvers import reverse
 from django import http
+from django.test.utils import override_settings
 
+from mox import Func  # noqa
 from mox import IsA  # noqa
+import pytz
 
 from openstack_dashboard import api
+from openstack_dashboard.api import cache
+from openstack_dashboard.dashboards.admin.metering import views
 from openstack_dashboard.test import helpers as test
 from openstack_dashboard.test.test_data import utils as test_utils
+from openstack_dashboard.utils import metering
 
 
 INDEX_URL = reverse('horizon:admin:metering:index')
 CREATE_URL = reverse('horizon:admin:metering:create')
 SAMPLES_URL = reverse('horizon:admin:metering:samples')
+REPORT_URL = reverse('horizon:admin:metering:csvreport')
 
 
 class MeteringViewTests(test.BaseAdminViewTests):
@@ -174,3 +185,273 @@ class MeteringLineChartTabTests(test.BaseAdminViewTests):
 
         self._verify_series(res._container[0], 9.0, '2012-12-21T11:00:55',
                             expected_names)
+
+
+class MeteringReportTests(test.BaseAdminViewTests):
+    def setUp(self):
+        super(MeteringReportTests, self).setUp()
+        self.testdata = test_utils.TestData()
+        test_utils.load_test_data(self.testdata)
+        cache._get_backend().clear()
+
+    def _get_report(self):
+        # The view is called directly since the test client replaces the
+        # context of the response, which the rows are streamed from.
+        request = self.factory.get(REPORT_URL, {'date_options': 'other',
+                                                'date_from': '2012-12-20',
+                                                'date_to': '2012-12-22'})
+        request.user = self.request.user
+        res = views.CsvReportView.as_view()(request)
+        self.assertTrue(res.streaming)
+        return b''.join(res.streaming_content).splitlines()
+
+    def _stub_lists(self, times=1):
+        meters = [api.ceilometer.Meter(meter)
+                  for meter in self.testdata.meters.list()]
+        for i in range(times):
+            api.ceilometer.meter_list(IsA(http.HttpRequest))\
+                .AndReturn(meters)
+            api.keystone.tenant_list(IsA(http.HttpRequest),
+                                     domain=None,
+                                     paginate=False) \
+                .AndReturn([self.testdata.tenants.list(), False])
+
+    def _stub_statistics(self):
+        # One call per project and meter, from the first day of the report.
+        statistics = [api.ceilometer.Statistic(statistic)
+                      for statistic in self.testdata.statistics.list()]
+        for tenant in self.testdata.tenants.list():
+            for meter in ('instance', 'disk.read.bytes', 'disk.write.bytes'):
+                api.ceilometer.statistic_list(IsA(http.HttpRequest),
+                                              meter,
+                                              period=3600 * 24,
+                                              query=IsA(list)) \
+                    .InAnyOrder().AndReturn(statistics)
+
+    @test.create_stubs({api.keystone: ('tenant_list',),
+                        api.ceilometer: ('meter_list',
+                                         'statistic_list',
+                                         ), })
+    def test_csv_report(self):
+        self._stub_lists()
+        self._stub_statistics()
+        self.mox.ReplayAll()
+
+        lines = self._get_report()
+        self.assertEqual(1 + 3 * len(self.testdata.tenants.list()),
+                         len(lines))
+        # Projects are reported by name, as they were before the report
+        # was streamed.
+        self.assertTrue(lines[1].startswith('test_tenant,instance,'))
+        self.assertTrue(lines[1].endswith(
+            ',2012-12-21T11:00:55.000000,4.55,instance'))
+
+    @override_settings(OPENSTACK_API_CACHE={'enabled': True})
+    @test.create_stubs({api.keystone: ('tenant_list',),
+                        api.ceilometer: ('meter_list',
+                                         'statistic_list',
+                                         ), })
+    def test_csv_report_past_days_cached(self):
+        # The statistics are only fetched for the first report, since all
+        # its days are over.
+        self._stub_lists(times=2)
+        self._stub_statistics()
+        self.mox.ReplayAll()
+
+        lines = self._get_report()
+        self.assertEqual(lines, self._get_report())
+
+
+class MeteringResourceNamesTests(test.BaseAdminViewTests):
+    def setUp(self):
+        super(MeteringResourceNamesTests, self).setUp()
+        cache._get_backend().clear()
+
+    @test.create_stubs({api.nova: ('server_list',)})
+    def test_resource_names_listed_once(self):
+        servers = self.servers.list()
+        api.nova.server_list(IsA(http.HttpRequest), all_tenants=True) \
+            .AndReturn([servers, False])
+        self.mox.ReplayAll()
+
+        names = metering.get_resource_names(
+            self.request, [servers[0].id, servers[1].id, 'deleted'],
+            'cpu_util')
+        self.assertEqual({servers[0].id: servers[0].name,
+                          servers[1].id: servers[1].name,
+                          'deleted': 'deleted'}, names)
+
+    @override_settings(OPENSTACK_API_CACHE={'enabled': True})
+    @test.create_stubs({api.nova: ('server_list',)})
+    def test_resource_names_cached(self):
+        servers = self.servers.list()
+        api.nova.server_list(IsA(http.HttpRequest), all_tenants=True) \
+            .AndReturn([servers, False])
+        self.mox.ReplayAll()
+
+        ids = [servers[0].id, servers[1].id]
+        names = metering.get_resource_names(self.request, ids, 'instance')
+        self.assertEqual(names, metering.get_resource_names(self.request, ids,
+                                                            'instance'))
+
+    @override_settings(OPENSTACK_API_CACHE={'enabled': True})
+    @test.create_stubs({api.nova: ('server_list',)})
+    def test_resource_names_unlisted_not_cached(self):
+        # The resources named after their id are listed again next time.
+        servers = self.servers.list()
+        api.nova.server_list(IsA(http.HttpRequest), all_tenants=True) \
+            .AndReturn([servers, False])
+        api.nova.server_list(IsA(http.HttpRequest), all_tenants=True) \
+            .AndReturn([servers, False])
+        self.mox.ReplayAll()
+
+        ids = [servers[0].id, 'deleted']
+        names = metering.get_resource_names(self.request, ids, 'instance')
+        self.assertEqual('deleted', names['deleted'])
+        self.assertEqual(names, metering.get_resource_names(self.request, ids,
+                                                            'instance'))
+
+    @test.create_stubs({api.glance: ('image_list_detailed',)})
+    def test_resource_names_private_images(self):
+        images = self.images.list()
+        api.glance.image_list_detailed(IsA(http.HttpRequest),
+                                       filters={'is_public': None}) \
+            .AndReturn([images, False, False])
+        self.mox.ReplayAll()
+
+        names = metering.get_resource_names(self.request, [images[0].id],
+                                            'image')
+        self.assertEqual({images[0].id: images[0].name}, names)
+
+    @override_settings(API_RESULT_LIMIT=1)
+    @test.create_stubs({api.nova: ('server_list', 'server_get')})
+    def test_resource_names_truncated_listing(self):
+        servers = self.servers.list()
+        api.nova.server_list(IsA(http.HttpRequest), all_tenants=True) \
+            .AndReturn([servers[:1], False])
+        api.nova.server_get(IsA(http.HttpRequest), servers[1].id) \
+            .AndReturn(servers[1])
+        self.mox.ReplayAll()
+
+        names = metering.get_resource_names(
+            self.request, [servers[0].id, servers[1].id], 'cpu')
+        self.assertEqual({servers[0].id: servers[0].name,
+                          servers[1].id: servers[1].name}, names)
+
+    def test_resource_names_without_api(self):
+        self.assertEqual({'a': 'a'},
+                         metering.get_resource_names(self.request, ['a'],
+                                                     'memory'))
+
+
+class MeteringSeriesTests(test.BaseAdminViewTests):
+    def setUp(self):
+        super(MeteringSeriesTests, self).setUp()
+        cache._get_backend().clear()
+        self.resource = api.ceilometer.ResourceAggregate(
+            query=[{'field': 'project_id', 'op': 'eq', 'value': '1'}])
+
+    def _date(self, day, hour=0):
+        return datetime.datetime(2012, 12, day, hour, tzinfo=pytz.utc)
+
+    def _statistic(self, day, avg, count=1):
+        start = self._date(day).strftime("%Y-%m-%dT%H:%M:%S")
+        end = self._date(day, 12).strftime("%Y-%m-%dT%H:%M:%S")
+        return api.ceilometer.Statistic(ceilometer_statistics.Statistics(
+            ceilometer_statistics.StatisticsManager(None),
+            {'period_start': start, 'duration_end': end, 'avg': avg,
+             'max': avg, 'min': avg, 'sum': avg * count, 'count': count}))
+
+    def _stub_statistics(self, since, days):
+        def starts_at(query):
+            return {'field': 'timestamp', 'op': 'ge',
+                    'value': self._date(since)} in query
+        api.ceilometer.statistic_list(IsA(http.HttpRequest), 'memory',
+                                      period=metering.DAY,
+                                      query=Func(starts_at)) \
+            .AndReturn([self._statistic(day, day) for day in days])
+
+    def _update(self, date_from, date_to, max_points=400):
+        metering.update_with_series(self.request, [self.resource], 'memory',
+                                    date_from, date_to, metering.DAY,
+                                    max_points=max_points)
+        return [(bucket.period_start, bucket.avg)
+                for bucket in self.resource.get_meter('memory')]
+
+    @override_settings(OPENSTACK_API_CACHE={'enabled': True})
+    @test.create_stubs({api.ceilometer: ('statistic_list',)})
+    def test_only_missing_periods_fetched(self):
+        # Periods start at midnight, the days which are over are kept and
+        # only the following ones are fetched.
+        self._stub_statistics(18, [18, 19])
+        self._stub_statistics(20, [20, 21])
+        self.mox.ReplayAll()
+
+        self.assertEqual([('2012-12-18T00:00:00', 18),
+                          ('2012-12-19T00:00:00', 19)],
+                         self._update(self._date(18, 6), self._date(20)))
+        self.assertEqual([('2012-12-19T00:00:00', 19),
+                          ('2012-12-20T00:00:00', 20),
+                          ('2012-12-21T00:00:00', 21)],
+                         self._update(self._date(19), self._date(22)))
+        # Every day of the range is over and stored.
+        self.assertEqual(4, len(self._update(self._date(18),
+                                             self._date(22))))
+
+    @override_settings(OPENSTACK_API_CACHE={'enabled': True})
+    @test.create_stubs({api.ceilometer: ('statistic_list',)})
+    def test_earlier_range_fetched_again(self):
+        self._stub_statistics(20, [20])
+        self._stub_statistics(18, [18, 19, 20])
+        self.mox.ReplayAll()
+
+        self._update(self._date(20), self._date(21))
+        self.assertEqual(3, len(self._update(self._date(18),
+                                             self._date(21))))
+
+    @override_settings(OPENSTACK_API_CACHE={'enabled': True})
+    @test.create_stubs({api.ceilometer: ('statistic_list',)})
+    def test_shorter_range_read_from_cache(self):
+        self._stub_statistics(18, [18, 19, 20, 21])
+        self.mox.ReplayAll()
+
+        self._update(self._date(18), self._date(22))
+        self.assertEqual([('2012-12-19T00:00:00', 19)],
+                         self._update(self._date(19), self._date(20)))
+
+    @override_settings(OPENSTACK_API_CACHE={'enabled': True})
+    @test.create_stubs({api.ceilometer: ('statistic_list',)})
+    def test_recent_periods_fetched_again(self):
+        # The samples are taken to be stored an hour after the 20th began,
+        # so that only the days before it are kept.
+        self._stub_statistics(18, [18, 19, 20, 21])
+        self._stub_statistics(20, [20, 21])
+        self.mox.ReplayAll()
+
+        delay = int(time.time() - calendar.timegm(
+            self._date(20, 1).utctimetuple()))
+        with self.settings(CEILOMETER_SAMPLES_DELAY=delay):
+            self.assertEqual(4, len(self._update(self._date(18),
+                                                 self._date(22))))
+            self.assertEqual(4, len(self._update(self._date(18),
+                                                 self._date(22))))
+
+    @test.create_stubs({api.ceilometer: ('statistic_list',)})
+    def test_long_range_downsampled(self):
+        self._stub_statistics(1, range(1, 11))
+        self.mox.ReplayAll()
+
+        self.assertEqual([('2012-12-01T00:00:00', 2),
+                          ('2012-12-04T00:00:00', 5),
+                          ('2012-12-07T00:00:00', 8),
+                          ('2012-12-10T00:00:00', 10)],
+                         self._update(self._date(1), self._date(11),
+                                      max_points=4))
+
+    def test_merge_buckets(self):
+        buckets = [metering.Bucket(0, 10, 2.0, 3.0, 1.0, 4.0, 2),
+                   metering.Bucket(10, 20, 5.0, 8.0, 2.0, 5.0, 1)]
+        bucket = metering.Bucket.merge(buckets)
+        self.assertEqual((0, 20, 3.0, 8.0, 1.0, 9.0, 3),
+                         (bucket.start, bucket.end, bucket.avg, bucket.max,
+                          bucket.min, bucket.sum, bucket.count))
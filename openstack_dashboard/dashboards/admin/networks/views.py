@@ -101,6 +101,7 @@ class DetailView(tables.MultiTableView):
                      ports_tables.PortsTable,
                      agents_tables.DHCPAgentsTable)
     template_name = 'project/networks/detail.html'
+    concurrent = True
 
     def get_subnets_data(self):
         try:
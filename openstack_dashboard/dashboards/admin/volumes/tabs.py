@@ -37,8 +37,48 @@ class VolumeTab(tabs.TableTab, volumes_tabs.VolumeTableMixIn):
     template_name = "admin/volumes/volumes/volumes_tables.html"
     preload = False
 
+    def __init__(self, *args, **kwargs):
+        super(VolumeTab, self).__init__(*args, **kwargs)
+        self._more = False
+        self._prev = False
+
+    def has_more_data(self, table):
+        return self._more
+
+    def has_prev_data(self, table):
+        return self._prev
+
+    def _get_volumes_page(self, table):
+        """Returns the page of volumes requested for the table, sorted by
+        the API.
+        """
+        marker = self.request.GET.get(table._meta.pagination_param)
+        prev_marker = self.request.GET.get(table._meta.prev_pagination_param)
+        sort_key = table.get_sort_key()
+        sort_dir = table.get_sort_dir()
+        if sort_key is None:
+            sort_key, sort_dir = 'created_at', 'desc'
+        reversed_order = prev_marker is not None
+        if reversed_order:
+            # The previous page is listed backward, starting from the first
+            # volume of the current one.
+            marker = prev_marker
+            sort_dir = 'desc' if sort_dir == 'asc' else 'asc'
+        try:
+            volumes, self._more, self._prev = cinder.volume_list_paged(
+                self.request, search_opts={'all_tenants': True},
+                marker=marker, paginate=True, sort_key=sort_key,
+                sort_dir=sort_dir, reversed_order=reversed_order)
+        except Exception:
+            exceptions.handle(self.request,
+                              _('Unable to retrieve volume list.'))
+            return []
+        if reversed_order:
+            volumes.reverse()
+        return volumes
+
     def get_volumes_data(self):
-        volumes = self._get_volumes(search_opts={'all_tenants': True})
+        volumes = self._get_volumes_page(self._tables['volumes'])
         instances = self._get_instances(search_opts={'all_tenants': True})
         volume_ids_with_snapshots = self._get_volumes_ids_with_snapshots(
             search_opts={'all_tenants': True})
@@ -161,3 +201,5 @@ class VolumesGroupTabs(tabs.TabGroup):
     slug = "volumes_group_tabs"
     tabs = (VolumeTab, VolumeTypesTab, SnapshotTab)
     sticky = True
+    lazy = True
+    concurrent = True
@@ -25,11 +25,16 @@ from openstack_dashboard.test import helpers as test
 
 class VolumeTests(test.BaseAdminViewTests):
     @test.create_stubs({api.nova: ('server_list',),
-                        cinder: ('volume_list',),
+                        cinder: ('volume_list_paged',
+                                 'volume_snapshot_list'),
                         keystone: ('tenant_list',)})
     def test_index(self):
-        cinder.volume_list(IsA(http.HttpRequest), search_opts={
-            'all_tenants': True}).AndReturn(self.cinder_volumes.list())
+        cinder.volume_list_paged(IsA(http.HttpRequest), search_opts={
+            'all_tenants': True}, marker=None, paginate=True,
+            sort_key='created_at', sort_dir='desc', reversed_order=False) \
+            .AndReturn([self.cinder_volumes.list(), False, False])
+        cinder.volume_snapshot_list(IsA(http.HttpRequest), search_opts={
+            'all_tenants': True}).AndReturn([])
         api.nova.server_list(IsA(http.HttpRequest), search_opts={
                              'all_tenants': True}) \
             .AndReturn([self.servers.list(), False])
@@ -43,6 +48,34 @@ class VolumeTests(test.BaseAdminViewTests):
         volumes = res.context['volumes_table'].data
         self.assertItemsEqual(volumes, self.cinder_volumes.list())
 
+    @test.create_stubs({api.nova: ('server_list',),
+                        cinder: ('volume_list_paged',
+                                 'volume_snapshot_list'),
+                        keystone: ('tenant_list',)})
+    def test_index_sorted_prev_page(self):
+        volumes = self.cinder_volumes.list()[:2]
+        # The page before the marker is listed in the reverse order.
+        cinder.volume_list_paged(IsA(http.HttpRequest), search_opts={
+            'all_tenants': True}, marker=volumes[1].id, paginate=True,
+            sort_key='size', sort_dir='desc', reversed_order=True) \
+            .AndReturn([volumes[::-1], True, False])
+        cinder.volume_snapshot_list(IsA(http.HttpRequest), search_opts={
+            'all_tenants': True}).AndReturn([])
+        api.nova.server_list(IsA(http.HttpRequest), search_opts={
+                             'all_tenants': True}) \
+            .AndReturn([self.servers.list(), False])
+        keystone.tenant_list(IsA(http.HttpRequest)) \
+            .AndReturn([self.tenants.list(), False])
+
+        self.mox.ReplayAll()
+        res = self.client.get(reverse('horizon:admin:volumes:index'),
+                              {'prev_volume_marker': volumes[1].id,
+                               'sort': 'size', 'sort_dir': 'asc'})
+
+        self.assertEqual(volumes, res.context['volumes_table'].data)
+        self.assertContains(res, 'href="?sort=size&amp;sort_dir=desc"')
+        self.assertContains(res, 'sort=size&amp;sort_dir=asc">Next')
+
     @test.create_stubs({cinder: ('volume_reset_state',
                                  'volume_get')})
     def test_update_volume_status(self):
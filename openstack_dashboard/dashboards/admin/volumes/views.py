@@ -27,3 +27,4 @@ class IndexView(tabs.TabbedTableView):
     tab_group_class = volumes_tabs.VolumesGroupTabs
     template_name = 'admin/volumes/index.html'
     page_title = _("Volumes")
+    streaming_threshold = 100
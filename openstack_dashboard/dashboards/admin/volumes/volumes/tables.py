@@ -86,6 +86,11 @@ class VolumesTable(volumes_tables.VolumesTable):
         verbose_name = _("Volumes")
         status_columns = ["status"]
         row_class = volumes_tables.UpdateRow
+        pagination_param = "volume_marker"
+        prev_pagination_param = "prev_volume_marker"
+        server_sort_fields = {"name": "name",
+                              "size": "size",
+                              "status": "status"}
         table_actions = (ManageVolumeAction,
                          volumes_tables.DeleteVolume,
                          VolumesFilterAction)
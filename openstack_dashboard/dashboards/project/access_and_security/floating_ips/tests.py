@@ -201,12 +201,10 @@ class FloatingIpViewTests(test.TestCase):
                         quotas: ('tenant_quota_usages',),
                         api.base: ('is_service_enabled',)})
     def test_allocate_button_disabled_when_quota_exceeded(self):
-        keypairs = self.keypairs.list()
         floating_ips = self.floating_ips.list()
         floating_pools = self.pools.list()
         quota_data = self.quota_usages.first()
         quota_data['floating_ips']['available'] = 0
-        sec_groups = self.security_groups.list()
 
         api.network.floating_ip_supported(
             IsA(http.HttpRequest)) \
@@ -214,15 +212,9 @@ class FloatingIpViewTests(test.TestCase):
         api.network.tenant_floating_ip_list(
             IsA(http.HttpRequest)) \
             .AndReturn(floating_ips)
-        api.network.security_group_list(
-            IsA(http.HttpRequest)).MultipleTimes()\
-            .AndReturn(sec_groups)
         api.network.floating_ip_pools_list(
             IsA(http.HttpRequest)) \
             .AndReturn(floating_pools)
-        api.nova.keypair_list(
-            IsA(http.HttpRequest)) \
-            .AndReturn(keypairs)
         api.nova.server_list(
             IsA(http.HttpRequest)) \
             .AndReturn([self.servers.list(), False])
@@ -234,10 +226,6 @@ class FloatingIpViewTests(test.TestCase):
             IsA(http.HttpRequest),
             'network').MultipleTimes() \
             .AndReturn(True)
-        api.base.is_service_enabled(
-            IsA(http.HttpRequest),
-            'ec2').MultipleTimes() \
-            .AndReturn(False)
 
         self.mox.ReplayAll()
 
@@ -277,9 +265,7 @@ class FloatingIpNeutronViewTests(FloatingIpViewTests):
                                       'tenant_floating_ip_list'),
                         api.neutron: ('is_extension_supported',
                                       'tenant_quota_get',
-                                      'network_list',
-                                      'router_list',
-                                      'subnet_list'),
+                                      'resource_count'),
                         api.base: ('is_service_enabled',)})
     @test.update_settings(OPENSTACK_NEUTRON_NETWORK={'enable_quotas': True})
     def test_correct_quotas_displayed(self):
@@ -304,12 +290,15 @@ class FloatingIpNeutronViewTests(FloatingIpViewTests):
             .AndReturn(True)
         api.neutron.tenant_quota_get(IsA(http.HttpRequest), self.tenant.id) \
             .AndReturn(self.neutron_quotas.first())
-        api.neutron.router_list(IsA(http.HttpRequest)) \
-            .AndReturn(self.routers.list())
-        api.neutron.subnet_list(IsA(http.HttpRequest)) \
-            .AndReturn(self.subnets.list())
-        api.neutron.network_list(IsA(http.HttpRequest), shared=False) \
-            .AndReturn(self.networks.list())
+        api.neutron.resource_count(IsA(http.HttpRequest), 'network',
+                                   shared=False, tenant_id=self.tenant.id) \
+            .AndReturn(len(self.networks.list()))
+        api.neutron.resource_count(IsA(http.HttpRequest), 'subnet',
+                                   tenant_id=self.tenant.id) \
+            .AndReturn(len(self.subnets.list()))
+        api.neutron.resource_count(IsA(http.HttpRequest), 'router',
+                                   tenant_id=self.tenant.id) \
+            .AndReturn(len(self.routers.list()))
         api.network.floating_ip_supported(IsA(http.HttpRequest)) \
             .AndReturn(True)
         api.network.tenant_floating_ip_list(IsA(http.HttpRequest)) \
@@ -143,3 +143,5 @@ class AccessAndSecurityTabs(tabs.TabGroup):
     slug = "access_security_tabs"
     tabs = (SecurityGroupsTab, KeypairsTab, FloatingIPsTab, APIAccessTab)
     sticky = True
+    lazy = True
+    concurrent = True
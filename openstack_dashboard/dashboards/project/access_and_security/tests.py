@@ -59,7 +59,7 @@ class AccessAndSecurityTests(test.TestCase):
             IsA(http.HttpRequest)) \
             .AndReturn(keypairs)
         api.network.floating_ip_supported(
-            IsA(http.HttpRequest)) \
+            IsA(http.HttpRequest)).MultipleTimes() \
             .AndReturn(True)
         api.network.tenant_floating_ip_list(
             IsA(http.HttpRequest)) \
@@ -85,11 +85,19 @@ class AccessAndSecurityTests(test.TestCase):
         res = self.client.get(INDEX_URL)
 
         self.assertTemplateUsed(res, 'project/access_and_security/index.html')
-        self.assertItemsEqual(res.context['keypairs_table'].data, keypairs)
         self.assertItemsEqual(res.context['security_groups_table'].data,
                               sec_groups)
+
+        # The other tabs are only loaded when they are shown.
+        res = self.client.get(INDEX_URL +
+                              "?tab=access_security_tabs__keypairs_tab")
+        self.assertItemsEqual(res.context['keypairs_table'].data, keypairs)
+        res = self.client.get(INDEX_URL +
+                              "?tab=access_security_tabs__floating_ips_tab")
         self.assertItemsEqual(res.context['floating_ips_table'].data,
                               floating_ips)
+        res = self.client.get(INDEX_URL +
+                              "?tab=access_security_tabs__api_access_tab")
         if ec2_enabled:
             self.assertTrue(any(map(
                 lambda x: isinstance(x, api_access.tables.DownloadEC2),
@@ -160,9 +168,6 @@ class SecurityGroupTabTests(test.TestCase):
                         api.base: ('is_service_enabled',)})
     def _test_create_button_disabled_when_quota_exceeded(self,
                                                          network_enabled):
-        keypairs = self.keypairs.list()
-        floating_ips = self.floating_ips.list()
-        floating_pools = self.pools.list()
         sec_groups = self.security_groups.list()
         quota_data = self.quota_usages.first()
         quota_data['security_groups']['available'] = 0
@@ -170,21 +175,9 @@ class SecurityGroupTabTests(test.TestCase):
         api.network.floating_ip_supported(
             IsA(http.HttpRequest)) \
             .AndReturn(True)
-        api.network.tenant_floating_ip_list(
-            IsA(http.HttpRequest)) \
-            .AndReturn(floating_ips)
-        api.network.floating_ip_pools_list(
-            IsA(http.HttpRequest)) \
-            .AndReturn(floating_pools)
         api.network.security_group_list(
             IsA(http.HttpRequest)) \
             .AndReturn(sec_groups)
-        api.nova.keypair_list(
-            IsA(http.HttpRequest)) \
-            .AndReturn(keypairs)
-        api.nova.server_list(
-            IsA(http.HttpRequest)) \
-            .AndReturn([self.servers.list(), False])
         quotas.tenant_quota_usages(
             IsA(http.HttpRequest)).MultipleTimes() \
             .AndReturn(quota_data)
@@ -192,9 +185,6 @@ class SecurityGroupTabTests(test.TestCase):
         api.base.is_service_enabled(
             IsA(http.HttpRequest), 'network').MultipleTimes() \
             .AndReturn(network_enabled)
-        api.base.is_service_enabled(
-            IsA(http.HttpRequest), 'ec2').MultipleTimes() \
-            .AndReturn(False)
 
         self.mox.ReplayAll()
 
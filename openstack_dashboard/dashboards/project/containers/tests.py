@@ -23,6 +23,7 @@ from django import http
 from django.utils import http as utils_http
 
 from mox import IsA  # noqa
+import swiftclient
 
 from openstack_dashboard import api
 from openstack_dashboard.dashboards.project.containers import forms
@@ -339,17 +340,22 @@ class SwiftTests(test.TestCase):
                 self.mox.ResetAll()  # mandatory in a for loop
                 api.swift.swift_get_object(IsA(http.HttpRequest),
                                            container.name,
-                                           obj.name).AndReturn(obj)
+                                           obj.name,
+                                           resp_chunk_size=512 * 1024,
+                                           extra_headers={}).AndReturn(obj)
                 self.mox.ReplayAll()
 
                 download_url = reverse(
                     'horizon:project:containers:object_download',
                     args=[container.name, obj.name])
                 res = self.client.get(download_url)
-                self.assertEqual(res.content, obj.data)
+                self.assertTrue(res.streaming)
+                content = b''.join(res.streaming_content)
+                self.assertEqual(content, obj.data)
+                self.assertEqual(str(obj.bytes), res['Content-Length'])
                 self.assertTrue(res.has_header('Content-Disposition'))
-                self.assertNotContains(res, INVALID_CONTAINER_NAME_1)
-                self.assertNotContains(res, INVALID_CONTAINER_NAME_2)
+                self.assertNotIn(INVALID_CONTAINER_NAME_1, content)
+                self.assertNotIn(INVALID_CONTAINER_NAME_2, content)
 
                 # Check that the returned Content-Disposition filename is well
                 # surrounded by double quotes and with commas removed
@@ -360,6 +366,144 @@ class SwiftTests(test.TestCase):
                     'attachment; filename=%s' % expected_name
                 )
 
+    @test.create_stubs({api.swift: ('swift_get_object',)})
+    def test_download_range(self):
+        container = self.containers.first()
+        obj = self.objects.first()
+        part = api.swift.StorageObject({'name': obj.name,
+                                        'bytes': '4',
+                                        'etag': 'object_hash',
+                                        'content_range': 'bytes 0-3/9'},
+                                       container.name,
+                                       data=iter(['Fake']))
+        api.swift.swift_get_object(IsA(http.HttpRequest),
+                                   container.name,
+                                   obj.name,
+                                   resp_chunk_size=512 * 1024,
+                                   extra_headers={'Range': 'bytes=0-3'}) \
+            .AndReturn(part)
+        self.mox.ReplayAll()
+
+        download_url = reverse('horizon:project:containers:object_download',
+                               args=[container.name, obj.name])
+        res = self.client.get(download_url, HTTP_RANGE='bytes=0-3')
+        self.assertEqual(206, res.status_code)
+        self.assertEqual('Fake', b''.join(res.streaming_content))
+        self.assertEqual('bytes 0-3/9', res['Content-Range'])
+        self.assertEqual('4', res['Content-Length'])
+        self.assertEqual('"object_hash"', res['ETag'])
+
+    @test.create_stubs({api.swift: ('swift_get_object',)})
+    def test_download_range_if_range_matching(self):
+        container = self.containers.first()
+        obj = self.objects.first()
+        part = api.swift.StorageObject({'name': obj.name,
+                                        'bytes': '4',
+                                        'etag': 'object_hash',
+                                        'content_range': 'bytes 0-3/9'},
+                                       container.name,
+                                       data=iter(['Fake']))
+        api.swift.swift_get_object(IsA(http.HttpRequest),
+                                   container.name,
+                                   obj.name,
+                                   resp_chunk_size=512 * 1024,
+                                   extra_headers={'Range': 'bytes=0-3'}) \
+            .AndReturn(part)
+        self.mox.ReplayAll()
+
+        download_url = reverse('horizon:project:containers:object_download',
+                               args=[container.name, obj.name])
+        res = self.client.get(download_url, HTTP_RANGE='bytes=0-3',
+                              HTTP_IF_RANGE='"object_hash"')
+        self.assertEqual(206, res.status_code)
+        self.assertEqual('Fake', b''.join(res.streaming_content))
+
+    @test.create_stubs({api.swift: ('swift_get_object',)})
+    def test_download_range_if_range_changed(self):
+        # The whole object is sent once it changed.
+        container = self.containers.first()
+        obj = self.objects.first()
+        part = api.swift.StorageObject({'name': obj.name,
+                                        'bytes': '4',
+                                        'etag': 'new_hash',
+                                        'content_range': 'bytes 0-3/9'},
+                                       container.name,
+                                       data=iter(['Fake']))
+        api.swift.swift_get_object(IsA(http.HttpRequest),
+                                   container.name,
+                                   obj.name,
+                                   resp_chunk_size=512 * 1024,
+                                   extra_headers={'Range': 'bytes=0-3'}) \
+            .AndReturn(part)
+        api.swift.swift_get_object(IsA(http.HttpRequest),
+                                   container.name,
+                                   obj.name,
+                                   resp_chunk_size=512 * 1024,
+                                   extra_headers={}).AndReturn(obj)
+        self.mox.ReplayAll()
+
+        download_url = reverse('horizon:project:containers:object_download',
+                               args=[container.name, obj.name])
+        res = self.client.get(download_url, HTTP_RANGE='bytes=0-3',
+                              HTTP_IF_RANGE='"object_hash"')
+        self.assertEqual(200, res.status_code)
+        self.assertEqual(obj.data, b''.join(res.streaming_content))
+        self.assertFalse(res.has_header('Content-Range'))
+
+    @test.create_stubs({api.swift: ('swift_get_object',)})
+    def test_download_range_if_range_date_ignored(self):
+        container = self.containers.first()
+        obj = self.objects.first()
+        api.swift.swift_get_object(IsA(http.HttpRequest),
+                                   container.name,
+                                   obj.name,
+                                   resp_chunk_size=512 * 1024,
+                                   extra_headers={}).AndReturn(obj)
+        self.mox.ReplayAll()
+
+        download_url = reverse('horizon:project:containers:object_download',
+                               args=[container.name, obj.name])
+        res = self.client.get(download_url, HTTP_RANGE='bytes=0-3',
+                              HTTP_IF_RANGE='Wed, 21 Oct 2015 07:28:00 GMT')
+        self.assertEqual(200, res.status_code)
+        self.assertEqual(obj.data, b''.join(res.streaming_content))
+
+    @test.create_stubs({api.swift: ('swift_get_object',)})
+    def test_download_range_not_satisfiable(self):
+        container = self.containers.first()
+        obj = self.objects.first()
+        exc = swiftclient.ClientException('Range Not Satisfiable')
+        exc.http_status = 416
+        api.swift.swift_get_object(IsA(http.HttpRequest),
+                                   container.name,
+                                   obj.name,
+                                   resp_chunk_size=512 * 1024,
+                                   extra_headers={'Range': 'bytes=100-'}) \
+            .AndRaise(exc)
+        self.mox.ReplayAll()
+
+        download_url = reverse('horizon:project:containers:object_download',
+                               args=[container.name, obj.name])
+        res = self.client.get(download_url, HTTP_RANGE='bytes=100-')
+        self.assertEqual(416, res.status_code)
+
+    @test.create_stubs({api.swift: ('swift_get_object',)})
+    def test_download_multiple_ranges_ignored(self):
+        container = self.containers.first()
+        obj = self.objects.first()
+        api.swift.swift_get_object(IsA(http.HttpRequest),
+                                   container.name,
+                                   obj.name,
+                                   resp_chunk_size=512 * 1024,
+                                   extra_headers={}).AndReturn(obj)
+        self.mox.ReplayAll()
+
+        download_url = reverse('horizon:project:containers:object_download',
+                               args=[container.name, obj.name])
+        res = self.client.get(download_url, HTTP_RANGE='bytes=0-1,4-5')
+        self.assertEqual(200, res.status_code)
+        self.assertEqual(obj.data, b''.join(res.streaming_content))
+
     @test.create_stubs({api.swift: ('swift_get_containers',)})
     def test_copy_index(self):
         ret = (self.containers.list(), False)
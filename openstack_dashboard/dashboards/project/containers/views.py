@@ -21,11 +21,14 @@ Views for managing Swift containers.
 """
 
 import os
+import re
 
+from django.conf import settings
 from django import http
 from django.utils.functional import cached_property  # noqa
 from django.utils.translation import ugettext_lazy as _
 from django.views import generic
+import swiftclient
 
 from horizon import browsers
 from horizon import exceptions
@@ -191,9 +194,44 @@ class UploadView(forms.ModalFormView):
         return context
 
 
+# The single byte ranges which are passed on to Swift.
+BYTE_RANGE = re.compile(r'^bytes=(\d+-\d*|-\d+)$')
+
+
 def object_download(request, container_name, object_path):
+    headers = {}
+    byte_range = request.META.get('HTTP_RANGE', '').replace(' ', '')
+    if_range = request.META.get('HTTP_IF_RANGE')
+    # A range only applies if the part held by the client is still current,
+    # which is told by a strong entity tag: dates and weak entity tags are
+    # not compared, and the whole object is sent instead.
+    if BYTE_RANGE.match(byte_range) and (not if_range or
+                                         if_range.startswith('"')):
+        headers['Range'] = byte_range
+    chunk_size = getattr(settings, 'SWIFT_FILE_TRANSFER_CHUNK_SIZE',
+                         512 * 1024)
     try:
-        obj = api.swift.swift_get_object(request, container_name, object_path)
+        obj = api.swift.swift_get_object(request, container_name, object_path,
+                                         resp_chunk_size=chunk_size,
+                                         extra_headers=headers)
+        etag = '"%s"' % (obj.get('etag') or '').strip('"')
+        if obj.get('content_range') and if_range and if_range != etag:
+            # The object changed since the client got its part.
+            close = getattr(obj.data, 'close', None)
+            if close:
+                close()
+            headers = {}
+            obj = api.swift.swift_get_object(request, container_name,
+                                             object_path,
+                                             resp_chunk_size=chunk_size,
+                                             extra_headers=headers)
+    except swiftclient.ClientException as e:
+        if headers and e.http_status == 416:
+            return http.HttpResponse(status=416)
+        redirect = reverse("horizon:project:containers:index")
+        exceptions.handle(request,
+                          _("Unable to retrieve object."),
+                          redirect=redirect)
     except Exception:
         redirect = reverse("horizon:project:containers:index")
         exceptions.handle(request,
@@ -205,11 +243,19 @@ def object_download(request, container_name, object_path):
     if not os.path.splitext(obj.name)[1] and obj.orig_name:
         name, ext = os.path.splitext(obj.orig_name)
         filename = "%s%s" % (filename, ext)
-    response = http.HttpResponse()
+    # The content is read from Swift while it is sent.
+    response = http.StreamingHttpResponse(obj.data)
     safe_name = filename.replace(",", "").encode('utf-8')
     response['Content-Disposition'] = 'attachment; filename="%s"' % safe_name
     response['Content-Type'] = 'application/octet-stream'
-    response.write(obj.data)
+    response['Accept-Ranges'] = 'bytes'
+    if obj.get('bytes') is not None:
+        response['Content-Length'] = obj.bytes
+    if obj.get('etag'):
+        response['ETag'] = '"%s"' % obj.etag.strip('"')
+    if obj.get('content_range'):
+        response.status_code = 206
+        response['Content-Range'] = obj.content_range
     return response
 
 
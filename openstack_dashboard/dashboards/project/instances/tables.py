@@ -81,6 +81,7 @@ def is_deleting(instance):
 class TerminateInstance(policy.PolicyTargetMixin, tables.BatchAction):
     name = "terminate"
     classes = ("btn-danger",)
+    concurrent = True
     icon = "off"
     policy_rules = (("compute", "compute:delete"),)
 
@@ -111,6 +112,7 @@ class TerminateInstance(policy.PolicyTargetMixin, tables.BatchAction):
 class RebootInstance(policy.PolicyTargetMixin, tables.BatchAction):
     name = "reboot"
     classes = ('btn-danger', 'btn-reboot')
+    concurrent = True
     policy_rules = (("compute", "compute:reboot"),)
 
     @staticmethod
@@ -561,7 +563,14 @@ class SimpleAssociateIP(policy.PolicyTargetMixin, tables.Action):
             # target_id is port_id for Neutron and instance_id for Nova Network
             # (Neutron API wrapper returns a 'portid_fixedip' string)
             target_id = api.network.floating_ip_target_get_by_instance(
-                request, instance_id).split('_')[0]
+                request, instance_id)
+            if target_id is None:
+                messages.error(request,
+                               _("Unable to associate floating IP: the "
+                                 "instance has no port to associate it "
+                                 "with."))
+                return shortcuts.redirect(request.get_full_path())
+            target_id = target_id.split('_')[0]
 
             fip = api.network.tenant_floating_ip_allocate(request)
             api.network.floating_ip_associate(request, fip.id, target_id)
@@ -1031,3 +1040,5 @@ class InstancesTable(tables.DataTable):
                        ResizeLink, LockInstance, UnlockInstance,
                        SoftRebootInstance, RebootInstance,
                        StopInstance, RebuildInstance, TerminateInstance)
+        # The row actions only depend on the instance ids and states.
+        cache_row_actions = True
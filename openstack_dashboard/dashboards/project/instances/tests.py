@@ -103,11 +103,17 @@ class InstanceTests(helpers.TestCase):
         self.assertNotContains(res, "Launch Instance (Quota exceeded)")
 
     @helpers.create_stubs({api.nova: ('server_list',
-                                      'tenant_absolute_limits',)})
+                                      'flavor_list',
+                                      'tenant_absolute_limits',),
+                           api.glance: ('image_list_detailed',)})
     def test_index_server_list_exception(self):
         search_opts = {'marker': None, 'paginate': True}
         api.nova.server_list(IsA(http.HttpRequest), search_opts=search_opts) \
             .AndRaise(self.exceptions.nova)
+        api.nova.flavor_list(IsA(http.HttpRequest)) \
+            .AndReturn(self.flavors.list())
+        api.glance.image_list_detailed(IgnoreArg()) \
+            .AndReturn((self.images.list(), False, False))
         api.nova.tenant_absolute_limits(IsA(http.HttpRequest), reserved=True) \
            .MultipleTimes().AndReturn(self.limits['absolute'])
 
@@ -142,9 +148,11 @@ class InstanceTests(helpers.TestCase):
             .AndRaise(self.exceptions.nova)
         api.glance.image_list_detailed(IgnoreArg()) \
             .AndReturn((self.images.list(), False, False))
-        for server in servers:
-            api.nova.flavor_get(IsA(http.HttpRequest), server.flavor["id"]). \
-                AndReturn(full_flavors[server.flavor["id"]])
+        # Each missing flavor is only fetched once.
+        flavor_ids = SortedDict([(s.flavor["id"], None) for s in servers])
+        for flavor_id in flavor_ids:
+            api.nova.flavor_get(IsA(http.HttpRequest), flavor_id). \
+                AndReturn(full_flavors[flavor_id])
         api.nova.tenant_absolute_limits(IsA(http.HttpRequest), reserved=True) \
            .MultipleTimes().AndReturn(self.limits['absolute'])
         api.network.floating_ip_supported(IsA(http.HttpRequest)) \
@@ -3576,6 +3584,34 @@ class InstanceTests(helpers.TestCase):
 
         self.assertRedirectsNoFollow(res, INDEX_URL)
 
+    @helpers.create_stubs({api.network: ('floating_ip_target_get_by_instance',
+                                         'servers_update_addresses',),
+                           api.glance: ('image_list_detailed',),
+                           api.nova: ('server_list',
+                                      'flavor_list')})
+    def test_associate_floating_ip_without_port(self):
+        servers = self.servers.list()
+        server = servers[0]
+
+        search_opts = {'marker': None, 'paginate': True}
+        api.nova.server_list(IsA(http.HttpRequest), search_opts=search_opts) \
+            .AndReturn([servers, False])
+        api.network.servers_update_addresses(IsA(http.HttpRequest), servers)
+        api.nova.flavor_list(IgnoreArg()).AndReturn(self.flavors.list())
+        api.glance.image_list_detailed(IgnoreArg()) \
+            .AndReturn((self.images.list(), False, False))
+        api.network.floating_ip_target_get_by_instance(
+            IsA(http.HttpRequest),
+            server.id).AndReturn(None)
+
+        self.mox.ReplayAll()
+
+        formData = {'action': 'instances__associate-simple__%s' % server.id}
+        res = self.client.post(INDEX_URL, formData)
+
+        self.assertRedirectsNoFollow(res, INDEX_URL)
+        self.assertMessageCount(error=1)
+
     @helpers.create_stubs({api.network: ('floating_ip_target_list_by_instance',
                                          'tenant_floating_ip_list',
                                          'floating_ip_disassociate',
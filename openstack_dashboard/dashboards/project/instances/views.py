@@ -32,6 +32,7 @@ from horizon import messages
 from horizon import tables
 from horizon import tabs
 from horizon.utils import memoized
+from horizon.utils import parallel
 from horizon import workflows
 
 from openstack_dashboard import api
@@ -56,11 +57,7 @@ class IndexView(tables.DataTableView):
     def has_more_data(self, table):
         return self._more
 
-    def get_data(self):
-        marker = self.request.GET.get(
-            project_tables.InstancesTable._meta.pagination_param, None)
-        search_opts = self.get_filters({'marker': marker, 'paginate': True})
-        # Gather our instances
+    def _get_instances(self, search_opts):
         try:
             instances, self._more = api.nova.server_list(
                 self.request,
@@ -79,28 +76,47 @@ class IndexView(tables.DataTableView):
                     self.request,
                     message=_('Unable to retrieve IP addresses from Neutron.'),
                     ignore=True)
+        return instances
 
-            # Gather our flavors and images and correlate our instances to them
-            try:
-                flavors = api.nova.flavor_list(self.request)
-            except Exception:
-                flavors = []
-                exceptions.handle(self.request, ignore=True)
+    def _get_flavors(self):
+        try:
+            return api.nova.flavor_list(self.request)
+        except Exception:
+            exceptions.handle(self.request, ignore=True)
+            return []
 
-            try:
-                # TODO(gabriel): Handle pagination.
-                images, more, prev = api.glance.image_list_detailed(
-                    self.request)
-            except Exception:
-                images = []
-                exceptions.handle(self.request, ignore=True)
+    def _get_images(self):
+        try:
+            # TODO(gabriel): Handle pagination.
+            images, more, prev = api.glance.image_list_detailed(
+                self.request)
+            return images
+        except Exception:
+            exceptions.handle(self.request, ignore=True)
+            return []
+
+    def get_data(self):
+        marker = self.request.GET.get(
+            project_tables.InstancesTable._meta.pagination_param, None)
+        search_opts = self.get_filters({'marker': marker, 'paginate': True})
+        # Gather our instances, flavors and images concurrently; only the
+        # addresses lookup depends on the instances.
+        instances, flavors, images = parallel.call_parallel(
+            (self._get_instances, (search_opts,)),
+            self._get_flavors,
+            self._get_images)
 
-            full_flavors = SortedDict([(str(flavor.id), flavor)
-                                       for flavor in flavors])
+        if instances:
+            # Correlate our instances to their flavors and images
+            # The flavors which cannot be retrieved are left out.
+            full_flavors = api.nova.flavor_get_by_ids(
+                self.request,
+                [instance.flavor["id"] for instance in instances],
+                flavors)
             image_map = SortedDict([(str(image.id), image)
                                     for image in images])
 
-            # Loop through instances to get flavor info.
+            missing_flavors = False
             for instance in instances:
                 if hasattr(instance, 'image'):
                     # Instance from image returns dict
@@ -108,18 +124,15 @@ class IndexView(tables.DataTableView):
                         if instance.image.get('id') in image_map:
                             instance.image = image_map[instance.image['id']]
 
-                try:
-                    flavor_id = instance.flavor["id"]
-                    if flavor_id in full_flavors:
-                        instance.full_flavor = full_flavors[flavor_id]
-                    else:
-                        # If the flavor_id is not in full_flavors list,
-                        # get it via nova api.
-                        instance.full_flavor = api.nova.flavor_get(
-                            self.request, flavor_id)
-                except Exception:
-                    msg = _('Unable to retrieve instance size information.')
-                    exceptions.handle(self.request, msg)
+                flavor_id = instance.flavor["id"]
+                if flavor_id in full_flavors:
+                    instance.full_flavor = full_flavors[flavor_id]
+                else:
+                    missing_flavors = True
+            if missing_flavors:
+                messages.error(self.request,
+                               _('Unable to retrieve instance size '
+                                 'information.'))
         return instances
 
     def get_filters(self, filters):
@@ -101,6 +101,7 @@ class DetailView(tables.MultiTableView):
     table_classes = (subnet_tables.SubnetsTable, port_tables.PortsTable)
     template_name = 'project/networks/detail.html'
     page_title = _("Network Details: {{ network.name }}")
+    concurrent = True
 
     def get_subnets_data(self):
         try:
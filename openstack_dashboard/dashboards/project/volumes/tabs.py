@@ -150,3 +150,5 @@ class VolumeAndSnapshotTabs(tabs.TabGroup):
     slug = "volumes_and_snapshots"
     tabs = (VolumeTab, SnapshotTab, BackupsTab)
     sticky = True
+    lazy = True
+    concurrent = True
@@ -0,0 +1,103 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from __future__ import print_function
+
+from optparse import make_option  # noqa
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand  # noqa
+from django.core.management.base import CommandError  # noqa
+from django.test import client
+from openstack_auth import backend
+from openstack_auth import exceptions as auth_exceptions
+
+from openstack_dashboard.api import base
+from openstack_dashboard.api import capabilities
+
+# Services whose API version is chosen by an APIVersionManager.
+VERSIONED_SERVICES = ('identity', 'image', 'volume')
+
+
+class Command(BaseCommand):
+
+    args = ''
+    help = """Discover the extensions and API versions of the OpenStack
+services and store them in the cache of the OPENSTACK_CAPABILITIES setting.
+
+Run it when the dashboard starts, with a cache backend shared by all the
+dashboard processes, so that they do not have to discover them on their
+first requests. The credentials default to the OS_USERNAME, OS_PASSWORD,
+OS_USER_DOMAIN_NAME and OS_REGION_NAME environment variables.
+
+examples::
+
+    manage.py discover_capabilities --username=admin --password=secret
+    """
+
+    option_list = BaseCommand.option_list + (
+        make_option("--username",
+                    default=os.environ.get('OS_USERNAME'),
+                    help="name of the user to authenticate as"),
+        make_option("--password",
+                    default=os.environ.get('OS_PASSWORD'),
+                    help="password of the user"),
+        make_option("--user-domain",
+                    dest="user_domain",
+                    default=os.environ.get('OS_USER_DOMAIN_NAME'),
+                    help="domain of the user, for Keystone v3"),
+        make_option("--auth-url",
+                    dest="auth_url",
+                    default=settings.OPENSTACK_KEYSTONE_URL,
+                    help="Keystone endpoint (default : %default)"),
+        make_option("--region",
+                    default=os.environ.get('OS_REGION_NAME'),
+                    help="region of the endpoints to query"),
+    )
+
+    def handle(self, *args, **options):
+        if not capabilities.is_enabled():
+            raise CommandError("OPENSTACK_CAPABILITIES is disabled.")
+        if not options['username'] or not options['password']:
+            raise CommandError("A username and a password are required.")
+        request = self._get_request(options)
+
+        for service_type in capabilities.get_registered():
+            if not base.is_service_enabled(request, service_type):
+                continue
+            extensions = capabilities.get_extensions(request, service_type,
+                                                     refresh=True)
+            print("%s: %d extensions" % (service_type, len(extensions)))
+        for service_type in VERSIONED_SERVICES:
+            if not base.is_service_enabled(request, service_type):
+                continue
+            versions = capabilities.discover_versions(request, service_type)
+            print("%s: versions %s" % (service_type, ", ".join(
+                "%d.%d" % version for version in versions or ())))
+
+    def _get_request(self, options):
+        request = client.RequestFactory().get('/')
+        request.session = {}
+        try:
+            user = backend.KeystoneBackend().authenticate(
+                request=request,
+                username=options['username'],
+                password=options['password'],
+                user_domain_name=options['user_domain'],
+                auth_url=options['auth_url'])
+        except auth_exceptions.KeystoneAuthException as e:
+            raise CommandError(e)
+        if options['region']:
+            user.services_region = options['region']
+        request.user = user
+        return request
@@ -0,0 +1,101 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+import logging
+import time
+
+from django.core.exceptions import MiddlewareNotUsed
+from django.template.loader import render_to_string
+from django.utils.encoding import force_text
+
+from openstack_dashboard.api import profiler
+from openstack_dashboard.api import resilience
+
+
+LOG = logging.getLogger(__name__)
+
+
+class APIProfilerMiddleware(object):
+    """Reports the API calls made while serving each request.
+
+    Depending on the ``OPENSTACK_PROFILER`` setting, the calls are reported
+    in a ``Server-Timing`` response header, logged as a JSON document and
+    shown in an overlay at the bottom of HTML pages.
+    """
+
+    def __init__(self):
+        if not profiler.is_enabled():
+            raise MiddlewareNotUsed()
+        profiler.install()
+
+    def process_request(self, request):
+        profiler.start(request)
+
+    def process_response(self, request, response):
+        profile = profiler.get_profile(request)
+        if profile is None:
+            return response
+        config = profiler._get_config()
+        if config.get('server_timing', True):
+            response['Server-Timing'] = self._get_server_timing(profile)
+        if config.get('log', True):
+            self._log(request, response, profile)
+        if config.get('overlay', False):
+            self._add_overlay(response, profile)
+        return response
+
+    def _get_server_timing(self, profile):
+        metrics = ['api;dur=%.1f;desc="%d calls"'
+                   % (profile.total(), len(profile.calls))]
+        metrics.extend('%s;dur=%.1f;desc="%d calls"' % (name, duration, count)
+                       for name, count, duration in profile.summary())
+        return ', '.join(metrics)
+
+    def _log(self, request, response, profile):
+        LOG.info(json.dumps({'method': request.method,
+                             'path': request.path,
+                             'status': response.status_code,
+                             'duration': (time.time() - profile.start) * 1000,
+                             'api_duration': profile.total(),
+                             'calls': profile.calls}))
+
+    def _add_overlay(self, response, profile):
+        if (getattr(response, 'streaming', False) or
+                'text/html' not in response.get('Content-Type', '')):
+            return
+        content = force_text(response.content, response._charset)
+        position = content.rfind('</body>')
+        if position == -1:
+            return
+        calls = sorted(profile.calls, key=lambda call: call['start'])
+        overlay = render_to_string('_api_profile.html',
+                                   {'profile': profile, 'calls': calls})
+        response.content = content[:position] + overlay + content[position:]
+        if response.has_header('Content-Length'):
+            response['Content-Length'] = len(response.content)
+
+
+class APIResilienceMiddleware(object):
+    """Starts the time budget of the API calls made for each request.
+
+    See :mod:`openstack_dashboard.api.resilience` and the
+    ``OPENSTACK_API_RESILIENCE`` setting.
+    """
+
+    def __init__(self):
+        if not resilience.is_enabled():
+            raise MiddlewareNotUsed()
+        resilience.install()
+
+    def process_request(self, request):
+        resilience.start(request)
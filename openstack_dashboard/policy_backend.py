@@ -13,12 +13,14 @@
 
 """Policy engine for Horizon"""
 
+import ast
 import logging
 import os.path
 
 from django.conf import settings
 from openstack_auth import utils as auth_utils
 from oslo_config import cfg
+import six
 
 from openstack_dashboard.openstack.common import policy
 
@@ -34,6 +36,10 @@ CONF.policy_dirs = []
 
 _ENFORCER = None
 _BASE_PATH = getattr(settings, 'POLICY_FILES_PATH', '')
+# Maps each scope to its rules and their compiled form.
+_COMPILED = {}
+# Request attribute holding the policy decisions made for the request.
+_REQUEST_ATTR = '_policy_decisions'
 
 
 def _get_enforcer():
@@ -57,6 +63,143 @@ def _get_enforcer():
 def reset():
     global _ENFORCER
     _ENFORCER = None
+    _COMPILED.clear()
+
+
+def _allow(target, creds):
+    return True
+
+
+def _deny(target, creds):
+    return False
+
+
+def _compile_check(check, enforcer, compiled, pending):
+    """Turns a tree of checks into a single callable.
+
+    The callable takes the target and credentials. Referenced rules are
+    inlined and everything that can be worked out from the rule alone (role
+    names, literal values...) is computed once here instead of at each call.
+    Checks of unknown types are called as they are.
+    """
+    if check in compiled:
+        return compiled[check]
+    if check in pending:
+        # A rule referencing itself, evaluated the usual way.
+        return lambda target, creds: check(target, creds, enforcer)
+    pending.add(check)
+    try:
+        func = _compile_node(check, enforcer, compiled, pending)
+    finally:
+        pending.discard(check)
+    compiled[check] = func
+    return func
+
+
+def _compile_node(check, enforcer, compiled, pending):
+    kind = type(check)
+    if kind is policy.TrueCheck:
+        return _allow
+    if kind is policy.FalseCheck:
+        return _deny
+    if kind is policy.NotCheck:
+        rule = _compile_check(check.rule, enforcer, compiled, pending)
+        return lambda target, creds: not rule(target, creds)
+    if kind in (policy.AndCheck, policy.OrCheck):
+        rules = tuple(_compile_check(rule, enforcer, compiled, pending)
+                      for rule in check.rules)
+        if kind is policy.AndCheck:
+            def and_check(target, creds):
+                for rule in rules:
+                    if not rule(target, creds):
+                        return False
+                return True
+            return and_check
+
+        def or_check(target, creds):
+            for rule in rules:
+                if rule(target, creds):
+                    return True
+            return False
+        return or_check
+    if kind is policy.RuleCheck:
+        try:
+            rule = enforcer.rules[check.match]
+        except KeyError:
+            return _deny
+        return _compile_check(rule, enforcer, compiled, pending)
+    if kind is policy.RoleCheck:
+        role = check.match.lower()
+        return lambda target, creds: role in [r.lower()
+                                              for r in creds['roles']]
+    if kind is policy.GenericCheck:
+        return _compile_generic_check(check)
+    return lambda target, creds: check(target, creds, enforcer)
+
+
+def _compile_generic_check(check):
+    match = check.match
+    try:
+        literal = six.text_type(ast.literal_eval(check.kind))
+        kind_parts = None
+    except ValueError:
+        literal = None
+        kind_parts = check.kind.split('.')
+
+    def generic_check(target, creds):
+        try:
+            value = match % target
+        except KeyError:
+            return False
+        if kind_parts is None:
+            return value == literal
+        leftval = creds
+        try:
+            for kind_part in kind_parts:
+                leftval = leftval[kind_part]
+        except KeyError:
+            return False
+        return value == six.text_type(leftval)
+    return generic_check
+
+
+def _get_compiled_rules(scope, enforcer):
+    """Returns the compiled rules of the scope, compiled again whenever
+    the enforcer reloads its policy file.
+    """
+    rules, compiled_rules = _COMPILED.get(scope, (None, None))
+    if rules is not enforcer.rules:
+        rules = enforcer.rules
+        compiled, pending = {}, set()
+        compiled_rules = dict(
+            (name, _compile_check(rule, enforcer, compiled, pending))
+            for name, rule in rules.items())
+        _COMPILED[scope] = (rules, compiled_rules)
+    return compiled_rules
+
+
+def _enforce(scope, enforcer, action, target, credentials):
+    compiled_rules = _get_compiled_rules(scope, enforcer)
+    rule = compiled_rules.get(action)
+    if rule is None:
+        # to match service implementations, if a rule is not found,
+        # use the default rule for that service policy
+        rule = (compiled_rules.get(enforcer.rules.default_rule) or
+                compiled_rules.get('default', _deny))
+    return rule(target, credentials)
+
+
+def _get_decisions(request, enforcer):
+    """Returns the decisions made for the request so far.
+
+    The policy files are checked for changes the first time a scope is
+    used in a request, rather than for every check.
+    """
+    decisions = getattr(request, _REQUEST_ATTR, None)
+    if decisions is None or decisions['enforcer'] is not enforcer:
+        decisions = {'enforcer': enforcer, 'loaded': set(), 'results': {}}
+        setattr(request, _REQUEST_ATTR, decisions)
+    return decisions
 
 
 def check(actions, request, target=None):
@@ -123,26 +266,34 @@ def check(actions, request, target=None):
     credentials = _user_to_credentials(request, user)
 
     enforcer = _get_enforcer()
+    decisions = _get_decisions(request, enforcer)
+    try:
+        normalized_target = tuple(sorted(target.items()))
+        hash(normalized_target)
+    except TypeError:
+        # Targets holding lists or dicts are not cached.
+        normalized_target = None
 
     for action in actions:
         scope, action = action[0], action[1]
-        if scope in enforcer:
-            # if any check fails return failure
-            if not enforcer[scope].enforce(action, target, credentials):
-                # to match service implementations, if a rule is not found,
-                # use the default rule for that service policy
-                #
-                # waiting to make the check because the first call to
-                # enforce loads the rules
-                if action not in enforcer[scope].rules:
-                    if not enforcer[scope].enforce('default',
-                                                   target, credentials):
-                        return False
-                else:
-                    return False
         # if no policy for scope, allow action, underlying API will
         # ultimately block the action if not permitted, treat as though
         # allowed
+        if scope not in enforcer:
+            continue
+        key = (scope, action, normalized_target)
+        result = decisions['results'].get(key)
+        if result is None:
+            if scope not in decisions['loaded']:
+                enforcer[scope].load_rules()
+                decisions['loaded'].add(scope)
+            result = bool(_enforce(scope, enforcer[scope], action,
+                                   target, credentials))
+            if normalized_target is not None:
+                decisions['results'][key] = result
+        # if any check fails return failure
+        if not result:
+            return False
     return True
 
 
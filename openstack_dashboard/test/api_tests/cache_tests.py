@@ -0,0 +1,126 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from __future__ import absolute_import
+
+from django import http
+from django.test.utils import override_settings
+
+from mox import IgnoreArg  # noqa
+from novaclient import exceptions as nova_exceptions
+
+from openstack_dashboard import api
+from openstack_dashboard.api import cache
+from openstack_dashboard.test import helpers as test
+
+
+@override_settings(OPENSTACK_API_CACHE={'enabled': True})
+class APICacheTests(test.APITestCase):
+
+    def setUp(self):
+        super(APICacheTests, self).setUp()
+        cache._get_backend().clear()
+
+    def _new_request(self):
+        # @memoized caches per request, so every call needs its own request
+        # to reach the shared cache.
+        request = http.HttpRequest()
+        request.user = self.request.user
+        return request
+
+    def test_flavor_list_cached_across_requests(self):
+        flavors = self.flavors.list()
+        novaclient = self.stub_novaclient()
+        novaclient.flavors = self.mox.CreateMockAnything()
+        novaclient.flavors.list(is_public=True).AndReturn(flavors)
+        self.mox.ReplayAll()
+
+        api.nova.flavor_list(self._new_request())
+        cached = api.nova.flavor_list(self._new_request())
+
+        self.assertEqual([f.id for f in flavors], [f.id for f in cached])
+        self.assertEqual([f.name for f in flavors], [f.name for f in cached])
+
+    def test_flavor_list_invalidated_by_flavor_delete(self):
+        flavors = self.flavors.list()
+        novaclient = self.stub_novaclient()
+        novaclient.flavors = self.mox.CreateMockAnything()
+        novaclient.flavors.list(is_public=True).AndReturn(flavors)
+        novaclient.flavors.delete(flavors[0].id)
+        novaclient.flavors.list(is_public=True).AndReturn(flavors[1:])
+        self.mox.ReplayAll()
+
+        api.nova.flavor_list(self._new_request())
+        api.nova.flavor_delete(self._new_request(), flavors[0].id)
+        result = api.nova.flavor_list(self._new_request())
+
+        self.assertEqual(len(flavors) - 1, len(result))
+
+    def test_cache_keyed_by_arguments(self):
+        flavors = self.flavors.list()
+        novaclient = self.stub_novaclient()
+        novaclient.flavors = self.mox.CreateMockAnything()
+        novaclient.flavors.list(is_public=True).AndReturn(flavors)
+        novaclient.flavors.list(is_public=None).AndReturn(flavors[:1])
+        self.mox.ReplayAll()
+
+        api.nova.flavor_list(self._new_request())
+        result = api.nova.flavor_list(self._new_request(), is_public=None)
+
+        self.assertEqual(1, len(result))
+
+    def test_network_list_invalidated_by_subnet_create(self):
+        networks = {'networks': self.api_networks.list()}
+        subnets = {'subnets': self.api_subnets.list()}
+        subnet = self.api_subnets.first()
+
+        neutronclient = self.stub_neutronclient()
+        neutronclient.list_networks().AndReturn(networks)
+        neutronclient.list_subnets().AndReturn(subnets)
+        neutronclient.create_subnet(body=IgnoreArg()) \
+            .AndReturn({'subnet': subnet})
+        neutronclient.list_networks().AndReturn(networks)
+        neutronclient.list_subnets().AndReturn(subnets)
+        self.mox.ReplayAll()
+
+        api.neutron.network_list(self._new_request())
+        api.neutron.network_list(self._new_request())
+        api.neutron.subnet_create(self._new_request(), subnet['network_id'],
+                                  subnet['cidr'], subnet['ip_version'])
+        result = api.neutron.network_list(self._new_request())
+
+        self.assertEqual(len(networks['networks']), len(result))
+
+    @override_settings(OPENSTACK_API_CACHE={'enabled': False})
+    def test_cache_disabled(self):
+        flavors = self.flavors.list()
+        novaclient = self.stub_novaclient()
+        novaclient.flavors = self.mox.CreateMockAnything()
+        novaclient.flavors.list(is_public=True).AndReturn(flavors)
+        novaclient.flavors.list(is_public=True).AndReturn(flavors)
+        self.mox.ReplayAll()
+
+        api.nova.flavor_list(self._new_request())
+        api.nova.flavor_list(self._new_request())
+
+    def test_missing_flavor_not_requested_again(self):
+        flavors = self.flavors.list()
+        novaclient = self.stub_novaclient()
+        novaclient.flavors = self.mox.CreateMockAnything()
+        novaclient.flavors.get('deleted') \
+            .AndRaise(nova_exceptions.NotFound(404))
+        self.mox.ReplayAll()
+
+        for i in range(2):
+            result = api.nova.flavor_get_by_ids(self._new_request(),
+                                                ['deleted'], flavors)
+            self.assertEqual({}, result)
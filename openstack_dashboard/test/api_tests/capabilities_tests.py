@@ -0,0 +1,200 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from __future__ import absolute_import
+
+from django import http
+from django.test.utils import override_settings
+
+from mox import IgnoreArg  # noqa
+from novaclient.v1_1.contrib import list_extensions as nova_list_extensions
+import requests
+
+from openstack_dashboard import api
+from openstack_dashboard.api import base
+from openstack_dashboard.api import capabilities
+from openstack_dashboard.test import helpers as test
+
+
+class FakeResponse(object):
+    def __init__(self, data):
+        self.data = data
+
+    def json(self):
+        return self.data
+
+
+@override_settings(OPENSTACK_CAPABILITIES={'enabled': True})
+class CapabilitiesTests(test.APITestCase):
+
+    def setUp(self):
+        super(CapabilitiesTests, self).setUp()
+        capabilities._get_backend().clear()
+        capabilities.clear()
+        self.addCleanup(capabilities.clear)
+
+    def _new_request(self):
+        # @memoized caches per request, so every call needs its own request
+        # to reach the registry.
+        request = http.HttpRequest()
+        request.user = self.request.user
+        return request
+
+    def test_neutron_extensions_discovered_once(self):
+        extensions = [{'alias': 'mac-learning'}, {'alias': 'provider'}]
+        neutronclient = self.stub_neutronclient()
+        neutronclient.list_extensions() \
+            .AndReturn({'extensions': extensions})
+        self.mox.ReplayAll()
+
+        self.assertTrue(api.neutron.is_extension_supported(
+            self._new_request(), 'mac-learning'))
+        self.assertTrue(api.neutron.is_extension_supported(
+            self._new_request(), 'provider'))
+        self.assertFalse(api.neutron.is_extension_supported(
+            self._new_request(), 'dvr'))
+
+    def test_nova_extensions_discovered_once(self):
+        self.stub_novaclient()
+        self.mox.StubOutWithMock(nova_list_extensions.ListExtManager,
+                                 'show_all')
+        nova_list_extensions.ListExtManager.show_all().AndReturn(
+            [nova_list_extensions.ListExtResource(
+                None, {'name': 'AdminActions'}, loaded=True)])
+        self.mox.ReplayAll()
+
+        self.assertTrue(api.nova.extension_supported('AdminActions',
+                                                     self._new_request()))
+        self.assertFalse(api.nova.extension_supported('DiskConfig',
+                                                      self._new_request()))
+
+    def test_extensions_shared_through_backend(self):
+        neutronclient = self.stub_neutronclient()
+        neutronclient.list_extensions() \
+            .AndReturn({'extensions': [{'alias': 'quotas'}]})
+        self.mox.ReplayAll()
+
+        api.neutron.list_extensions(self._new_request())
+        # Another process only knows what is in the cache backend.
+        capabilities.clear()
+        self.assertEqual([{'alias': 'quotas'}],
+                         api.neutron.list_extensions(self._new_request()))
+
+    def test_extensions_refresh(self):
+        neutronclient = self.stub_neutronclient()
+        neutronclient.list_extensions() \
+            .AndReturn({'extensions': [{'alias': 'quotas'}]})
+        neutronclient.list_extensions() \
+            .AndReturn({'extensions': []})
+        self.mox.ReplayAll()
+
+        api.neutron.list_extensions(self._new_request())
+        capabilities.get_extensions(self._new_request(), 'network',
+                                    refresh=True)
+        self.assertEqual([],
+                         api.neutron.list_extensions(self._new_request()))
+
+    @override_settings(OPENSTACK_CAPABILITIES={})
+    def test_disabled_by_default(self):
+        self.assertFalse(capabilities.is_enabled())
+
+    @override_settings(OPENSTACK_CAPABILITIES={'enabled': False})
+    def test_extensions_disabled(self):
+        neutronclient = self.stub_neutronclient()
+        neutronclient.list_extensions().MultipleTimes() \
+            .AndReturn({'extensions': []})
+        self.mox.ReplayAll()
+
+        api.neutron.list_extensions(self._new_request())
+        api.neutron.list_extensions(self._new_request())
+
+    def test_get_unversioned_url(self):
+        for url, expected in (
+                ('http://host:8776/v2/1234', 'http://host:8776/'),
+                ('http://host:5000/v2.0', 'http://host:5000/'),
+                ('https://host/image/v1/', 'https://host/image'),
+                ('http://host:9292', 'http://host:9292/')):
+            self.assertEqual(expected,
+                             capabilities._get_unversioned_url(url))
+
+    def test_discover_versions(self):
+        self.mox.StubOutWithMock(requests.Session, 'get')
+        requests.Session.get('http://public.nova.example.com:8776/',
+                             headers=IgnoreArg(), verify=IgnoreArg()) \
+            .AndReturn(FakeResponse({'versions': [
+                {'id': 'v1.0', 'status': 'SUPPORTED'},
+                {'id': 'v2.0', 'status': 'CURRENT'}]}))
+        requests.Session.get('http://public.keystone.example.com:5000/',
+                             headers=IgnoreArg(), verify=IgnoreArg()) \
+            .AndReturn(FakeResponse({'versions': {'values': [
+                {'id': 'v3.0', 'status': 'stable'}]}}))
+        self.mox.ReplayAll()
+
+        self.assertEqual([(1, 0), (2, 0)],
+                         capabilities.discover_versions(self.request,
+                                                        'volume'))
+        self.assertEqual([(3, 0)],
+                         capabilities.discover_versions(self.request,
+                                                        'identity'))
+        capabilities.clear()
+        self.assertEqual([(1, 0), (2, 0)],
+                         capabilities.get_versions('volume'))
+
+    def test_discover_versions_failure(self):
+        self.mox.StubOutWithMock(requests.Session, 'get')
+        requests.Session.get(IgnoreArg(), headers=IgnoreArg(),
+                             verify=IgnoreArg()) \
+            .AndRaise(requests.ConnectionError())
+        self.mox.ReplayAll()
+
+        self.assertIsNone(capabilities.discover_versions(self.request,
+                                                         'volume'))
+        self.assertIsNone(capabilities.get_versions('volume'))
+
+
+@override_settings(OPENSTACK_CAPABILITIES={'enabled': True},
+                   OPENSTACK_API_VERSIONS={})
+class APIVersionDiscoveryTests(test.TestCase):
+
+    def setUp(self):
+        super(APIVersionDiscoveryTests, self).setUp()
+        capabilities._get_backend().clear()
+        capabilities.clear()
+        self.addCleanup(capabilities.clear)
+        self.versions = base.APIVersionManager('volume', preferred_version=2)
+        self.versions.load_supported_version(1, {'version': 1})
+
+    def _set_discovered(self, versions):
+        capabilities._store(capabilities._get_key('versions', 'volume'),
+                            versions)
+
+    def test_preferred_version_without_discovery(self):
+        self.assertEqual(2, self.versions.active)
+        # The choice waits for the versions to be discovered.
+        self.assertIsNone(self.versions._active)
+        self._set_discovered([(1, 0)])
+        self.assertEqual(1, self.versions.active)
+        self.assertEqual({'version': 1}, self.versions.get_active_version())
+
+    def test_preferred_version_exposed(self):
+        self._set_discovered([(1, 0), (2, 0)])
+        self.assertEqual(2, self.versions.active)
+        self.assertEqual(2, self.versions._active)
+
+    def test_no_supported_version_exposed(self):
+        self._set_discovered([(3, 0)])
+        self.assertEqual(2, self.versions.active)
+
+    @override_settings(OPENSTACK_API_VERSIONS={'volume': 2})
+    def test_setting_overrides_discovery(self):
+        self._set_discovered([(1, 0)])
+        self.assertEqual(2, self.versions.active)
@@ -12,11 +12,18 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import threading
+import time
+
 from django import http
+from django.test.utils import override_settings
 
 from mox import IsA  # noqa
 
+from horizon.utils import parallel
+
 from openstack_dashboard import api
+from openstack_dashboard.api import resilience
 from openstack_dashboard.test import helpers as test
 
 
@@ -318,3 +325,72 @@ class CeilometerApiTests(test.APITestCase):
                          vars(statistic_obj))
 
         self.assertEqual(len(resources), len(data))
+
+
+class CeilometerStatisticsTests(test.APITestCase):
+
+    def setUp(self):
+        super(CeilometerStatisticsTests, self).setUp()
+        self.calls = []
+        self.release = threading.Event()
+        self.addCleanup(self.release.set)
+        original = api.ceilometer.statistic_list
+        api.ceilometer.statistic_list = self._statistic_list
+        self.addCleanup(setattr, api.ceilometer, 'statistic_list', original)
+        self.aggregates = [api.ceilometer.ResourceAggregate(
+            query=[{'field': 'project_id', 'op': 'eq', 'value': name}],
+            identifier=name) for name in ('a', 'b')]
+
+    def _statistic_list(self, request, meter_name, query=None, period=None):
+        self.calls.append((threading.current_thread(), meter_name,
+                           query[0]['value']))
+        if meter_name == 'slow':
+            self.release.wait(5)
+        if meter_name == 'broken':
+            raise ValueError()
+        return self.statistics.list()
+
+    @override_settings(CEILOMETER_STATISTICS_WORKERS=2)
+    def test_statistics_of_each_resource_and_meter(self):
+        usage = api.ceilometer.CeilometerUsage(self.request)
+        usage.update_list_with_statistics(self.aggregates,
+                                          ['cpu.util', 'broken'],
+                                          stats_attr='max')
+
+        self.assertEqual(set([('cpu.util', 'a'), ('cpu.util', 'b'),
+                              ('broken', 'a'), ('broken', 'b')]),
+                         set(call[1:] for call in self.calls))
+        # The calls are made by the workers of the pool, not by one thread
+        # per resource.
+        threads = set(call[0] for call in self.calls)
+        self.assertNotIn(threading.current_thread(), threads)
+        self.assertTrue(len(threads) <= 2)
+        for resource in self.aggregates:
+            self.assertEqual(9, resource.get_meter('cpu_util'))
+            self.assertIsNone(resource.get_meter('broken'))
+
+    @override_settings(CEILOMETER_STATISTICS_WORKERS=2)
+    def test_statistics_fetched_from_worker(self):
+        # Statistics fetched by a task of the shared pool (e.g. a concurrent
+        # tab) are still fetched by the workers of the endpoint's pool.
+        def fetch():
+            usage = api.ceilometer.CeilometerUsage(self.request)
+            usage.update_list_with_statistics(self.aggregates, ['cpu.util'],
+                                              stats_attr='max')
+            return threading.current_thread()
+
+        task_thread = parallel.ThreadPool(1).submit(fetch).result(5)
+        self.assertEqual(2, len(self.calls))
+        self.assertNotIn(task_thread, set(call[0] for call in self.calls))
+
+    @override_settings(CEILOMETER_STATISTICS_WORKERS=1)
+    def test_statistics_cancelled_at_deadline(self):
+        setattr(self.request, resilience.DEADLINE_ATTR, time.time() + 0.2)
+        usage = api.ceilometer.CeilometerUsage(self.request)
+        usage.update_list_with_statistics(self.aggregates, ['slow'],
+                                          stats_attr='max')
+
+        # The second call was still waiting for the worker.
+        self.assertEqual(1, len(self.calls))
+        for resource in self.aggregates:
+            self.assertIsNone(resource.get_meter('slow'))
@@ -40,6 +40,50 @@ class CinderApiTests(test.APITestCase):
         # No assertions are necessary. Verification is handled by mox.
         api.cinder.volume_list(self.request, search_opts=search_opts)
 
+    @override_settings(API_RESULT_PAGE_SIZE=2)
+    def test_volume_list_paged(self):
+        search_opts = {'all_tenants': 1}
+        volumes = self.cinder_volumes.list()[:3]
+        cinderclient = self.stub_cinderclient()
+        cinderclient.transfers = self.mox.CreateMockAnything()
+        cinderclient.transfers.list(
+            detailed=True,
+            search_opts=search_opts,).AndReturn([])
+        cinderclient.volumes = self.mox.CreateMockAnything()
+        cinderclient.volumes.list(search_opts=search_opts,
+                                  marker='nonsense',
+                                  limit=3,
+                                  sort_key='name',
+                                  sort_dir='asc').AndReturn(volumes)
+        self.mox.ReplayAll()
+
+        result, has_more, has_prev = api.cinder.volume_list_paged(
+            self.request, search_opts=search_opts, marker='nonsense',
+            paginate=True, sort_key='name', sort_dir='asc')
+        self.assertEqual([v.id for v in volumes[:2]], [v.id for v in result])
+        self.assertTrue(has_more)
+        self.assertTrue(has_prev)
+
+    def test_volume_list_paged_v1(self):
+        api.cinder.VERSIONS._active = 1
+        self.addCleanup(setattr, api.cinder.VERSIONS, '_active', None)
+        volumes = self.cinder_volumes.list()
+        cinderclient = self.stub_cinderclient()
+        cinderclient.transfers = self.mox.CreateMockAnything()
+        cinderclient.transfers.list(
+            detailed=True,
+            search_opts=None,).AndReturn([])
+        cinderclient.volumes = self.mox.CreateMockAnything()
+        # Volume API v1 can neither sort nor paginate.
+        cinderclient.volumes.list(search_opts=None).AndReturn(volumes)
+        self.mox.ReplayAll()
+
+        result, has_more, has_prev = api.cinder.volume_list_paged(
+            self.request, marker='nonsense', paginate=True, sort_key='name')
+        self.assertEqual(len(volumes), len(result))
+        self.assertFalse(has_more)
+        self.assertFalse(has_prev)
+
     def test_volume_snapshot_list(self):
         search_opts = {'all_tenants': 1}
         volume_snapshots = self.cinder_volume_snapshots.list()
@@ -0,0 +1,74 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from __future__ import absolute_import
+
+import time
+
+from django.test.utils import override_settings
+import requests
+
+from openstack_dashboard.api import connection_pool
+from openstack_dashboard.test import helpers as test
+
+
+class ConnectionPoolTests(test.TestCase):
+
+    def setUp(self):
+        super(ConnectionPoolTests, self).setUp()
+        connection_pool.close_all()
+
+    def tearDown(self):
+        connection_pool.close_all()
+        super(ConnectionPoolTests, self).tearDown()
+
+    def test_adapter_shared_per_endpoint(self):
+        adapter = connection_pool.get_adapter("http://nova:8774/v2/1")
+        self.assertIs(adapter,
+                      connection_pool.get_adapter("http://nova:8774/v2/2"))
+        self.assertIsNot(adapter,
+                         connection_pool.get_adapter("http://glance:9292"))
+        self.assertIsNot(adapter,
+                         connection_pool.get_adapter("https://nova:8774"))
+
+    def test_adapter_per_ssl_settings(self):
+        adapter = connection_pool.get_adapter("https://nova:8774")
+        with self.settings(OPENSTACK_SSL_NO_VERIFY=True):
+            self.assertIsNot(adapter,
+                             connection_pool.get_adapter("https://nova:8774"))
+
+    @override_settings(OPENSTACK_HTTP_POOL={'idle_timeout': 60})
+    def test_idle_adapter_evicted(self):
+        now = time.time()
+        self.mox.StubOutWithMock(time, 'time')
+        time.time().AndReturn(now)
+        time.time().AndReturn(now + 30)
+        time.time().AndReturn(now + 91)
+        self.mox.ReplayAll()
+
+        adapter = connection_pool.get_adapter("http://nova:8774")
+        self.assertIs(adapter, connection_pool.get_adapter("http://nova:8774"))
+        self.assertIsNot(adapter,
+                         connection_pool.get_adapter("http://nova:8774"))
+
+    def test_mount(self):
+        session = connection_pool.mount(requests.Session(),
+                                        "http://nova:8774/v2/1")
+        self.assertIs(connection_pool.get_adapter("http://nova:8774"),
+                      session.get_adapter("http://nova:8774/v2/1/servers"))
+
+    @override_settings(OPENSTACK_HTTP_POOL={'enabled': False})
+    def test_mount_disabled(self):
+        session = connection_pool.mount(requests.Session(),
+                                        "http://nova:8774/v2/1")
+        self.assertIsNot(connection_pool.get_adapter("http://nova:8774"),
+                         session.get_adapter("http://nova:8774/v2/1/servers"))
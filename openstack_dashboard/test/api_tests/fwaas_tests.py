@@ -320,6 +320,26 @@ class FwaasApiTests(test.APITestCase):
             self.assertEqual(d.firewall_policy_id, v.policy.id)
             self.assertEqual(d.policy.name, v.policy.name)
 
+    @test.create_stubs({neutronclient: ('list_firewall_rules',
+                                        'list_firewall_policies',
+                                        'list_firewalls')})
+    def test_lists_share_listings(self):
+        neutronclient.list_firewall_rules().AndReturn(
+            {'firewall_rules': self.api_fw_rules.list()})
+        neutronclient.list_firewall_policies().AndReturn(
+            {'firewall_policies': self.api_fw_policies.list()})
+        neutronclient.list_firewalls().AndReturn(
+            {'firewalls': self.api_firewalls.list()})
+        self.mox.ReplayAll()
+
+        api.fwaas.rule_list(self.request)
+        policies = api.fwaas.policy_list(self.request)
+        firewalls = api.fwaas.firewall_list(self.request)
+        for p in policies:
+            self.assertEqual(p.firewall_rules, [r.id for r in p.rules])
+        for f in firewalls:
+            self.assertEqual(f.firewall_policy_id, f.policy.id)
+
     @test.create_stubs({neutronclient: ('show_firewall',
                                         'show_firewall_policy')})
     def test_firewall_get(self):
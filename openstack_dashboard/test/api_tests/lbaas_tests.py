@@ -337,6 +337,28 @@ class LbaasApiTests(test.APITestCase):
             self.assertIsInstance(v, api.lbaas.Member)
             self.assertTrue(v.id)
 
+    @test.create_stubs({neutronclient: ('list_pools', 'list_vips',
+                                        'list_members'),
+                        api.neutron: ('subnet_list',)})
+    def test_pool_and_member_list_share_listings(self):
+        tenant_id = self.request.user.tenant_id
+        pools = {'pools': self.api_pools.list()}
+        members = {'members': self.api_members.list()}
+
+        neutronclient.list_pools(tenant_id=tenant_id).AndReturn(pools)
+        api.neutron.subnet_list(self.request).AndReturn(self.subnets.list())
+        neutronclient.list_vips().AndReturn({'vips': self.api_vips.list()})
+        neutronclient.list_members(tenant_id=tenant_id).AndReturn(members)
+        self.mox.ReplayAll()
+
+        api.lbaas.pool_list(self.request, tenant_id=tenant_id)
+        # The members are expanded with the pools listed above.
+        ret_val = api.lbaas.member_list(self.request, tenant_id=tenant_id)
+        pool_names = dict((p['id'], p['name'])
+                          for p in self.api_pools.list())
+        for m in ret_val:
+            self.assertEqual(pool_names[m.pool_id], m.pool_name)
+
     @test.create_stubs({neutronclient: ('show_member', 'show_pool')})
     def test_member_get(self):
         member = self.members.first()
@@ -24,6 +24,7 @@ from mox import IsA  # noqa
 from novaclient.v1_1 import floating_ip_pools
 
 from openstack_dashboard import api
+from openstack_dashboard.api import network_base
 from openstack_dashboard.test import helpers as test
 
 
@@ -725,6 +726,24 @@ class NetworkApiNeutronFloatingIpTests(NetworkApiNeutronTestBase):
             self.assertEqual(exp[0], ret.id)
             self.assertEqual(exp[1], ret.name)
 
+    def _stub_reachable_subnets(self):
+        search_opts = {'router:external': True}
+        ext_nets = [n for n in self.api_networks.list()
+                    if n['router:external']]
+        ext_net_ids = [n['id'] for n in ext_nets]
+        self.qclient.list_networks(**search_opts) \
+            .AndReturn({'networks': ext_nets})
+        routers = self.api_routers.list()
+        self.qclient.list_routers().AndReturn({'routers': routers})
+        gw_routers = [r['id'] for r in routers
+                      if (r['external_gateway_info'] and
+                          r['external_gateway_info'].get('network_id')
+                          in ext_net_ids)]
+        router_ports = [p for p in self.api_ports.list()
+                        if p['device_id'] in gw_routers]
+        self.qclient.list_ports(device_id=gw_routers) \
+            .AndReturn({'ports': router_ports})
+
     def test_floating_ip_target_get_by_instance(self):
         ports = self.api_ports.list()
         candidates = [p for p in ports if p['device_id'] == '1']
@@ -735,6 +754,24 @@ class NetworkApiNeutronFloatingIpTests(NetworkApiNeutronTestBase):
         ret = api.network.floating_ip_target_get_by_instance(self.request, '1')
         self.assertEqual(self._get_target_id(candidates[0]), ret)
 
+    def test_floating_ip_target_list_by_instance_ids(self):
+        ports = self.api_ports.list()
+        candidates = [p for p in ports if p['device_id'] in ('1', '2')]
+        self.qclient.list_ports(device_id=['1', '2']) \
+            .AndReturn({'ports': candidates})
+        self._stub_reachable_subnets()
+        self.mox.ReplayAll()
+
+        rets = api.network.floating_ip_target_list(self.request,
+                                                   instance_ids=['1', '2'])
+        subnet_id = self.subnets.first().id
+        reachable = [p for p in candidates
+                     if subnet_id in [ip['subnet_id']
+                                      for ip in p['fixed_ips']]]
+        self.assertEqual([self._get_target_id(p) for p in reachable],
+                         [ret.id for ret in rets])
+        self.assertEqual(reachable[0]['device_id'], rets[0].instance_id)
+
     def test_target_floating_ip_port_by_instance(self):
         ports = self.api_ports.list()
         candidates = [p for p in ports if p['device_id'] == '1']
@@ -766,3 +803,18 @@ class NetworkApiNeutronFloatingIpTests(NetworkApiNeutronTestBase):
         ret = api.network.floating_ip_target_list_by_instance(
             self.request, 'vm2', target_list)
         self.assertEqual(['id21', 'id22'], ret)
+
+    def test_floating_ip_target_list_indexed(self):
+        target_list = network_base.FloatingIpTargetList(
+            [{'name': 'name11', 'id': 'id11', 'instance_id': 'vm1'},
+             {'name': 'name21', 'id': 'id21', 'instance_id': 'vm2'},
+             {'name': 'name22', 'id': 'id22', 'instance_id': 'vm2'}])
+        self.mox.ReplayAll()
+
+        self.assertEqual(3, len(target_list))
+        self.assertEqual('name22', target_list.get('id22')['name'])
+        self.assertIsNone(target_list.get('id31'))
+        self.assertEqual([], target_list.get_by_instance('vm3'))
+        self.assertEqual(['id21', 'id22'],
+                         api.network.floating_ip_target_list_by_instance(
+                             self.request, 'vm2', target_list))
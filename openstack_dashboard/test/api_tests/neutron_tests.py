@@ -221,6 +221,43 @@ class NeutronApiTests(test.APITestCase):
         for n in ret_val:
             self.assertIsInstance(n, api.neutron.Router)
 
+    def test_resource_graph(self):
+        routers = self.api_routers.list()
+        tenant_id = self.request.user.tenant_id
+
+        neutronclient = self.stub_neutronclient()
+        neutronclient.list_routers(tenant_id=tenant_id).AndReturn(
+            {'routers': routers[:1]})
+        neutronclient.list_routers().AndReturn({'routers': routers})
+        self.mox.ReplayAll()
+
+        graph = api.neutron.get_resource_graph(self.request)
+        self.assertIs(graph, api.neutron.get_resource_graph(self.request))
+        self.assertEqual([routers[0]['id']],
+                         [r.id for r in graph.list('routers',
+                                                   tenant_id=tenant_id)])
+        graph.list('routers', tenant_id=tenant_id)
+        # Resources already listed are found without listing them again.
+        self.assertEqual(routers[0]['id'],
+                         graph.get('routers', routers[0]['id']).id)
+        # Others are looked for in the whole collection.
+        self.assertEqual(routers[1]['id'],
+                         graph.get('routers', routers[1]['id']).id)
+        self.assertIsNone(graph.get('routers', 'unknown'))
+
+    def test_resource_count(self):
+        routers = {'routers': [{'id': r['id']}
+                               for r in self.api_routers.list()]}
+
+        neutronclient = self.stub_neutronclient()
+        neutronclient.list_routers(fields='id', tenant_id='1') \
+            .AndReturn(routers)
+        self.mox.ReplayAll()
+
+        ret_val = api.neutron.resource_count(self.request, 'router',
+                                             tenant_id='1')
+        self.assertEqual(len(self.api_routers.list()), ret_val)
+
     def test_router_get(self):
         router = {'router': self.api_routers.first()}
         router_id = self.api_routers.first()['id']
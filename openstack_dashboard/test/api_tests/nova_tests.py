@@ -24,10 +24,12 @@ from django import http
 from django.test.utils import override_settings
 
 from mox import IsA  # noqa
+from novaclient import exceptions as nova_exceptions
 from novaclient.v1_1 import servers
 import six
 
 from openstack_dashboard import api
+from openstack_dashboard.api import cache
 from openstack_dashboard.test import helpers as test
 
 
@@ -154,6 +156,28 @@ class ComputeApiTests(test.APITestCase):
             self.assertIsInstance(server, api.nova.Server)
         self.assertFalse(has_more)
 
+    def test_server_list_sorted(self):
+        page_size = getattr(settings, 'API_RESULT_PAGE_SIZE', 20)
+        servers = self.servers.list()
+        novaclient = self.stub_novaclient()
+        novaclient.servers = self.mox.CreateMockAnything()
+        novaclient.servers.list(True,
+                                {'all_tenants': True,
+                                 'marker': 'nonsense',
+                                 'limit': page_size + 1,
+                                 'sort_key': 'display_name',
+                                 'sort_dir': 'desc'}).AndReturn(servers)
+        self.mox.ReplayAll()
+
+        ret_val, has_more = api.nova.server_list(self.request,
+                                                 {'marker': 'nonsense',
+                                                  'paginate': True},
+                                                 all_tenants=True,
+                                                 sort_key='display_name',
+                                                 sort_dir='desc')
+        self.assertEqual(len(servers), len(ret_val))
+        self.assertFalse(has_more)
+
     @override_settings(API_RESULT_PAGE_SIZE=1)
     def test_server_list_pagination_more(self):
         page_size = getattr(settings, 'API_RESULT_PAGE_SIZE', 1)
@@ -253,3 +277,47 @@ class ComputeApiTests(test.APITestCase):
                             "totalFloatingIpsUsed": 0,
                             }
         self._test_absolute_limits(values, expected_results)
+
+    def test_flavor_get_by_ids(self):
+        flavors = self.flavors.list()
+        novaclient = self.stub_novaclient()
+        novaclient.flavors = self.mox.CreateMockAnything()
+        novaclient.flavors.get(flavors[1].id).AndReturn(flavors[1])
+        novaclient.flavors.get('deleted') \
+            .AndRaise(nova_exceptions.NotFound(404))
+        self.mox.ReplayAll()
+
+        flavor_ids = [flavors[0].id, flavors[1].id, flavors[1].id, 'deleted']
+        ret_val = api.nova.flavor_get_by_ids(self.request, flavor_ids,
+                                             flavors[:1])
+        self.assertEqual(set([flavors[0].id, flavors[1].id]),
+                         set(ret_val.keys()))
+        self.assertEqual(flavors[1].name, ret_val[flavors[1].id].name)
+
+    def test_flavor_get_by_ids_looked_up_once(self):
+        flavors = self.flavors.list()
+        self.mox.StubOutWithMock(cache, 'get_value')
+        cache.get_value(IsA(http.HttpRequest), 'flavors', 'missing',
+                        flavors[1].id).AndReturn(None)
+        novaclient = self.stub_novaclient()
+        novaclient.flavors = self.mox.CreateMockAnything()
+        novaclient.flavors.get(flavors[1].id).AndReturn(flavors[1])
+        self.mox.ReplayAll()
+
+        # Instances sharing a flavor only look it up once.
+        ret_val = api.nova.flavor_get_by_ids(self.request,
+                                             [flavors[1].id] * 3, [])
+        self.assertEqual([flavors[1].id], ret_val.keys())
+
+    def test_flavor_get_by_ids_partial_failure(self):
+        flavors = self.flavors.list()
+        novaclient = self.stub_novaclient()
+        novaclient.flavors = self.mox.CreateMockAnything()
+        novaclient.flavors.get(flavors[0].id).AndRaise(self.exceptions.nova)
+        novaclient.flavors.get(flavors[1].id).AndReturn(flavors[1])
+        self.mox.ReplayAll()
+
+        # The flavors which could be fetched are kept.
+        ret_val = api.nova.flavor_get_by_ids(
+            self.request, [flavors[0].id, flavors[1].id], [])
+        self.assertEqual([flavors[1].id], ret_val.keys())
@@ -0,0 +1,115 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from __future__ import absolute_import
+
+from django import http
+from django.test.utils import override_settings
+
+from openstack_dashboard.api import cache
+from openstack_dashboard.api import profiler
+from openstack_dashboard.api import resilience
+from openstack_dashboard.test import helpers as test
+
+
+def user_create(request, name, password=None):
+    return name
+
+
+def user_list(request):
+    return [user_get(request, 'u1'), user_get(request, 'u2')]
+
+
+def user_get(request, user_id):
+    if user_id == 'missing':
+        raise ValueError(user_id)
+    return user_id
+
+
+user_create = profiler.profiled('keystone.user_create', user_create)
+user_list = profiler.profiled('keystone.user_list', user_list)
+user_get = profiler.profiled('keystone.user_get', user_get)
+
+
+class ProfilerTests(test.APITestCase):
+
+    def test_calls_not_recorded_without_profile(self):
+        request = http.HttpRequest()
+        self.assertEqual('u1', user_get(request, 'u1'))
+        self.assertIsNone(profiler.get_profile(request))
+
+    def test_calls_recorded(self):
+        request = http.HttpRequest()
+        profile = profiler.start(request)
+
+        user_list(request)
+
+        names = [(call['name'], call['depth']) for call in profile.calls]
+        self.assertEqual([('keystone.user_get', 1),
+                          ('keystone.user_get', 1),
+                          ('keystone.user_list', 0)], names)
+        self.assertEqual("'u1'", profile.calls[0]['args'])
+        self.assertEqual(profile.calls[2]['duration'], profile.total())
+        self.assertEqual(['keystone.user_get', 'keystone.user_list'],
+                         sorted(name for name, count, duration
+                                in profile.summary()))
+
+    def test_error_recorded(self):
+        request = http.HttpRequest()
+        profile = profiler.start(request)
+
+        self.assertRaises(ValueError, user_get, request, 'missing')
+        self.assertEqual('ValueError', profile.calls[0]['error'])
+
+    def test_sensitive_arguments_hidden(self):
+        request = http.HttpRequest()
+        profile = profiler.start(request)
+
+        user_create(request, 'demo', 'secret')
+        user_create(request, 'demo', password='secret')
+
+        self.assertEqual("'demo', ***", profile.calls[0]['args'])
+        self.assertEqual("'demo', password=***", profile.calls[1]['args'])
+
+    @override_settings(OPENSTACK_API_RESILIENCE={'enabled': True})
+    def test_sensitive_arguments_hidden_through_other_layers(self):
+        # The API functions are wrapped by the API cache and by resilience
+        # before being profiled.
+        def credentials_update(request, user, password, secret, token):
+            return user
+
+        wrapped = cache.invalidates('users')(credentials_update)
+        wrapped = resilience.guarded('identity', wrapped)
+        wrapped = profiler.profiled('keystone.credentials_update', wrapped)
+        request = http.HttpRequest()
+        request.user = self.request.user
+        profile = profiler.start(request)
+
+        wrapped(request, 'u1', 'S3cretPW', 's3cret', 't0ken')
+
+        self.assertEqual("'u1', ***, ***, ***", profile.calls[0]['args'])
+
+    @override_settings(OPENSTACK_API_CACHE={'enabled': True})
+    def test_cache_hits_recorded(self):
+        cache._get_backend().clear()
+        flavors = [{'id': '1', 'name': 'm1.tiny'}]
+        flavor_list = profiler.profiled(
+            'nova.flavor_list',
+            cache.cached('flavors', 'compute')(lambda request: flavors))
+        profile = None
+        for i in range(2):
+            request = http.HttpRequest()
+            request.user = self.request.user
+            profile = profiler.start(request)
+            flavor_list(request)
+            self.assertEqual('miss' if i == 0 else 'hit',
+                             profile.calls[0]['cache'])
@@ -0,0 +1,160 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from __future__ import absolute_import
+
+import time
+
+from django.test.utils import override_settings
+from keystoneclient import exceptions as keystone_exceptions
+from novaclient import exceptions as nova_exceptions
+import requests
+
+from horizon import exceptions
+
+from openstack_dashboard.api import base
+from openstack_dashboard.api import connection_pool
+from openstack_dashboard.api import resilience
+from openstack_dashboard.test import helpers as test
+
+
+class Server(object):
+    """Answers like a nova server would, or raises a new instance of the
+    given error.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.error = None
+        self.timeouts = []
+
+    def server_list(self, request):
+        self.calls += 1
+        self.timeouts.append(resilience.get_timeout())
+        if self.error is not None:
+            raise self.error()
+        return []
+
+
+@override_settings(OPENSTACK_API_RESILIENCE={'enabled': True,
+                                             'timeouts': {'compute': 10},
+                                             'failure_threshold': 2,
+                                             'cooldown': 30})
+class ResilienceTests(test.APITestCase):
+
+    def setUp(self):
+        super(ResilienceTests, self).setUp()
+        resilience.reset()
+        self.addCleanup(resilience.reset)
+        self.server = Server()
+        self.server_list = resilience.guarded('compute',
+                                              self.server.server_list)
+
+    def test_is_failure(self):
+        self.assertTrue(resilience.is_failure(requests.ConnectionError()))
+        self.assertTrue(resilience.is_failure(
+            keystone_exceptions.RequestTimeout()))
+        self.assertTrue(resilience.is_failure(
+            nova_exceptions.ClientException(503)))
+        self.assertFalse(resilience.is_failure(
+            nova_exceptions.NotFound(404)))
+        self.assertFalse(resilience.is_failure(ValueError()))
+
+    def test_service_timeout(self):
+        self.server_list(self.request)
+        self.assertEqual([10], self.server.timeouts)
+        self.assertIsNone(resilience.get_timeout())
+        self.assertEqual(10, resilience.get_service_timeout('compute'))
+        self.assertIsNone(resilience.get_service_timeout('volume'))
+
+    def test_circuit_opens_after_failures(self):
+        self.server.error = requests.ConnectionError
+        for i in range(2):
+            self.assertRaises(requests.ConnectionError,
+                              self.server_list, self.request)
+        # The endpoint is not called anymore, and the error is recoverable.
+        self.assertRaises(resilience.ServiceUnavailable,
+                          self.server_list, self.request)
+        self.assertEqual(2, self.server.calls)
+        self.assertTrue(issubclass(resilience.ServiceUnavailable,
+                                   exceptions.RECOVERABLE))
+
+    def test_circuit_closes_after_cooldown(self):
+        self.server.error = requests.ConnectionError
+        for i in range(2):
+            self.assertRaises(requests.ConnectionError,
+                              self.server_list, self.request)
+        circuit = resilience.get_circuit(base.url_for(self.request,
+                                                      'compute'))
+        circuit.opened_at -= 30
+        self.server.error = None
+        self.assertEqual([], self.server_list(self.request))
+        self.assertEqual([], self.server_list(self.request))
+        self.assertEqual(4, self.server.calls)
+
+    def test_errors_of_the_call_are_not_failures(self):
+        self.server.error = lambda: nova_exceptions.NotFound(404)
+        for i in range(3):
+            self.assertRaises(nova_exceptions.NotFound,
+                              self.server_list, self.request)
+        self.assertEqual(3, self.server.calls)
+
+    def test_nested_failure_counted_once(self):
+        self.server.error = requests.ConnectionError
+        volume_list = resilience.guarded(
+            'volume', lambda request: self.server_list(request))
+        for i in range(2):
+            self.assertRaises(requests.ConnectionError,
+                              volume_list, self.request)
+        self.assertRaises(resilience.ServiceUnavailable,
+                          self.server_list, self.request)
+        self.assertRaises(resilience.ServiceUnavailable,
+                          volume_list, self.request)
+        self.assertEqual(2, self.server.calls)
+        # Only the endpoint which failed is suspended.
+        circuit = resilience.get_circuit(base.url_for(self.request,
+                                                      'volume'))
+        self.assertEqual(0, circuit.failures)
+
+    @override_settings(OPENSTACK_API_RESILIENCE={'enabled': True,
+                                                 'timeouts': {'compute': 10},
+                                                 'request_budget': 5})
+    def test_request_budget(self):
+        resilience.start(self.request)
+        self.server_list(self.request)
+        self.assertTrue(0 < self.server.timeouts[0] <= 5)
+
+        setattr(self.request, resilience.DEADLINE_ATTR, time.time() - 1)
+        self.assertRaises(resilience.ServiceUnavailable,
+                          self.server_list, self.request)
+        self.assertEqual(1, self.server.calls)
+
+    @override_settings(OPENSTACK_API_RESILIENCE={'enabled': False})
+    def test_disabled(self):
+        self.server.error = requests.ConnectionError
+        for i in range(3):
+            self.assertRaises(requests.ConnectionError,
+                              self.server_list, self.request)
+        self.assertEqual([None] * 3, self.server.timeouts)
+
+    def test_adapter_applies_timeout(self):
+        self.mox.StubOutWithMock(requests.adapters.HTTPAdapter, 'send')
+        requests.adapters.HTTPAdapter.send('request', timeout=10)
+        requests.adapters.HTTPAdapter.send('request', timeout=3)
+        self.mox.ReplayAll()
+
+        adapter = connection_pool.HTTPAdapter()
+
+        def send(request):
+            adapter.send('request', timeout=600)
+            adapter.send('request', timeout=3)
+        resilience.guarded('compute', send)(self.request)
@@ -138,6 +138,27 @@ class SwiftApiTests(test.APITestCase):
                                          object.name)
         self.assertEqual(object.name, obj.name)
 
+    def test_swift_get_object_in_chunks(self):
+        container = self.containers.first()
+        object = self.objects.first()
+
+        swift_api = self.stub_swiftclient()
+        swift_api.get_object(container.name, object.name,
+                             resp_chunk_size=4,
+                             headers={'Range': 'bytes=0-7'}) \
+            .AndReturn([{'content-range': 'bytes 0-7/9'},
+                        iter(['Fake', ' Dat'])])
+
+        self.mox.ReplayAll()
+
+        obj = api.swift.swift_get_object(self.request,
+                                         container.name,
+                                         object.name,
+                                         resp_chunk_size=4,
+                                         extra_headers={'Range': 'bytes=0-7'})
+        self.assertEqual(['Fake', ' Dat'], list(obj.data))
+        self.assertEqual('bytes 0-7/9', obj.content_range)
+
     def test_swift_get_object_without_data(self):
         container = self.containers.first()
         object = self.objects.first()
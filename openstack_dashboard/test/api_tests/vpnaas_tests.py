@@ -65,6 +65,38 @@ class VPNaasApiTests(test.APITestCase):
             self.assertTrue(v.name, d.name)
             self.assertTrue(v.id)
 
+    @test.create_stubs({neutronclient: ('list_ipsec_site_connections',
+                                        'list_ikepolicies',
+                                        'list_ipsecpolicies',
+                                        'list_vpnservices'),
+                        api.neutron: ('subnet_list', 'router_list')})
+    def test_lists_share_listings(self):
+        tenant_id = self.request.user.tenant_id
+        neutronclient.list_ipsec_site_connections(
+            tenant_id=tenant_id).AndReturn(
+                {'ipsec_site_connections':
+                 self.api_ipsecsiteconnections.list()})
+        neutronclient.list_ikepolicies(tenant_id=tenant_id).AndReturn(
+            {'ikepolicies': self.api_ikepolicies.list()})
+        neutronclient.list_ipsecpolicies(tenant_id=tenant_id).AndReturn(
+            {'ipsecpolicies': self.api_ipsecpolicies.list()})
+        neutronclient.list_vpnservices(tenant_id=tenant_id).AndReturn(
+            {'vpnservices': self.api_vpnservices.list()})
+        api.neutron.subnet_list(self.request).AndReturn(self.subnets.list())
+        api.neutron.router_list(self.request).AndReturn(self.routers.list())
+        self.mox.ReplayAll()
+
+        api.vpn.ipsecsiteconnection_list(self.request, tenant_id=tenant_id)
+        vpnservices = api.vpn.vpnservice_list(self.request,
+                                              tenant_id=tenant_id)
+        api.vpn.ikepolicy_list(self.request, tenant_id=tenant_id)
+        api.vpn.ipsecpolicy_list(self.request, tenant_id=tenant_id)
+        for s in vpnservices:
+            self.assertEqual(
+                [c['id'] for c in self.api_ipsecsiteconnections.list()
+                 if c['vpnservice_id'] == s.id],
+                s.ipsecsiteconns)
+
     @test.create_stubs({neutronclient: ('show_vpnservice',
                                         'list_ipsec_site_connections'),
                         api.neutron: ('subnet_get', 'router_get')})
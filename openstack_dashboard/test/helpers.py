@@ -383,18 +383,18 @@ class APITestCase(TestCase):
 
     def stub_swiftclient(self, expected_calls=1):
         if not hasattr(self, "swiftclient"):
-            self.mox.StubOutWithMock(swift_client, 'Connection')
+            self.mox.StubOutWithMock(api.swift, 'Connection')
             self.swiftclient = self.mox.CreateMock(swift_client.Connection)
             while expected_calls:
-                swift_client.Connection(None,
-                                        mox.IgnoreArg(),
-                                        None,
-                                        preauthtoken=mox.IgnoreArg(),
-                                        preauthurl=mox.IgnoreArg(),
-                                        cacert=None,
-                                        insecure=False,
-                                        auth_version="2.0") \
-                            .AndReturn(self.swiftclient)
+                api.swift.Connection(None,
+                                     mox.IgnoreArg(),
+                                     None,
+                                     preauthtoken=mox.IgnoreArg(),
+                                     preauthurl=mox.IgnoreArg(),
+                                     cacert=None,
+                                     insecure=False,
+                                     auth_version="2.0") \
+                    .AndReturn(self.swiftclient)
                 expected_calls -= 1
         return self.swiftclient
 
@@ -69,8 +69,14 @@ HORIZON_CONFIG = {
                    'unauthorized': exceptions.UNAUTHORIZED},
     'angular_modules': [],
     'js_files': [],
+    # Run API calls in the test's thread so that the order of the calls
+    # made on mox stubs is deterministic.
+    'parallel_workers': 0,
 }
 
+# Likewise for the Ceilometer statistics calls.
+CEILOMETER_STATISTICS_WORKERS = 0
+
 # Set to True to allow users to upload images to glance via Horizon server.
 # When enabled, a file form field will appear on the create image form.
 # See documentation for deployment considerations.
@@ -85,6 +91,11 @@ OPENSTACK_API_VERSIONS = {
     "identity": 3
 }
 
+# Tests mock the extension listings, they must not be shared between tests.
+OPENSTACK_CAPABILITIES = {
+    'enabled': False,
+}
+
 OPENSTACK_KEYSTONE_URL = "http://localhost:5000/v2.0"
 OPENSTACK_KEYSTONE_DEFAULT_ROLE = "_member_"
 
@@ -0,0 +1,93 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from django.core.exceptions import MiddlewareNotUsed
+from django import http
+from django.test.utils import override_settings
+
+from openstack_dashboard.api import profiler
+from openstack_dashboard.api import resilience
+from openstack_dashboard import middleware
+from openstack_dashboard.test import helpers as test
+
+
+def server_list(request):
+    return []
+
+
+server_list = profiler.profiled('nova.server_list', server_list)
+
+
+class APIProfilerMiddlewareTests(test.TestCase):
+
+    def _get_response(self, content_type='text/html'):
+        self.mox.StubOutWithMock(profiler, 'install')
+        profiler.install()
+        self.mox.ReplayAll()
+
+        mw = middleware.APIProfilerMiddleware()
+        request = http.HttpRequest()
+        request.method = 'GET'
+        request.path = '/project/instances/'
+        mw.process_request(request)
+        server_list(request)
+        server_list(request)
+        response = http.HttpResponse('<html><body></body></html>',
+                                     content_type=content_type)
+        return mw.process_response(request, response)
+
+    @override_settings(OPENSTACK_PROFILER={'enabled': False})
+    def test_disabled(self):
+        self.assertRaises(MiddlewareNotUsed, middleware.APIProfilerMiddleware)
+
+    @override_settings(OPENSTACK_PROFILER={'enabled': True})
+    def test_server_timing(self):
+        response = self._get_response()
+        self.assertTrue(response['Server-Timing'].startswith('api;dur='))
+        self.assertIn('nova.server_list;dur=', response['Server-Timing'])
+        self.assertIn('desc="2 calls"', response['Server-Timing'])
+        self.assertNotIn('api_profile', response.content)
+
+    @override_settings(OPENSTACK_PROFILER={'enabled': True,
+                                           'server_timing': False,
+                                           'overlay': True})
+    def test_overlay(self):
+        response = self._get_response()
+        self.assertFalse(response.has_header('Server-Timing'))
+        self.assertIn('id="api_profile"', response.content)
+        self.assertIn('nova.server_list', response.content)
+        self.assertTrue(response.content.endswith('</body></html>'))
+
+    @override_settings(OPENSTACK_PROFILER={'enabled': True, 'overlay': True})
+    def test_overlay_only_in_html(self):
+        response = self._get_response(content_type='application/json')
+        self.assertNotIn('api_profile', response.content)
+
+
+class APIResilienceMiddlewareTests(test.TestCase):
+
+    @override_settings(OPENSTACK_API_RESILIENCE={'enabled': False})
+    def test_disabled(self):
+        self.assertRaises(MiddlewareNotUsed,
+                          middleware.APIResilienceMiddleware)
+
+    @override_settings(OPENSTACK_API_RESILIENCE={'enabled': True,
+                                                 'request_budget': 30})
+    def test_budget_started(self):
+        self.mox.StubOutWithMock(resilience, 'install')
+        resilience.install()
+        self.mox.ReplayAll()
+
+        mw = middleware.APIResilienceMiddleware()
+        request = http.HttpRequest()
+        mw.process_request(request)
+        self.assertTrue(hasattr(request, resilience.DEADLINE_ATTR))
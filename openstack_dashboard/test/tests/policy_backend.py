@@ -11,7 +11,10 @@
 #    under the License.
 
 from django.test.utils import override_settings
+from mox import IsA  # noqa
+from openstack_auth import utils as auth_utils
 
+from openstack_dashboard.openstack.common import policy as common_policy
 from openstack_dashboard import policy
 from openstack_dashboard import policy_backend
 from openstack_dashboard.test import helpers as test
@@ -69,6 +72,66 @@ class PolicyBackendTestCase(test.TestCase):
                              request=self.request)
         self.assertTrue(value)
 
+    def test_compiled_rules_match_enforcer(self):
+        policy_backend.reset()
+        credentials = policy_backend._user_to_credentials(
+            self.request, auth_utils.get_user(self.request))
+        admin_credentials = dict(credentials, roles=['admin'])
+        targets = ({'project_id': credentials['project_id'],
+                    'user_id': credentials['user_id'],
+                    'domain_id': credentials['domain_id']},
+                   {'project_id': 'other', 'user_id': 'other',
+                    'domain_id': 'other'})
+        for scope, enforcer in policy_backend._get_enforcer().items():
+            enforcer.load_rules()
+            for name in enforcer.rules:
+                for creds in (credentials, admin_credentials):
+                    for target in targets:
+                        self.assertEqual(
+                            bool(enforcer.enforce(name, target, creds)),
+                            bool(policy_backend._enforce(
+                                scope, enforcer, name, target, creds)),
+                            "%s %s" % (scope, name))
+
+    @override_settings(POLICY_CHECK_FUNCTION=policy_backend.check)
+    def test_decisions_cached_per_request(self):
+        policy_backend.reset()
+        enforcer = policy_backend._get_enforcer()
+        self.mox.StubOutWithMock(policy_backend, '_enforce')
+        policy_backend._enforce('identity', enforcer['identity'],
+                                'admin_required', {'project_id': '1',
+                                                   'user_id': '1',
+                                                   'domain_id': '1'},
+                                IsA(dict)).AndReturn(True)
+        policy_backend._enforce('identity', enforcer['identity'],
+                                'admin_required', {'project_id': '2',
+                                                   'user_id': '1',
+                                                   'domain_id': '1'},
+                                IsA(dict)).AndReturn(False)
+        self.mox.ReplayAll()
+
+        for project_id in ('1', '1', '2', '2'):
+            target = {'project_id': project_id, 'user_id': '1',
+                      'domain_id': '1'}
+            value = policy.check((("identity", "admin_required"),),
+                                 request=self.request, target=target)
+            self.assertEqual(project_id == '1', value)
+
+    @override_settings(POLICY_CHECK_FUNCTION=policy_backend.check)
+    def test_rules_compiled_again_on_reload(self):
+        policy_backend.reset()
+        enforcer = policy_backend._get_enforcer()['identity']
+        self.assertFalse(policy.check((("identity", "admin_required"),),
+                                      request=self.request))
+        enforcer.set_rules({'admin_required': common_policy.TrueCheck()})
+        self.addCleanup(policy_backend.reset)
+        # The decision lasts as long as the request.
+        self.assertFalse(policy.check((("identity", "admin_required"),),
+                                      request=self.request))
+        self._setup_request()
+        self.assertTrue(policy.check((("identity", "admin_required"),),
+                                     request=self.request))
+
 
 class PolicyBackendTestCaseAdmin(test.BaseAdminViewTests):
     @override_settings(POLICY_CHECK_FUNCTION=policy_backend.check)
@@ -20,9 +20,11 @@
 from __future__ import absolute_import
 
 from django import http
+from django.test.utils import override_settings
 from mox import IsA  # noqa
 
 from openstack_dashboard import api
+from openstack_dashboard.api import cache
 from openstack_dashboard.api import cinder
 from openstack_dashboard.test import helpers as test
 from openstack_dashboard.usage import quotas
@@ -263,3 +265,44 @@ class QuotaTests(test.APITestCase):
 
         # Compare internal structure of usages to expected.
         self.assertItemsEqual(expected_output, quota_usages.usages)
+
+    @override_settings(OPENSTACK_API_CACHE={'enabled': True})
+    @test.create_stubs({api.nova: ('server_list',
+                                   'flavor_list',
+                                   'tenant_quota_get',),
+                        api.network: ('tenant_floating_ip_list',
+                                      'floating_ip_supported'),
+                        api.base: ('is_service_enabled',)})
+    def test_tenant_quota_usages_cached(self):
+        cache._get_backend().clear()
+        servers = [s for s in self.servers.list()
+                   if s.tenant_id == self.request.user.tenant_id]
+
+        api.base.is_service_enabled(IsA(http.HttpRequest),
+                                    'volume').AndReturn(False)
+        api.base.is_service_enabled(IsA(http.HttpRequest),
+                                    'network').AndReturn(False)
+        api.nova.flavor_list(IsA(http.HttpRequest)) \
+            .AndReturn(self.flavors.list())
+        api.nova.tenant_quota_get(IsA(http.HttpRequest), '1') \
+            .AndReturn(self.quotas.first())
+        api.network.floating_ip_supported(IsA(http.HttpRequest)) \
+            .AndReturn(True)
+        api.network.tenant_floating_ip_list(IsA(http.HttpRequest)) \
+            .AndReturn(self.floating_ips.list())
+        search_opts = {'tenant_id': self.request.user.tenant_id}
+        api.nova.server_list(IsA(http.HttpRequest), search_opts=search_opts,
+                             all_tenants=True) \
+            .AndReturn([servers, False])
+
+        self.mox.ReplayAll()
+
+        # @memoized caches per request, so a new request is needed to reach
+        # the shared cache.
+        quotas.tenant_quota_usages(self.request)
+        request = http.HttpRequest()
+        request.user = self.request.user
+        quota_usages = quotas.tenant_quota_usages(request)
+        expected_output = self.get_usages(with_volume=False)
+
+        self.assertItemsEqual(expected_output, quota_usages.usages)
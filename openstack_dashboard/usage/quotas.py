@@ -18,8 +18,10 @@ from django.utils.translation import ugettext_lazy as _
 
 from horizon import exceptions
 from horizon.utils.memoized import memoized  # noqa
+from horizon.utils import parallel
 
 from openstack_dashboard.api import base
+from openstack_dashboard.api import cache
 from openstack_dashboard.api import cinder
 from openstack_dashboard.api import network
 from openstack_dashboard.api import neutron
@@ -252,7 +254,7 @@ def get_disabled_quotas(request):
     return disabled_quotas
 
 
-def _get_tenant_compute_usages(request, usages, disabled_quotas, tenant_id):
+def _get_tenant_compute_usages(request, disabled_quotas, tenant_id):
     if tenant_id:
         instances, has_more = nova.server_list(
             request, search_opts={'tenant_id': tenant_id}, all_tenants=True)
@@ -260,83 +262,112 @@ def _get_tenant_compute_usages(request, usages, disabled_quotas, tenant_id):
         instances, has_more = nova.server_list(request)
 
     # Fetch deleted flavors if necessary.
-    flavors = dict([(f.id, f) for f in nova.flavor_list(request)])
-    missing_flavors = [instance.flavor['id'] for instance in instances
-                       if instance.flavor['id'] not in flavors]
-    for missing in missing_flavors:
-        if missing not in flavors:
-            try:
-                flavors[missing] = nova.flavor_get(request, missing)
-            except Exception:
-                flavors[missing] = {}
-                exceptions.handle(request, ignore=True)
-
-    usages.tally('instances', len(instances))
-
-    # Sum our usage based on the flavors of the instances.
-    for flavor in [flavors[instance.flavor['id']] for instance in instances]:
-        usages.tally('cores', getattr(flavor, 'vcpus', None))
-        usages.tally('ram', getattr(flavor, 'ram', None))
-
-    # Initialise the tally if no instances have been launched yet
-    if len(instances) == 0:
-        usages.tally('cores', 0)
-        usages.tally('ram', 0)
-
-
-def _get_tenant_network_usages(request, usages, disabled_quotas, tenant_id):
+    flavor_list = nova.flavor_list(request)
+    flavor_ids = [instance.flavor['id'] for instance in instances]
+    try:
+        flavors = nova.flavor_get_by_ids(request, flavor_ids, flavor_list)
+    except Exception:
+        flavors = dict([(f.id, f) for f in flavor_list])
+        exceptions.handle(request, ignore=True)
+
+    # Sum our usage based on the flavors of the instances. The tally is
+    # initialised even if no instances have been launched yet.
+    instance_flavors = [flavors.get(instance.flavor['id'], {})
+                        for instance in instances]
+    return [('instances', len(instances)),
+            ('cores', sum([getattr(flavor, 'vcpus', None) or 0
+                           for flavor in instance_flavors])),
+            ('ram', sum([getattr(flavor, 'ram', None) or 0
+                         for flavor in instance_flavors]))]
+
+
+def _get_tenant_floating_ip_usages(request, disabled_quotas, tenant_id):
     floating_ips = []
     try:
         if network.floating_ip_supported(request):
             floating_ips = network.tenant_floating_ip_list(request)
     except Exception:
         pass
-    usages.tally('floating_ips', len(floating_ips))
+    return [('floating_ips', len(floating_ips))]
+
 
-    if 'security_group' not in disabled_quotas:
-        security_groups = []
-        security_groups = network.security_group_list(request)
-        usages.tally('security_groups', len(security_groups))
+def _get_tenant_security_group_usages(request, disabled_quotas, tenant_id):
+    if 'security_group' in disabled_quotas:
+        return []
+    security_groups = network.security_group_list(request)
+    return [('security_groups', len(security_groups))]
 
+
+def _get_tenant_network_usages(request, disabled_quotas, tenant_id):
+    # Only the number of resources is needed, so neutron is asked for their
+    # IDs only, and filters them by owner itself.
+    usages = []
     if 'network' not in disabled_quotas:
-        networks = []
-        networks = neutron.network_list(request, shared=False)
-        if tenant_id:
-            networks = filter(lambda net: net.tenant_id == tenant_id, networks)
-        usages.tally('networks', len(networks))
-
-    if 'subnet' not in disabled_quotas:
-        subnets = []
-        subnets = neutron.subnet_list(request)
-        usages.tally('subnets', len(subnets))
-
-    if 'router' not in disabled_quotas:
-        routers = []
-        routers = neutron.router_list(request)
-        if tenant_id:
-            routers = filter(lambda rou: rou.tenant_id == tenant_id, routers)
-        usages.tally('routers', len(routers))
-
-
-def _get_tenant_volume_usages(request, usages, disabled_quotas, tenant_id):
-    if 'volumes' not in disabled_quotas:
-        if tenant_id:
-            opts = {'alltenants': 1, 'tenant_id': tenant_id}
-            volumes = cinder.volume_list(request, opts)
-            snapshots = cinder.volume_snapshot_list(request, opts)
-        else:
-            volumes = cinder.volume_list(request)
-            snapshots = cinder.volume_snapshot_list(request)
-        usages.tally('gigabytes', sum([int(v.size) for v in volumes]))
-        usages.tally('volumes', len(volumes))
-        usages.tally('snapshots', len(snapshots))
+        params = {'tenant_id': tenant_id} if tenant_id else {}
+        usages.append(('networks', neutron.resource_count(
+            request, 'network', shared=False, **params)))
+    return usages
+
+
+def _get_tenant_subnet_usages(request, disabled_quotas, tenant_id):
+    if 'subnet' in disabled_quotas:
+        return []
+    params = {'tenant_id': tenant_id} if tenant_id else {}
+    return [('subnets', neutron.resource_count(request, 'subnet', **params))]
+
+
+def _get_tenant_router_usages(request, disabled_quotas, tenant_id):
+    if 'router' in disabled_quotas:
+        return []
+    params = {'tenant_id': tenant_id} if tenant_id else {}
+    return [('routers', neutron.resource_count(request, 'router', **params))]
+
+
+def _get_tenant_volume_usages(request, disabled_quotas, tenant_id):
+    if 'volumes' in disabled_quotas:
+        return []
+    if tenant_id:
+        opts = {'alltenants': 1, 'tenant_id': tenant_id}
+        volumes = cinder.volume_list(request, opts)
+    else:
+        volumes = cinder.volume_list(request)
+    return [('gigabytes', sum([int(v.size) for v in volumes])),
+            ('volumes', len(volumes))]
+
+
+def _get_tenant_snapshot_usages(request, disabled_quotas, tenant_id):
+    if 'volumes' in disabled_quotas:
+        return []
+    if tenant_id:
+        opts = {'alltenants': 1, 'tenant_id': tenant_id}
+        snapshots = cinder.volume_snapshot_list(request, opts)
+    else:
+        snapshots = cinder.volume_snapshot_list(request)
+    return [('snapshots', len(snapshots))]
+
+
+# Each collector returns a list of (quota name, used) pairs. They are
+# independent from each other and run concurrently.
+USAGE_COLLECTORS = (_get_tenant_compute_usages,
+                    _get_tenant_floating_ip_usages,
+                    _get_tenant_security_group_usages,
+                    _get_tenant_network_usages,
+                    _get_tenant_subnet_usages,
+                    _get_tenant_router_usages,
+                    _get_tenant_volume_usages,
+                    _get_tenant_snapshot_usages)
 
 
 @memoized
+@cache.cached('quota_usages', 'compute', timeout=30)
 def tenant_quota_usages(request, tenant_id=None):
     """Get our quotas and construct our usage object.
     If no tenant_id is provided, a the request.user.project_id
-    is assumed to be used
+    is assumed to be used.
+
+    The quotas and the usages of every service are retrieved concurrently.
+    If the API cache is enabled, the result is cached for a short time and
+    invalidated by the API calls creating or deleting resources.
     """
     if not tenant_id:
         tenant_id = request.user.project_id
@@ -344,15 +375,18 @@ def tenant_quota_usages(request, tenant_id=None):
     disabled_quotas = get_disabled_quotas(request)
     usages = QuotaUsage()
 
-    for quota in get_tenant_quota_data(request,
-                                       disabled_quotas=disabled_quotas,
-                                       tenant_id=tenant_id):
+    args = (request, disabled_quotas, tenant_id)
+    results = parallel.call_parallel(
+        (get_tenant_quota_data, (request,),
+         {'disabled_quotas': disabled_quotas, 'tenant_id': tenant_id}),
+        *[(collector, args) for collector in USAGE_COLLECTORS])
+
+    for quota in results[0]:
         usages.add_quota(quota)
 
     # Get our usages.
-    _get_tenant_compute_usages(request, usages, disabled_quotas, tenant_id)
-    _get_tenant_network_usages(request, usages, disabled_quotas, tenant_id)
-    _get_tenant_volume_usages(request, usages, disabled_quotas, tenant_id)
+    for name, used in itertools.chain(*results[1:]):
+        usages.tally(name, used)
 
     return usages
 
@@ -10,9 +10,14 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import array
+import calendar
 import datetime
 import logging
+import math
+import time
 
+from django.conf import settings
 from django.utils import timezone
 from django.utils.translation import ugettext_lazy as _
 import pytz
@@ -20,10 +25,31 @@ import pytz
 from horizon.utils import units
 
 from openstack_dashboard import api
+from openstack_dashboard.api import cache
 
 
 LOG = logging.getLogger(__name__)
 
+DAY = 3600 * 24
+
+# The statistics of the days which are over never change.
+cache.register('metering_days', 'metering', timeout=7 * DAY)
+
+# The namespaces of the API cache holding the names of the resources charted,
+# by API type of METER_API_MAPPINGS.
+NAME_NAMESPACES = {
+    'nova': 'server_names',
+    'glance': 'image_names',
+}
+cache.register('server_names', 'compute', timeout=600)
+cache.register('image_names', 'image', timeout=600)
+
+# The statistics of the charted periods which are over, see TimeSeries.
+cache.register('metering_series', 'metering', timeout=7 * DAY)
+
+# The attributes of the statistics kept by TimeSeries.
+STATISTIC_ATTRS = ('avg', 'max', 'min', 'sum', 'count')
+
 
 METER_API_MAPPINGS = {
     "instance": 'nova',
@@ -89,12 +115,16 @@ def calc_date_args(date_from, date_to, date_options):
     return date_from, date_to
 
 
+def _get_api_type(meter_name):
+    meter_name = 'instance' if "instance" in meter_name else meter_name
+    return METER_API_MAPPINGS.get(meter_name, '')
+
+
 def get_resource_name(request, resource_id, resource_name, meter_name):
     resource = None
     try:
         if resource_name == "resource_id":
-            meter_name = 'instance' if "instance" in meter_name else meter_name
-            api_type = METER_API_MAPPINGS.get(meter_name, '')
+            api_type = _get_api_type(meter_name)
             if api_type == 'nova':
                 resource = api.nova.server_get(request, resource_id)
             elif api_type == 'glance':
@@ -106,29 +136,94 @@ def get_resource_name(request, resource_id, resource_name, meter_name):
     return resource.name if resource else resource_id
 
 
+def _list_resources(request, api_type):
+    """Returns the servers or the images, and whether the listing may have
+    been truncated.
+    """
+    if api_type == 'nova':
+        resources, more = api.nova.server_list(request, all_tenants=True)
+    else:
+        # Like the admin images panel, the private images are listed too.
+        resources, more, prev = api.glance.image_list_detailed(
+            request, filters={'is_public': None})
+    limit = getattr(settings, 'API_RESULT_LIMIT', 1000)
+    return resources, more or len(resources) >= limit
+
+
+def get_resource_names(request, resource_ids, meter_name):
+    """Returns the names of the resources of a meter, by resource id.
+
+    Rather than getting the servers or images one by one, they are listed
+    once, and their names are kept in the API cache. Resources which are
+    not listed (e.g. deleted ones) are named after their id, and are only
+    got one by one if the listing may have been truncated. Such a fallback
+    name is not cached, so the resource is looked up again next time.
+    """
+    names = dict((resource_id, resource_id) for resource_id in resource_ids)
+    api_type = _get_api_type(meter_name)
+    namespace = NAME_NAMESPACES.get(api_type)
+    if namespace is None:
+        return names
+
+    missing = set()
+    for resource_id in names:
+        name = cache.get_value(request, namespace, resource_id)
+        if name is None:
+            missing.add(resource_id)
+        else:
+            names[resource_id] = name
+    if not missing:
+        return names
+
+    try:
+        resources, truncated = _list_resources(request, api_type)
+    except Exception:
+        LOG.info(_("Failed to list the resources to name."), exc_info=True)
+        return names
+    found = dict((resource.id, resource.name) for resource in resources
+                 if resource.id in missing)
+    for resource_id in missing:
+        if resource_id in found:
+            name = found[resource_id] or resource_id
+        elif truncated:
+            name = get_resource_name(request, resource_id, 'resource_id',
+                                     meter_name)
+            if name == resource_id:
+                continue
+        else:
+            continue
+        names[resource_id] = name
+        cache.set_value(request, namespace, name, resource_id)
+    return names
+
+
 def series_for_meter(request, aggregates, group_by, meter_id,
                      meter_name, stats_name, unit, label=None):
     """Construct datapoint series for a meter from resource aggregates."""
+    aggregates = [resource for resource in aggregates
+                  if resource.get_meter(meter_name)]
+    names = {}
+    if not label and group_by != "project":
+        names = get_resource_names(
+            request, [resource.resource_id for resource in aggregates],
+            meter_name)
     series = []
     for resource in aggregates:
-        if resource.get_meter(meter_name):
-            if label:
-                name = label
-            else:
-                resource_name = ('id' if group_by == "project"
-                                 else 'resource_id')
-                resource_id = getattr(resource, resource_name)
-                name = get_resource_name(request, resource_id,
-                                         resource_name, meter_name)
-            point = {'unit': unit,
-                     'name': name,
-                     'meter': meter_id,
-                     'data': []}
-            for statistic in resource.get_meter(meter_name):
-                date = statistic.duration_end[:19]
-                value = float(getattr(statistic, stats_name))
-                point['data'].append({'x': date, 'y': value})
-            series.append(point)
+        if label:
+            name = label
+        elif group_by == "project":
+            name = resource.id
+        else:
+            name = names[resource.resource_id]
+        point = {'unit': unit,
+                 'name': name,
+                 'meter': meter_id,
+                 'data': []}
+        for statistic in resource.get_meter(meter_name):
+            date = statistic.duration_end[:19]
+            value = float(getattr(statistic, stats_name))
+            point['data'].append({'x': date, 'y': value})
+        series.append(point)
     return series
 
 
@@ -165,11 +260,182 @@ def normalize_series_by_unit(series):
     return series
 
 
+def _to_timestamp(value):
+    """Returns the POSIX timestamp of a datetime, or of a date in the ISO
+    8601 format in UTC used by ceilometer.
+    """
+    if isinstance(value, basestring):
+        value = datetime.datetime.strptime(value[:19], "%Y-%m-%dT%H:%M:%S")
+    elif value.tzinfo is not None:
+        value = value.astimezone(pytz.utc).replace(tzinfo=None)
+    return calendar.timegm(value.timetuple())
+
+
+def _to_datetime(timestamp):
+    return pytz.utc.localize(datetime.datetime.utcfromtimestamp(timestamp))
+
+
+class Bucket(object):
+    """The statistics of one period, with the attributes of a ceilometer
+    statistic which the charts use.
+    """
+
+    def __init__(self, start, end, avg, max, min, sum, count):
+        self.start = start
+        self.end = end
+        self.avg = avg
+        self.max = max
+        self.min = min
+        self.sum = sum
+        self.count = count
+
+    @classmethod
+    def from_statistic(cls, statistic):
+        end = statistic.duration_end or statistic.period_end
+        return cls(_to_timestamp(statistic.period_start), _to_timestamp(end),
+                   *[float(getattr(statistic, attr, None) or 0)
+                     for attr in STATISTIC_ATTRS])
+
+    @classmethod
+    def merge(cls, buckets):
+        """Returns a bucket holding the statistics of consecutive buckets.
+        """
+        count = sum(bucket.count for bucket in buckets)
+        if count:
+            avg = sum(bucket.avg * bucket.count for bucket in buckets) / count
+        else:
+            avg = sum(bucket.avg for bucket in buckets) / len(buckets)
+        return cls(buckets[0].start, buckets[-1].end, avg,
+                   max(bucket.max for bucket in buckets),
+                   min(bucket.min for bucket in buckets),
+                   sum(bucket.sum for bucket in buckets), count)
+
+    @property
+    def period_start(self):
+        return _to_datetime(self.start).strftime("%Y-%m-%dT%H:%M:%S")
+
+    @property
+    def duration_end(self):
+        return _to_datetime(self.end).strftime("%Y-%m-%dT%H:%M:%S")
+
+
+class TimeSeries(object):
+    """The statistics of a meter over consecutive periods.
+
+    The series covers the periods from ``start`` to ``end``, which are
+    over, so their statistics do not change anymore: buckets are only ever
+    appended, as ``end`` moves forward. Each attribute of the buckets is
+    stored in an array, which keeps the series small in the cache.
+    """
+
+    def __init__(self, start, period):
+        self.start = start
+        self.end = start
+        self.period = period
+        self.columns = dict((name, array.array('d'))
+                            for name in ('start', 'end') + STATISTIC_ATTRS)
+
+    def __len__(self):
+        return len(self.columns['start'])
+
+    def extend(self, buckets, end):
+        """Appends the buckets of the periods from ``self.end`` to ``end``
+        and returns the other ones.
+        """
+        others = []
+        for bucket in buckets:
+            if self.end <= bucket.start < end:
+                for name, column in self.columns.items():
+                    column.append(getattr(bucket, name))
+            else:
+                others.append(bucket)
+        self.end = max(self.end, end)
+        return others
+
+    def buckets(self, start, end):
+        """Returns the buckets of the periods starting from ``start`` and
+        before ``end``.
+        """
+        columns = [self.columns[name]
+                   for name in ('start', 'end') + STATISTIC_ATTRS]
+        return [Bucket(*values) for values in zip(*columns)
+                if start <= values[0] < end]
+
+
+def downsample(buckets, max_points):
+    """Merges consecutive buckets, so that at most max_points are left."""
+    size = int(math.ceil(len(buckets) / float(max_points)))
+    if size <= 1:
+        return buckets
+    return [Bucket.merge(buckets[i:i + size])
+            for i in range(0, len(buckets), size)]
+
+
+def update_with_series(request, resources, meter_name, date_from, date_to,
+                       period, additional_query=None, max_points=400):
+    """Sets the statistics of a meter on resources, for charts.
+
+    Like
+    :meth:`~openstack_dashboard.api.ceilometer.CeilometerUsage.update_list_with_statistics`,
+    but periods start at multiples of ``period`` since the epoch, and the
+    statistics of each resource are kept in a :class:`TimeSeries` in the
+    ``"metering_series"`` namespace of the API cache. Only the periods
+    after the ones it holds are fetched, and the periods which are over are
+    then appended to it. A period is only taken to be over once the
+    ``CEILOMETER_SAMPLES_DELAY`` setting, and at least one more period, went
+    by, since its samples may be stored late. More than ``max_points``
+    periods are downsampled.
+    """
+    usage = api.ceilometer.CeilometerUsage(request)
+    start = _to_timestamp(date_from) // period * period
+    end = _to_timestamp(date_to)
+    # The periods before this instant are over, and all their samples are
+    # stored.
+    delay = max(period, getattr(settings, 'CEILOMETER_SAMPLES_DELAY', 600))
+    over = min(end, int(time.time()) - delay) // period * period
+
+    entries = []
+    calls = []
+    for resource in resources:
+        query = resource.query + (additional_query or [])
+        series = cache.get_value(request, 'metering_series', meter_name,
+                                 query, period)
+        if series is None or series.start > start:
+            series = TimeSeries(start, period)
+        fetch = series.end < end
+        entries.append((resource, query, series, fetch))
+        if fetch:
+            calls.append((None, meter_name,
+                          query + [{'field': 'timestamp', 'op': 'ge',
+                                    'value': _to_datetime(series.end)},
+                                   {'field': 'timestamp', 'op': 'le',
+                                    'value': date_to}],
+                          period))
+
+    statistics = usage.iter_statistics(calls)
+    for resource, query, series, fetch in entries:
+        recent = []
+        if fetch:
+            fetched = next(statistics)[1]
+            if fetched is not None:
+                recent = series.extend([Bucket.from_statistic(statistic)
+                                        for statistic in fetched], over)
+                cache.set_value(request, 'metering_series', series,
+                                meter_name, query, period)
+        buckets = downsample(series.buckets(start, end) + recent,
+                             max_points)
+        resource.set_meter(meter_name.replace(".", "_"), buckets)
+
+
 class ProjectAggregatesQuery(object):
     def __init__(self, request, date_from, date_to,
-                 period=None, additional_query=[]):
+                 period=None, additional_query=None):
         if not period:
             period = calc_period(date_from, date_to)
+        self.date_from = date_from
+        self.date_to = date_to
+        self.filters = list(additional_query or [])
+        additional_query = list(self.filters)
         if date_from:
             additional_query.append({'field': 'timestamp',
                                      'op': 'ge',
@@ -202,12 +468,20 @@ class ProjectAggregatesQuery(object):
         if len(meter_list) > 0:
             unit = meter_list[0].unit
         ceilometer_usage = api.ceilometer.CeilometerUsage(self.request)
-        resources = ceilometer_usage.resource_aggregates_with_statistics(
-            self.queries, [meter], period=self.period,
-            stats_attr=None,
-            additional_query=self.additional_query)
+        resources = ceilometer_usage.resource_aggregates(self.queries)
+        self._update_with_statistics(ceilometer_usage, resources, meter)
         return resources, unit
 
+    def _update_with_statistics(self, ceilometer_usage, resources, meter):
+        if self.date_from and self.date_to and self.period:
+            update_with_series(self.request, resources, meter,
+                               self.date_from, self.date_to, self.period,
+                               additional_query=self.filters)
+        else:
+            ceilometer_usage.update_list_with_statistics(
+                resources, [meter], period=self.period,
+                additional_query=self.additional_query)
+
 
 class MeterQuery(ProjectAggregatesQuery):
     def __init__(self, *args, **kwargs):
@@ -239,11 +513,145 @@ class MeterQuery(ProjectAggregatesQuery):
             unit = meter_list[0].unit
 
         ceilometer_usage = api.ceilometer.CeilometerUsage(self.request)
-        resources = ceilometer_usage.resources_with_statistics(
-            self.queries, [meter],
-            period=self.period,
-            stats_attr=None,
-            additional_query=self.additional_query,
-            filter_func=filter_by_meter_name)
+        resources = ceilometer_usage.resources(
+            self.queries, filter_func=filter_by_meter_name)
+        self._update_with_statistics(ceilometer_usage, resources, meter)
 
         return resources, unit
+
+
+class UsageReport(object):
+    """The daily usage of every meter by every project.
+
+    The meter and project lists are fetched once, then the statistics of
+    every (project, meter) pair are fetched concurrently, see
+    :meth:`~openstack_dashboard.api.ceilometer.CeilometerUsage.iter_statistics`.
+    :meth:`rows` yields the rows of each pair as soon as its statistics are
+    available, so the report can be streamed.
+
+    Days start at midnight UTC. The statistics of the days which are over
+    are kept in the ``"metering_days"`` namespace of the API cache, so only
+    the days missing from it, and the current day, are fetched again.
+    """
+
+    def __init__(self, request, date_from, date_to):
+        self.request = request
+        self.date_to = date_to
+        self.start = None
+        if date_from:
+            self.start = date_from.astimezone(pytz.utc).replace(
+                hour=0, minute=0, second=0, microsecond=0)
+
+        meters = api.ceilometer.Meters(request)
+        services = {
+            _('Nova'): meters.list_nova(),
+            _('Neutron'): meters.list_neutron(),
+            _('Glance'): meters.list_glance(),
+            _('Cinder'): meters.list_cinder(),
+            _('Swift_meters'): meters.list_swift(),
+            _('Kwapi'): meters.list_kwapi(),
+            _('IPMI'): meters.list_ipmi(),
+        }
+        self.meters = []
+        for meter in meters._cached_meters.values():
+            service = None
+            for name, m_list in services.items():
+                if meter in m_list:
+                    service = name
+                    break
+            self.meters.append((meter, service))
+
+        self.tenants, more = api.keystone.tenant_list(request,
+                                                      domain=None,
+                                                      paginate=False)
+
+    def get_days(self):
+        """Returns the first instant of each day of the report."""
+        days = []
+        if self.start:
+            day = self.start
+            while day <= self.date_to:
+                days.append(day)
+                day += datetime.timedelta(days=1)
+        return days
+
+    def _get_query(self, tenant, start):
+        query = [{'field': 'project_id', 'op': 'eq', 'value': tenant.id},
+                 {'field': 'timestamp', 'op': 'le', 'value': self.date_to}]
+        if start:
+            query.append({'field': 'timestamp', 'op': 'ge', 'value': start})
+        return query
+
+    def rows(self):
+        """Yields the rows of the report, project by project."""
+        usage = api.ceilometer.CeilometerUsage(self.request)
+        days = self.get_days()
+        now = timezone.now()
+        # The days which are over, and may thus be cached.
+        past_days = [day.date().isoformat() for day in days
+                     if day + datetime.timedelta(days=1) <= now]
+
+        pairs = []
+        calls = []
+        for tenant in self.tenants:
+            for meter, service in self.meters:
+                buckets = cache.get_value(self.request, 'metering_days',
+                                          tenant.id, meter.name) or {}
+                start = None
+                for day in days:
+                    if day.date().isoformat() not in buckets:
+                        start = day
+                        break
+                fetch = start is not None or not days
+                pairs.append((tenant, meter, service, buckets, fetch))
+                if fetch:
+                    calls.append((None, meter.name,
+                                  self._get_query(tenant, start), DAY))
+
+        statistics = usage.iter_statistics(calls)
+        for tenant, meter, service, buckets, fetch in pairs:
+            if fetch:
+                stats = next(statistics)[1]
+                if stats is None:
+                    # Only the cached days can be reported.
+                    stats = []
+                else:
+                    buckets = self._update(tenant, meter, buckets, stats,
+                                           past_days)
+                    stats = [{'time': s.period_end, 'value': s.avg}
+                             for s in stats]
+            if days:
+                stats = [buckets.get(day.date().isoformat())
+                         for day in days]
+            for bucket in stats:
+                if bucket:
+                    # The project is named, as it was by the identifier of
+                    # the project aggregates the report used to be made of.
+                    yield {"name": 'none',
+                           "project": tenant.name,
+                           "meter": meter.name,
+                           "description": meter.description,
+                           "service": service,
+                           "time": bucket['time'],
+                           "value": bucket['value'],
+                           "unit": meter.unit}
+
+    def _update(self, tenant, meter, buckets, statistics, past_days):
+        """Adds the fetched statistics to the buckets of the pair, and caches
+        the buckets of the days which are over.
+        """
+        buckets = dict(buckets)
+        fetched = dict((s.period_start[:10],
+                        {'time': s.period_end, 'value': s.avg})
+                       for s in statistics)
+        missing = [day for day in past_days if day not in buckets]
+        for day in missing:
+            # Days without samples have no statistics.
+            buckets[day] = fetched.get(day)
+        if missing:
+            cache.set_value(self.request, 'metering_days',
+                            dict((day, buckets[day]) for day in past_days),
+                            tenant.id, meter.name)
+        for day, bucket in fetched.items():
+            buckets.setdefault(day, bucket)
+        return buckets
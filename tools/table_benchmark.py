@@ -0,0 +1,88 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Measures the cost of the rows of a large DataTable.
+
+Builds the rows of a table, then renders them, and reports the time spent
+in each step and the number of objects allocated per row.
+
+Usage: tools/with_venv.sh python tools/table_benchmark.py [ROWS] [COLUMNS]
+"""
+
+import gc
+import os
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+sys.path.insert(0, ROOT)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'horizon.test.settings')
+
+from django.test import client  # noqa
+
+from horizon import tables  # noqa
+
+
+class Datum(object):
+    def __init__(self, index, columns):
+        self.id = str(index)
+        self.name = 'datum-%d' % index
+        self.status = 'active' if index % 2 else 'error'
+        for column in range(columns):
+            setattr(self, 'field%d' % column, 'value %d' % column)
+
+
+def get_table_class(columns):
+    attrs = {
+        'name': tables.Column('name', link='http://example.com/'),
+        'status': tables.Column('status', status=True,
+                                status_choices=(('active', True),
+                                                ('error', False))),
+    }
+    for column in range(columns - 2):
+        attrs['field%d' % column] = tables.Column('field%d' % column)
+
+    class Meta(object):
+        name = 'benchmark'
+        status_columns = ['status']
+
+    attrs['Meta'] = Meta
+    return type('BenchmarkTable', (tables.DataTable,), attrs)
+
+
+def main(rows=1000, columns=12):
+    request = client.RequestFactory().get('/')
+    data = [Datum(index, columns) for index in range(rows)]
+    table = get_table_class(columns)(request, data)
+
+    gc.collect()
+    gc.disable()
+    objects = len(gc.get_objects())
+    start = time.time()
+    table_rows = table.get_rows()
+    build_time = time.time() - start
+    allocated = len(gc.get_objects()) - objects
+    gc.enable()
+
+    start = time.time()
+    for row in table_rows:
+        row.render()
+    render_time = time.time() - start
+
+    print("%d rows of %d columns" % (rows, columns))
+    print("build:  %.3fs, %.1f objects per row"
+          % (build_time, float(allocated) / rows))
+    print("render: %.3fs" % render_time)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])